@@ -0,0 +1,133 @@
+from main import UNIT_RATIO, Calculation, Model, TimeAxis # Imports the model records and unit ratios from the simulator
+from math import log, log1p # Imports log and log1p for the mean division time
+import numpy as np # Imports numpy for updating every cell at once
+
+AGENT_INITIAL_CAPACITY = 1024 # How many cells the buffers hold before they first grow
+AGENT_GROWTH_FACTOR = 2 # How much the buffers grow when they are full, growing geometrically means cells are only copied a few times
+AGENT_COMPACT_FRACTION = 0.25 # Dead cells are removed all at once when they are this fraction of the buffers
+AGENT_MAX_CELLS = 100000000 # The most live cells that can be simulated, about 1.1 GB of buffers
+AGENT_DTYPES = {"age": np.float32, "timer": np.float32, "mutations": np.uint16, "alive": np.bool_} # The state of each cell, one array per field (11 bytes per cell)
+
+class CellBuffers: # Class for the state of every cell, stored as one preallocated array per field instead of one object per cell
+    def __init__(self, capacity: int = AGENT_INITIAL_CAPACITY): # Constructor
+        self.fields = {name: np.zeros(capacity, dtype) for name, dtype in AGENT_DTYPES.items()} # sets the arrays, only the first count cells are used
+        self.count = 0 # how many cells are stored (live and dead)
+        self.dead = 0 # how many of the stored cells are dead
+
+    def __len__(self): # this runs if len() is used on the class, the number of live cells
+        return self.count - self.dead
+
+    def __getitem__(self, name: str) -> np.ndarray: # this runs if the class is indexed, a field of every stored cell
+        return self.fields[name][:self.count]
+
+    def capacity(self) -> int: # gets how many cells fit before the buffers grow
+        return len(self.fields["alive"])
+
+    def nbytes(self) -> int: # gets the memory used by the buffers
+        return sum(field.nbytes for field in self.fields.values())
+
+    def reserve(self, count: int): # makes sure the given number of cells fit, growing every buffer geometrically
+        if count <= self.capacity(): return
+        capacity = self.capacity()
+        while capacity < count: capacity *= AGENT_GROWTH_FACTOR
+        for name, field in self.fields.items(): # only the used part is copied
+            grown = np.zeros(capacity, field.dtype)
+            grown[:self.count] = field[:self.count]
+            self.fields[name] = grown
+
+    def append(self, **values: np.ndarray): # adds new cells to the end of the buffers
+        added = len(values["age"])
+        self.reserve(self.count + added)
+        for name, field in self.fields.items():
+            field[self.count:self.count + added] = values.get(name, True) # new cells are alive
+        self.count += added
+
+    def kill(self, dying: np.ndarray): # marks cells as dead, they stay in the buffers until they are compacted
+        self.fields["alive"][:self.count][dying] = False
+        self.dead += int(np.count_nonzero(dying))
+        if self.dead > AGENT_COMPACT_FRACTION * self.count: self.compact()
+
+    def compact(self): # removes every dead cell at once, moving the live cells to the front
+        live = self["alive"].copy()
+        for name, field in self.fields.items():
+            field[:len(self)] = field[:self.count][live]
+        self.count = len(self)
+        self.dead = 0
+
+class AgentResult: # Class for the result of an agent-based model, the live cells and their state at each recorded time
+    def __init__(self, name: str, calculation: Calculation, counts: np.ndarray, mean_ages: np.ndarray, mutant_fractions: np.ndarray, peak_bytes: int): # Constructor
+        self.name = name # sets the model name
+        self.calculation = calculation # sets the model settings and the times the cells were counted at
+        self.counts = counts # sets the live cells at each time
+        self.mean_ages = mean_ages # sets the mean age of the live cells at each time (in growth rate units)
+        self.mutant_fractions = mutant_fractions # sets the fraction of live cells with at least one mutation at each time
+        self.peak_bytes = peak_bytes # sets the most memory the cell buffers used
+
+    def __str__(self): # this runs if the class is converted to a string
+        return f"AgentResult({self.name}: {int(self.counts[-1])} cells after {len(self.counts)} times)"
+
+    def __len__(self): # this runs if len() is used on the class, the number of recorded times
+        return len(self.counts)
+
+def division_times(generator: np.random.Generator, mutations: np.ndarray, mean: float, variation: float, mutation_effect: float) -> np.ndarray: # Function that picks how long each cell takes to divide, gamma distributed around the mean (each mutation makes it faster by mutation_effect)
+    mean = mean * (1 - mutation_effect) ** mutations.astype(np.float32)
+    if variation == 0: return mean.astype(np.float32)
+    shape = 1 / variation ** 2 # the shape that gives this coefficient of variation
+    return generator.gamma(shape, mean / shape).astype(np.float32)
+
+def run_agent_model(model: Model, time_axis: TimeAxis, steps_per_unit: int = 24, variation: float = 0.1, death_rate: float = 0.0, mutation_rate: float = 0.0, mutation_effect: float = 0.0, seed: int = 0, name: str = "Agent Model 1") -> AgentResult: # Function that simulates every cell of a model on its own, with an age, a division timer and a number of mutations
+    if not 0 <= variation: raise ValueError("Variation must be at least 0")
+    if not 0 <= death_rate < 1 or not 0 <= mutation_rate <= 1: raise ValueError("Death and mutation rates must be between 0 and 1")
+    if model.model_type != "sophisticated" or model.carrying_capacity is not None or model.growth_schedule is not None: raise ValueError("Only sophisticated models can be simulated cell by cell") # naive growth adds the same amount whatever the population, which dividing cells can not do
+    if not model.fission_frequency or model.fission_frequency <= 0: raise ValueError("Agent models need a fission frequency")
+    generator = np.random.default_rng(seed)
+    rate = model.growth_rate.quantity / 100 # the growth rate as a decimal
+    log_growth = model.fission_frequency * log1p(rate / model.fission_frequency) # n*ln(1+r/n), the log of how much the model grows each growth rate unit
+    shape = 1 / variation ** 2 if variation > 0 else None
+    mean_division_time = log(2) / log_growth if shape is None else shape * (2 ** (1 / shape) - 1) / log_growth # a cell divides about this often (in growth rate units) so, without deaths, the population grows as much as the model each unit (2E[e^(-gT)] = 1 for gamma division times)
+    step = 1 / steps_per_unit # each step is this many growth rate units
+    death_probability = 1 - (1 - death_rate) ** step # the chance a cell dies in one step, death_rate is per growth rate unit
+    record_steps = np.round(time_axis.get_quantities() * UNIT_RATIO[time_axis.get_unit(), model.growth_rate.unit] * steps_per_unit).astype(np.int64) # the steps the cells are counted after
+    if log(model.initial_population) + log_growth * record_steps.max(initial=0) * step > log(AGENT_MAX_CELLS): raise ValueError(f"The population would go over {AGENT_MAX_CELLS} cells, use a shorter projection or a lower growth rate") # checked before simulating so big models fail at once
+
+    cells = CellBuffers(max(AGENT_INITIAL_CAPACITY, int(model.initial_population)))
+    mutations = np.zeros(int(round(model.initial_population)), np.uint16)
+    timers = division_times(generator, mutations, mean_division_time, variation, mutation_effect)
+    ages = timers * -np.log2(1 - generator.random(len(mutations), np.float32) / 2) # the first cells are part way through dividing so they do not all divide together, with young cells more common as in a growing population
+    cells.append(age=ages, timer=timers - ages, mutations=mutations)
+    counts, mean_ages, mutant_fractions = np.empty(len(record_steps)), np.empty(len(record_steps)), np.empty(len(record_steps))
+    peak_bytes = cells.nbytes()
+    current_step = 0
+    for column, record_step in enumerate(record_steps): # loops through every recorded time
+        while current_step < record_step: # every step before the recorded time, one step for all the cells at once
+            cells["age"][:] += step
+            cells["timer"][:] -= step
+            if death_probability > 0: cells.kill(cells["alive"] & (generator.random(cells.count, np.float32) < death_probability))
+            dividing = np.flatnonzero(cells["alive"] & (cells["timer"] <= 0))
+            if len(dividing) > 0: # each dividing cell stays as one daughter and adds the other to the end
+                if len(cells) + len(dividing) > AGENT_MAX_CELLS: raise ValueError(f"Agent populations went over {AGENT_MAX_CELLS} cells, use a shorter projection or a lower growth rate")
+                parent_mutations = cells["mutations"][dividing]
+                daughter_mutations = parent_mutations + (generator.random(len(dividing)) < mutation_rate) if mutation_rate > 0 else parent_mutations
+                overshoot = cells["timer"][dividing] # how far past its division time each cell got, kept so the step size does not slow division down
+                cells["age"][dividing] = -overshoot
+                cells["timer"][dividing] = overshoot + division_times(generator, parent_mutations, mean_division_time, variation, mutation_effect)
+                cells.append(age=-overshoot, timer=overshoot + division_times(generator, daughter_mutations, mean_division_time, variation, mutation_effect), mutations=daughter_mutations.astype(np.uint16))
+                peak_bytes = max(peak_bytes, cells.nbytes())
+            current_step += 1
+        alive = cells["alive"]
+        counts[column] = len(cells)
+        mean_ages[column] = cells["age"][alive].mean(dtype=np.float64) if counts[column] else 0
+        mutant_fractions[column] = np.count_nonzero(cells["mutations"][alive]) / counts[column] if counts[column] else 0
+    return AgentResult(name, Calculation(*model, time_axis), counts, mean_ages, mutant_fractions, peak_bytes)
+
+def agent_calculations(agent_results: list[AgentResult]) -> tuple: # Function that makes the results of calculate_models from the live cell counts of each agent-based model
+    results, opening_population, added_population, final_population, model_configuration = {}, [], [], [], {}
+    for result in agent_results: # loops through every agent-based model
+        final = result.counts
+        opening = np.concatenate((final[:1], final[:-1])) # the opening population is the last final population
+        results[result.name] = final.tolist()
+        opening_population.append(opening.tolist())
+        added_population.append((final - opening).tolist())
+        final_population.append(final.tolist())
+        model_configuration[result.name] = result.calculation
+    return results, opening_population, added_population, final_population, model_configuration
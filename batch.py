@@ -0,0 +1,139 @@
+import main # Imports the simulator (as a module so its settings can be changed for each scenario)
+from concurrent.futures import ProcessPoolExecutor, as_completed # Imports a process pool for running scenarios at the same time
+from time import perf_counter # Imports a high resolution timer for timing each scenario
+import argparse # Imports argparse for reading the command line
+import json # Imports json for reading scenario files and writing the summary
+import os # Imports os for making the output folder
+import re # Imports re for making safe file names
+import tomllib # Imports tomllib for reading TOML scenario files
+
+MODEL_TYPES = ["naive", "sophisticated"] + main.GROWTH_MODEL_TYPES # The model types that can be in a scenario
+DEFAULT_ROUNDING_AMOUNT = main.rounding_amount # The rounding used when a scenario does not set its own
+DEFAULT_LOG_SPACE = main.log_space # Whether log-space populations are used when a scenario does not say
+DEFAULT_PRECISION_DIGITS = main.precision_digits # The high-precision digits used when a scenario does not set its own
+
+def load_scenarios(path: str) -> list[dict]: # Function that reads the scenarios from a JSON or TOML file
+    with open(path, "rb") as file:
+        if path.lower().endswith(".toml"): data = tomllib.load(file) # TOML files use [[scenarios]] tables
+        else: data = json.load(file) # JSON files are a list or {"scenarios": [...]}
+    scenarios = data["scenarios"] if isinstance(data, dict) else data
+    if not isinstance(scenarios, list): raise ValueError("Scenario file must contain a list of scenarios")
+    return scenarios
+
+def check_limits(value, limits: list, name: str, infinite_end: bool = True): # Function that checks a value is inside the same limits as the inputs
+    if value < limits[0] or (not infinite_end and value > limits[1]):
+        raise ValueError(f"{name} must be at least {limits[0]}" + ("" if infinite_end else f" and at most {limits[1]}"))
+    return value
+
+def scenario_settings(scenario: dict) -> dict: # Function that gets the module settings of a scenario (a preset module or the scenario itself)
+    if "module" in scenario: # a preset module from SIMULATION_SETTINGS, anything in the scenario overrides it
+        return main.SIMULATION_SETTINGS[scenario["module"] - 1] | {key: value for key, value in scenario.items() if key in ["name", "output", "condition", "forced"] or key.endswith("_models")}
+    return {"name": "Custom Settings", "forced": {}} | scenario
+
+def scenario_inputs(scenario: dict): # Function that does what run_inputs does but from a scenario instead of asking the user
+    settings = scenario_settings(scenario)
+    forced = settings["forced"]
+    models = scenario.get("models", [])
+    models_data = []
+    for model_type in MODEL_TYPES: # loops through naive, sophisticated, logistic then Gompertz models, like run_inputs
+        typed_models = [model for model in models if model.get("type") == model_type]
+        for i in range(settings.get(f"{model_type}_models", len(typed_models))):
+            model = typed_models[i] if i < len(typed_models) else {}
+            def value(key: str): # the model's own value, then the forced value, then the scenario's value
+                if key in model: return model[key]
+                if key in forced and forced[key] != "same":
+                    return forced[key][i] if key == "fission_frequency" and isinstance(forced[key], list) else forced[key]
+                if key in scenario: return scenario[key]
+                raise ValueError(f"Missing {key} for {model_type.title()} Model {i + 1}")
+            initial_population = check_limits(value("initial_population"), main.inital_population_limits, "Initial population")
+            growth_rate = main.TimeAmount(value("growth_rate")[0], main.time_unit(value("growth_rate")[1]))
+            check_limits(growth_rate.get_quantity(), main.growth_rate_limits, "Growth rate")
+            fission_frequency = None
+            if model_type == "sophisticated":
+                fission_frequency = value("fission_frequency") # a unit name or a number of fission-events per growth rate unit
+                if isinstance(fission_frequency, str): fission_frequency = main.time_unit(fission_frequency)
+                else: check_limits(fission_frequency, main.fission_frequency_limits, "Fission frequency")
+            carrying_capacity = growth_schedule = None
+            if model_type in main.GROWTH_MODEL_TYPES:
+                carrying_capacity = model.get("carrying_capacity", scenario.get("carrying_capacity")) # logistic models without one grow like continuous compounding
+                if carrying_capacity is not None: check_limits(carrying_capacity, [1], "Carrying capacity")
+                growth_schedule = model.get("growth_schedule", scenario.get("growth_schedule")) # a list of [start time, growth rate %] pairs in growth rate units
+                if growth_schedule is not None: growth_schedule = tuple(sorted((float(start), float(check_limits(rate, main.growth_rate_limits, "Scheduled growth rate", False))) for start, rate in growth_schedule)) # tuples so the model can be cached
+            models_data.append(main.Model(model_type, initial_population, growth_rate, fission_frequency, carrying_capacity, growth_schedule))
+
+    target_population = None
+    projection_time = None
+    condition = settings["condition"]
+    if condition == "varied": # varied scenarios pick the condition by what they give
+        condition = "population" if "target_population" in scenario or "target_population" in forced else "projected"
+    if condition == "population":
+        target_population = forced.get("target_population", scenario.get("target_population"))
+        if target_population is None: raise ValueError("Missing target_population")
+        check_limits(target_population, main.target_population_limits, "Target population")
+        output_unit = main.time_unit(scenario.get("output_unit", models_data[0][2].get_unit()))
+    elif condition == "projected":
+        projection_time = forced.get("projection_time", scenario.get("projection_time"))
+        if projection_time is None: raise ValueError("Missing projection_time")
+        projection_time = main.TimeAmount(int(projection_time[0]), main.time_unit(projection_time[1]))
+        check_limits(projection_time.get_quantity(), main.projection_time_limits, "Projection time")
+        output_unit = projection_time.get_unit()
+    return settings, models_data, projection_time, target_population, output_unit, condition
+
+def scenario_file_name(index: int, scenario: dict) -> str: # Function that makes a safe file name for a scenario's results
+    name = re.sub(r"[^a-z0-9]+", "_", str(scenario.get("name", "scenario")).lower()).strip("_")
+    return f"{index + 1:04d}_{name}.txt"
+
+def run_scenario(index: int, scenario: dict, output_folder: str) -> dict: # Function that runs one scenario and writes its results (runs in a worker process)
+    start = perf_counter()
+    result = {"index": index, "name": scenario.get("name", f"Scenario {index + 1}"), "file": None, "status": "ok", "error": None}
+    try:
+        main.rounding_amount = scenario.get("rounding_amount", DEFAULT_ROUNDING_AMOUNT) # each scenario can set its own rounding (workers are reused, so always set it)
+        main.log_space = scenario.get("log_space", DEFAULT_LOG_SPACE) # each scenario can use log-space populations for very long projections
+        main.precision_digits = scenario.get("precision_digits", DEFAULT_PRECISION_DIGITS) # each scenario can use the high-precision mode
+        settings, models_data, projection_time, target_population, output_unit, condition = scenario_inputs(scenario)
+        models = main.stream_models(main.iterate_compiled_data(models_data, projection_time, target_population, condition, settings["output"])) # each model is compiled when it is needed
+        if "export" in scenario: # exports CSV and NumPy columns into a folder instead of a text file
+            result["file"] = os.path.join(output_folder, scenario_file_name(index, scenario)[:-4])
+            main.export_results(models, output_unit, result["file"], scenario["export"])
+        else:
+            result["file"] = os.path.join(output_folder, scenario_file_name(index, scenario))
+            with open(result["file"], "w") as output_file: # results are streamed to the file so long scenarios use little memory
+                output_file.write(f"{settings['name']}\n")
+                main.stream_results(models, output_unit, condition, settings["output"], output_file)
+    except Exception as error: # one bad scenario should not stop the others
+        result["status"] = "error"
+        result["error"] = f"{type(error).__name__}: {error}"
+    result["seconds"] = perf_counter() - start
+    return result
+
+def run_batch(scenarios: list[dict], output_folder: str, workers: int|None = None) -> dict: # Function that runs every scenario on a process pool and writes the summary
+    os.makedirs(output_folder, exist_ok=True)
+    start = perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_scenario, index, scenario, output_folder) for index, scenario in enumerate(scenarios)]
+        for future in as_completed(futures): # prints each scenario as it finishes
+            result = future.result()
+            results.append(result)
+            if result["status"] == "ok": main.cprint(f"Finished {result['name']} in {result['seconds']:.3f}s", "green")
+            else: main.cprint(f"Failed {result['name']}: {result['error']}", "red")
+    summary = {
+        "scenarios": len(scenarios),
+        "succeeded": sum(result["status"] == "ok" for result in results),
+        "failed": sum(result["status"] != "ok" for result in results),
+        "total_seconds": perf_counter() - start,
+        "results": sorted(results, key=lambda result: result["index"]),
+    }
+    with open(os.path.join(output_folder, "summary.json"), "w") as file:
+        json.dump(summary, file, indent=4)
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run simulation scenarios from a JSON or TOML file without any prompts.")
+    parser.add_argument("scenario_file", help="JSON or TOML file of scenarios")
+    parser.add_argument("-o", "--output", default="batch_results", help="folder to write one result file per scenario and summary.json to")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of worker processes (default: number of CPUs)")
+    arguments = parser.parse_args()
+    summary = run_batch(load_scenarios(arguments.scenario_file), arguments.output, arguments.workers)
+    main.print_title("Batch Summary")
+    print(f"{summary['succeeded']} of {summary['scenarios']} scenarios finished in {summary['total_seconds']:.3f}s. Summary written to {os.path.join(arguments.output, 'summary.json')}")
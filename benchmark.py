@@ -0,0 +1,330 @@
+import os # Imports os for picking the graph backend
+os.environ.setdefault("MPLBACKEND", "Agg") # Graphs are drawn off screen so rendering can be timed without a window
+from main import * # Imports the simulator so the real functions are benchmarked
+from sweep import sweep, chunked_sweep # Imports the sweep engines
+from stochastic import run_stochastic_model # Imports the stochastic engine
+from agents import run_agent_model # Imports the agent-based engine
+from rounding_check import rounded_calculate_models # Imports calculate_models as it was when every step was rounded
+from uncertainty import run_uncertainty, UNCERTAINTY_METHODS # Imports the uncertainty engine
+from time import perf_counter # Imports a high resolution timer for timing
+import subprocess # Imports subprocess for timing imports in a fresh Python
+import sys # Imports sys for the path of the running Python
+import tracemalloc # Imports tracemalloc for measuring memory
+from contextlib import redirect_stdout # Imports redirect_stdout so printed tables are not shown while they are timed
+
+def scalar_calculate_models(calculate_data:list[list], output_unit:str): # The old per-step loop of calculate_models, kept to compare against
+    results:dict[str, list] = {}
+    opening_population:list[list] = []
+    added_population:list[list] = []
+    final_population:list[list] = []
+    for i in range(len(calculate_data)): # loops through every model
+        model_name = f"Model {i + 1}"
+        results[model_name] = []
+        opening_population.append([])
+        added_population.append([])
+        final_population.append([])
+        last_population = 0
+        for time in calculate_data[i][-1]: # one calculate_population_size call for every time step
+            if last_population == 0:
+                last_population = calculate_data[i][1]
+            model_result = round(calculate_population_size(*calculate_data[i][:4], time), rounding_amount)
+            results[model_name].append(model_result)
+            opening_population[i].append(last_population)
+            added_population[i].append(round(model_result - last_population, rounding_amount))
+            final_population[i].append(model_result)
+            last_population = model_result
+    return (results, opening_population, added_population, final_population)
+
+def scalar_print_table(data: list[list], table_length: int, table_title: str, titles: list, table_buffer: int = 2): # The old print_table, one print call per cell, kept to compare against
+    longest_string = max(len(str(value)) for row in data + [titles] for value in row)
+    cprint(table_title, attrs=["bold"])
+    print("")
+    for title in titles:
+        print(colored(title, attrs=["underline"]), end=" " * (longest_string - len(str(title)) + table_buffer))
+    print("")
+    for i in range(table_length):
+        for row in data:
+            value = row[i] if i < len(row) else ""
+            print(str(value), end=" " * (longest_string - len(str(value)) + table_buffer))
+        print("")
+    print("")
+
+def example_models() -> list[list]: # A few models like the ones entered in the modules
+    return [
+        Model("naive", 1000, TimeAmount(1, "day"), None),
+        Model("sophisticated", 1000, TimeAmount(1, "day"), "hour"),
+        Model("sophisticated", 1000, TimeAmount(2, "week"), 3),
+    ]
+
+def time_function(function, *args, repeats: int = 3) -> float: # Returns the best time out of a few runs
+    best = float("inf")
+    for _ in range(repeats):
+        start = perf_counter()
+        function(*args)
+        best = min(best, perf_counter() - start)
+    return best
+
+def benchmark_calculate_models(days: int = 10000): # Compares the vectorized calculate_models against the old loop
+    print_header(f"calculate_models ({days} day projection)")
+    calculation_data = compile_data(example_models(), TimeAmount(days, "day"), None, "projected", "list")
+    old_time = time_function(scalar_calculate_models, calculation_data, "day")
+    new_time = time_function(calculate_models, compile_data(example_models(), TimeAmount(days, "day"), None, "projected", "list"), "day")
+    old_results = scalar_calculate_models(calculation_data, "day")
+    new_results = calculate_models(compile_data(example_models(), TimeAmount(days, "day"), None, "projected", "list"), "day")
+    max_difference = max(abs(old - new) / max(abs(old), 1) for old_list, new_list in zip(old_results[3], new_results[3]) for old, new in zip(old_list, new_list)) # relative difference between the two versions
+    print(f"Old loop: {old_time:.4f}s")
+    print(f"Vectorized: {new_time:.4f}s")
+    print(f"Speedup: {old_time / new_time:.1f}x")
+    print(f"Largest relative difference: {max_difference:.2e}")
+
+def benchmark_rounding(days: int = 10000): # Times the calculation with and without rounding every step, rounding_check.py checks the shown numbers are unchanged
+    print_header(f"rounding at the output ({days} day projection)")
+    calculate = lambda function: function(compile_data(example_models(), TimeAmount(days, "day"), None, "projected", "columns"), "day")
+    result_cache.enabled = False # every run is calculated, not read from the cache
+    rounded_time = time_function(calculate, rounded_calculate_models)
+    unrounded_time = time_function(calculate, calculate_models)
+    result_cache.enabled = True
+    print(f"Rounding every step: {rounded_time:.4f}s")
+    print(f"Rounding when shown: {unrounded_time:.4f}s ({rounded_time / unrounded_time:.1f}x faster)")
+
+def benchmark_sweep(points_per_variable: int = 32): # Times a cartesian sweep over all four variables
+    print_header(f"sweep ({points_per_variable ** 4} points)")
+    grid = lambda start, stop: np.linspace(start, stop, points_per_variable)
+    sweep_time = time_function(sweep, "sophisticated", grid(1, 1000), grid(1, 100), grid(1, 1000), grid(0, 365))
+    result = sweep("sophisticated", grid(1, 1000), grid(1, 100), grid(1, 1000), grid(0, 365))
+    check = calculate_population_size("sophisticated", 1000, TimeAmount(1, "day"), 1000, TimeAmount(365, "day")) # one corner of the grid checked against the scalar function
+    print(f"Sweep: {sweep_time:.4f}s ({result.populations.size / sweep_time:,.0f} points per second)")
+    print(f"Corner matches calculate_population_size: {np.isclose(result.select(initial_population=1000, growth_rate=1, fission_frequency=1000, projection_time=365), check)}")
+
+def benchmark_chunked_sweep(growth_rates: int = 100, fission_frequencies: int = 1000, projection_times: int = 250, folder: str = "benchmark_sweep"): # Times an out-of-core sweep written to a memory-mapped file, and measures the memory it needs against holding the whole result
+    import shutil, tempfile # only needed to make and remove the sweep folder
+    points = growth_rates * fission_frequencies * projection_times
+    print_header(f"out-of-core sweep ({points:,} points)")
+    grids = ("sophisticated", 1000, np.arange(1, growth_rates + 1), np.geomspace(1, 1e9, fission_frequencies), np.linspace(0, 365, projection_times))
+    folder = os.path.join(tempfile.gettempdir(), folder)
+    shutil.rmtree(folder, ignore_errors=True)
+    start = perf_counter()
+    result = chunked_sweep(folder, *grids)
+    pool_time = perf_counter() - start
+    shutil.rmtree(folder)
+    tracemalloc.start()
+    start = perf_counter()
+    chunked_sweep(folder, *grids, workers=1)
+    inline_time = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    check = calculate_population_size("sophisticated", 1000, TimeAmount(growth_rates, "day"), 1e9, TimeAmount(365, "day")) # the last point of the grid checked against the scalar function
+    print(f"Process pool: {pool_time:.4f}s ({points / pool_time:,.0f} points per second)")
+    print(f"One process: {inline_time:.4f}s, peak memory {peak / 1024 ** 2:.1f} MiB for a {result.populations.nbytes / 1024 ** 2:.1f} MiB result")
+    print(f"Last point matches calculate_population_size: {np.isclose(result.populations[0, -1, -1, -1], check)}")
+    shutil.rmtree(folder)
+
+def benchmark_precision(days: int = 365): # Compares the float path against each high-precision level on the module 5 per-second case
+    print_header(f"high-precision mode (100% per day, fission every second, {days} days)")
+    settings = ("sophisticated", 1000, TimeAmount(100, "day"), 86400) # 86400 fission events per day
+    times = [TimeAmount(day, "day") for day in range(1, days + 1)]
+    reference = [calculate_population_size_precise(*settings, time, 200) for time in times] # 200 digits is the reference answer
+    def relative_error(values): # largest relative error against the reference
+        return max(abs(Decimal(value) - correct) / correct for value, correct in zip(values, reference))
+    float_time = time_function(lambda: [calculate_population_size(*settings, time) for time in times])
+    print(f"Float: {float_time:.4f}s, largest relative error {relative_error([calculate_population_size(*settings, time) for time in times]):.2e}")
+    for digits in [15, 30, 50, 100]:
+        power_cache.clear() # each level starts with an empty cache, the squares are then shared by every day
+        precise_time = time_function(lambda: [calculate_population_size_precise(*settings, time, digits) for time in times], repeats=1)
+        print(f"{digits} digits: {precise_time:.4f}s ({precise_time / float_time:.0f}x float), largest relative error {relative_error([calculate_population_size_precise(*settings, time, digits) for time in times]):.2e}")
+
+def benchmark_time_amounts(count: int = 100000): # Times the scalar calculation and measures the memory of many TimeAmounts and models
+    print_header(f"time amounts and models ({count:,} of each)")
+    growth_rate = TimeAmount(2, "week")
+    times = [TimeAmount(hour, "hour") for hour in range(count)]
+    scalar_time = time_function(lambda: [calculate_population_size("sophisticated", 1000, growth_rate, 3, time) for time in times])
+    print(f"calculate_population_size: {scalar_time / count * 1e9:.0f}ns per call")
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    models = [Model("sophisticated", 1000, TimeAmount(day, "day"), 3) for day in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(f"Memory per model (with its TimeAmount): {used / len(models):.0f} bytes")
+
+def benchmark_targets(strains: int = 100, targets: int = 100000): # Compares the batched time-to-target solver against one calculate_time_to_reach_target call per target, and the trajectory index against recalculating
+    print_header(f"time to reach targets ({strains} strains, {targets:,} targets)")
+    rng = np.random.default_rng(0)
+    models = [Model("sophisticated", float(rng.integers(1, 1000)), TimeAmount(float(rng.integers(1, 100)), "day"), float(rng.integers(1, 1000))) for _ in range(strains)]
+    target_populations = np.geomspace(2000, 1e9, targets)
+    batch_time = time_function(calculate_times_to_reach_targets, models, target_populations, "day")
+    sample = target_populations[::100] # the scalar loop is timed on a sample of the targets
+    scalar_time = time_function(lambda: [calculate_time_to_reach_target(*model[:4], target) for model in models for target in sample]) * (targets / len(sample))
+    batch = calculate_times_to_reach_targets(models, sample, "day")
+    matches = all(np.isclose(calculate_time_to_reach_target(*model[:4], target)[0].quantity, batch[i, j]) for i, model in enumerate(models) for j, target in enumerate(sample))
+    print(f"Scalar loop (estimated from {len(sample)} targets): {scalar_time:.4f}s")
+    print(f"Batched: {batch_time:.4f}s ({scalar_time / batch_time:.0f}x faster)")
+    print(f"Matches calculate_time_to_reach_target: {matches}")
+    trajectory = trajectories_from_calculations(calculate_models(compile_data([Model("sophisticated", 1000, TimeAmount(1, "day"), "hour")], TimeAmount(1000000, "hour"), None, "projected", "columns"), "hour"))[0]
+    trajectory.time_to_reach([1]) # builds the index
+    index_time = time_function(trajectory.time_to_reach, target_populations)
+    print(f"Trajectory index ({len(trajectory):,} populations): {index_time:.4f}s for {targets:,} targets")
+
+def fixed_step_log_populations(model: Model, units: int) -> np.ndarray: # A classic fourth order Runge-Kutta integrator with one step per growth rate unit, kept to compare against the adaptive solver
+    log_populations = np.empty(units + 1)
+    log_populations[0] = log(model.initial_population)
+    for unit in range(units):
+        y = log_populations[unit]
+        k1 = log_growth(model, unit, y)
+        k2 = log_growth(model, unit + 0.5, y + k1 / 2)
+        k3 = log_growth(model, unit + 0.5, y + k2 / 2)
+        k4 = log_growth(model, unit + 1, y + k3)
+        log_populations[unit + 1] = y + (k1 + 2 * k2 + 2 * k3 + k4) / 6
+    return log_populations
+
+def benchmark_growth_models(units: int = 100000, targets: int = 100000): # Compares the adaptive-step solver against one fixed step per unit on a logistic model with a closed form, and times the batched root finder
+    print_header(f"logistic and Gompertz solver ({units:,} days, {targets:,} targets)")
+    model = Model("logistic", 100, TimeAmount(50, "day"), None, 1e6)
+    times = np.arange(units + 1)
+    exact = np.log(1e6) - np.log1p((1e6 / 100 - 1) * np.exp(-0.5 * times)) # ln(K / (1 + (K/P0 - 1)e^(-rt)))
+    def adaptive(): # a new solution every run, so the cache does not hide the solving
+        solution_cache.clear()
+        return solve_growth_model(model, units).log_population_at(times)
+    fixed_time = time_function(fixed_step_log_populations, model, units, repeats=1)
+    adaptive_time = time_function(adaptive)
+    print(f"Fixed step: {fixed_time:.4f}s, {units:,} steps, max relative error {np.max(np.abs(np.expm1(fixed_step_log_populations(model, units) - exact))):.1e}")
+    print(f"Adaptive: {adaptive_time:.4f}s, {len(solve_growth_model(model, units)) - 1} steps, max relative error {np.max(np.abs(np.expm1(adaptive() - exact))):.1e} ({fixed_time / adaptive_time:.0f}x faster)")
+    target_populations = np.geomspace(101, 999999, targets)
+    solution = solve_growth_model(model, units)
+    batch_time = time_function(solution.time_to_reach, target_populations)
+    sample = target_populations[::1000] # one call per target is timed on a sample of the targets
+    scalar_time = time_function(lambda: [solution.time_to_reach([target]) for target in sample]) * (targets / len(sample))
+    print(f"Root finder one target at a time (estimated from {len(sample)} targets): {scalar_time:.4f}s")
+    print(f"Batched: {batch_time:.4f}s ({scalar_time / batch_time:.0f}x faster), max relative error of the population at the times found {np.max(np.abs(solution.population_at(solution.time_to_reach(target_populations)) / target_populations - 1)):.1e}")
+
+def finite_difference_elasticities(calculation: Calculation, step: float = 1e-6) -> dict[str, np.ndarray]: # Elasticities from central differences of calculate_log_population_array, two extra evaluations of every time per input, kept to compare against
+    inputs = {"initial_population": calculation.initial_population, "growth_rate": calculation.growth_rate.get_quantity(), "fission_frequency": calculation.fission_frequency, "projection_time": calculation.time_axis.get_quantities()}
+    log_population = lambda values: calculate_log_population_array(calculation.model_type, *values.values(), calculation.growth_rate.get_unit(), calculation.time_axis.get_unit())
+    elasticities = {}
+    for parameter, value in inputs.items():
+        change = step * np.maximum(np.abs(value), 1)
+        elasticities[parameter] = (log_population({**inputs, parameter: value + change}) - log_population({**inputs, parameter: value - change})) / (2 * change) * value
+    return elasticities
+
+def benchmark_sensitivities(models: int = 1000, days: int = 1000): # Compares the closed-form elasticities of every model at once against central differences of each model
+    print_header(f"sensitivities ({models} models, {days} day projection)")
+    generator = np.random.default_rng(0)
+    models_data = [Model("sophisticated", float(generator.integers(1, 10000)), TimeAmount(float(generator.integers(1, 20)), "day"), float(generator.choice([1, 24, 1440]))) for _ in range(models)]
+    model_configuration = calculate_models(compile_data(models_data, TimeAmount(days, "day"), None, "projected", "list"), "day")[4]
+    closed_form_time = time_function(calculate_sensitivities, model_configuration)
+    finite_difference_time = time_function(lambda: [finite_difference_elasticities(calculation) for calculation in model_configuration.values()])
+    sensitivities = calculate_sensitivities(model_configuration)
+    largest_difference = max(np.max(np.abs(sensitivities[name]["elasticities"][parameter] - elasticity) / np.maximum(np.abs(elasticity), 1)) for name, calculation in model_configuration.items() for parameter, elasticity in finite_difference_elasticities(calculation).items())
+    print(f"Central differences: {finite_difference_time:.4f}s")
+    print(f"Closed form: {closed_form_time:.4f}s ({finite_difference_time / closed_form_time:.1f}x faster)")
+    print(f"Largest relative difference: {largest_difference:.2e}")
+
+def benchmark_uncertainty(samples: int = 2 ** 20, convergence_samples: int = 4096, seeds: int = 20): # Times propagating uncertain inputs through a sophisticated model, and compares how close each sampling method gets to an exact mean with few samples
+    print_header(f"uncertainty ({samples:,} samples)")
+    inputs = ({"distribution": "lognormal", "median": 1000, "sigma": 0.2}, {"distribution": "normal", "mean": 5, "sd": 1, "low": 0}, "hour", {"distribution": "uniform", "low": 300, "high": 365})
+    inline_time = time_function(lambda: run_uncertainty("sophisticated", *inputs, target_population=[1e6, 1e9], samples=samples, workers=1), repeats=1)
+    pool_time = time_function(lambda: run_uncertainty("sophisticated", *inputs, target_population=[1e6, 1e9], samples=samples), repeats=1)
+    print(f"One process: {inline_time:.4f}s ({samples / inline_time:,.0f} samples per second)")
+    print(f"Process pool ({os.cpu_count()} cores): {pool_time:.4f}s ({samples / pool_time:,.0f} samples per second)")
+    fission_frequency, days, low, high = 24, 100, 2, 8 # the growth rate is uniform between low and high, so the mean has a closed form
+    integral = lambda rate: 100 * fission_frequency / (fission_frequency * days + 1) * (1 + rate / (100 * fission_frequency)) ** (fission_frequency * days + 1)
+    exact_mean = 1000 * (integral(high) - integral(low)) / (high - low)
+    for method in UNCERTAINTY_METHODS:
+        errors = [run_uncertainty("sophisticated", 1000, {"distribution": "uniform", "low": low, "high": high}, fission_frequency, days, samples=convergence_samples, method=method, seed=seed).mean() / exact_mean - 1 for seed in range(seeds)]
+        print(f"{method.title()} error of the mean ({convergence_samples} samples): {np.sqrt(np.mean(np.square(errors))):.2e}")
+
+def benchmark_stochastic(replicates: int = 20000, days: int = 30): # Times the stochastic engine in replicate-steps (one fission event of one replicate) per second
+    print_header(f"stochastic replicates ({replicates:,} replicates, fission every hour for {days} days)")
+    model = Model("sophisticated", 1000, TimeAmount(10, "day"), "hour")
+    time_axis = TimeAxis(0, 1, days + 1, "day")
+    replicate_steps = replicates * days * 24
+    deterministic = calculate_population_size("sophisticated", 1000, TimeAmount(10, "day"), 24, TimeAmount(days, "day"))
+    for workers in [1, None]: # one process, then every core
+        result = run_stochastic_model(model, time_axis, replicates, "binomial", 0, workers)
+        stochastic_time = time_function(run_stochastic_model, model, time_axis, replicates, "binomial", 0, workers, repeats=1)
+        print(f"{workers or os.cpu_count()} worker(s): {stochastic_time:.4f}s ({replicate_steps / stochastic_time:,.0f} replicate-steps per second)")
+    print(f"Mean final population {result.mean()[-1]:.2f} (deterministic {deterministic:.2f}), 5th to 95th percentile {result.band()[0][-1]:.0f} to {result.band()[1][-1]:.0f}")
+
+class ObjectCell: # A cell stored as its own Python object, kept to compare the memory of the cell buffers against
+    __slots__ = ("age", "timer", "mutations", "alive")
+    def __init__(self, age: float, timer: float): # Constructor
+        self.age, self.timer, self.mutations, self.alive = age, timer, 0, True
+
+def benchmark_agents(initial_population: int = 1000000, days: int = 4): # Times the agent-based engine in cell-steps per second and measures its memory as it passes 10 million cells
+    print_header(f"agent-based cells ({initial_population:,} cells doubling every day for {days} days)")
+    model = Model("sophisticated", initial_population, TimeAmount(100, "day"), 1) # one fission event a day doubles the cells
+    tracemalloc.start()
+    start = perf_counter()
+    result = run_agent_model(model, TimeAxis(0, 1, days + 1, "day"))
+    agent_time = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    cell_steps = result.counts[:-1].sum() * 24 # about how many cells were updated
+    print(f"{int(result.counts[-1]):,} cells (deterministic {initial_population * 2 ** days:,}) in {agent_time:.4f}s ({cell_steps / agent_time:,.0f} cell-steps per second)")
+    print(f"Peak memory: {peak / 1e6:,.0f} MB ({result.peak_bytes / 1e6:,.0f} MB of cell buffers, {peak / result.counts[-1]:.1f} bytes per cell)")
+    tracemalloc.start()
+    cells = [ObjectCell(0.0, 1.0) for _ in range(100000)]
+    object_bytes = tracemalloc.get_traced_memory()[0] / len(cells)
+    tracemalloc.stop()
+    print(f"One Python object per cell: {object_bytes:.1f} bytes per cell, {object_bytes * result.counts[-1] / 1e9:.1f} GB for the same cells")
+
+def benchmark_graph(points: int = 1000000): # Compares drawing every point of a long series against the decimated graph
+    print_header(f"graph rendering ({points:,} points per series)")
+    plt = get_pyplot()
+    time_axis = TimeAxis(0, 1, points, "second")
+    populations = [list(1000 * np.exp(np.linspace(0, 20, points)) * (1 + 0.01 * np.sin(np.arange(points)))) for _ in range(3)] # opening, added and final
+    def draw_full(): # the old graph, every point with its time made in a loop
+        plt.figure()
+        times = [time_axis[i].get_quantity() for i in range(len(time_axis))]
+        for series in populations: plt.plot(times, series)
+        plt.gcf().canvas.draw()
+        plt.close("all")
+    def draw_decimated(): # the graph as show_graph draws it now
+        plt.figure()
+        for series in populations: plot_series(time_axis, series, "")
+        plt.gcf().canvas.draw()
+        plt.close("all")
+    full_time = time_function(draw_full, repeats=1)
+    decimated_time = time_function(draw_decimated, repeats=1)
+    print(f"Every point: {full_time:.4f}s")
+    print(f"Decimated ({len(decimate_series(populations[0])[0])} points): {decimated_time:.4f}s")
+    print(f"Speedup: {full_time / decimated_time:.1f}x")
+
+def benchmark_table(rows: int = 1000000): # Compares the old print_table against the paged one on a long comparison table
+    print_header(f"print_table ({rows:,} row comparison)")
+    populations = [np.round(1000 * np.exp(np.linspace(0, 10, rows) * rate), 2).tolist() for rate in [1, 1.5, 2]]
+    data = [range(rows)] + populations
+    titles = ["Time (in days)", "Model 1", "Model 2", "Model 3"]
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        old_time = time_function(scalar_print_table, data, rows + 1, "Comparison", titles, repeats=1)
+        new_time = time_function(lambda: print_table(data, rows + 1, "Comparison", titles), repeats=1)
+        view_time = time_function(lambda: print_table(data, rows + 1, "Comparison", titles, view=table_view(rows + 1, 20, 20, 10)), repeats=1)
+    print(f"Old print_table: {old_time:.4f}s")
+    print(f"Paged print_table: {new_time:.4f}s ({old_time / new_time:.1f}x faster)")
+    print(f"First and last 20 rows, every 10th: {view_time:.4f}s")
+
+def benchmark_startup(): # Times importing each part of the simulator in a fresh Python, with matplotlib (which used to be imported at startup) to compare against
+    print_header("startup (import in a fresh python)")
+    empty_time = time_function(subprocess.run, [sys.executable, "-c", "pass"], repeats=5) # starting Python itself, taken off every time below
+    for name, statement in [("Calculation core", "import calculation_functions"), ("Simulator", "import main"), ("Simulator and matplotlib", "import main, matplotlib.pyplot")]:
+        import_time = time_function(subprocess.run, [sys.executable, "-c", statement], repeats=5) - empty_time
+        print(f"{name}: {import_time * 1000:.1f}ms")
+    loaded = subprocess.run([sys.executable, "-c", "import sys, main; print(' '.join(module for module in ['matplotlib', 'termcolor'] if module in sys.modules) or 'none')"], capture_output=True, text=True).stdout.strip()
+    print(f"Loaded by importing the simulator: {loaded}")
+
+if __name__ == "__main__":
+    benchmark_startup()
+    benchmark_calculate_models(1000)
+    benchmark_calculate_models(10000)
+    benchmark_rounding()
+    benchmark_sweep()
+    benchmark_chunked_sweep()
+    benchmark_precision()
+    benchmark_time_amounts()
+    benchmark_targets()
+    benchmark_growth_models()
+    benchmark_sensitivities()
+    benchmark_uncertainty()
+    benchmark_stochastic()
+    benchmark_agents()
+    benchmark_graph()
+    benchmark_table()
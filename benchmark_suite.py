@@ -0,0 +1,150 @@
+import os # Imports os for picking the graph backend and throwing away printed output
+os.environ.setdefault("MPLBACKEND", "Agg") # Graphs are drawn off screen so they can be timed without a window
+import main # Imports the simulator so the real pipeline is benchmarked
+from main import SIMULATION_SETTINGS, LOG_FLOAT_LIMIT, UNIT_RATIO, Model, TimeAmount, calculate_log_population_array, compile_data, calculate_models, calculate_time_to_reach_target, print_results, show_graph, result_cache, get_pyplot, cprint # Imports every stage of the pipeline
+from contextlib import redirect_stdout # Imports redirect_stdout so printed tables and prompts are not shown while they are timed
+from time import perf_counter # Imports a high resolution timer for timing
+import argparse # Imports argparse for reading the command line
+import io # Imports io for answering the graph prompt without a keyboard
+import json # Imports json for writing and reading results
+import numpy as np # Imports numpy for its version
+import platform # Imports platform for recording the machine the results came from
+import subprocess # Imports subprocess for recording the commit the results came from
+import sys # Imports sys for the stdin the graph prompt reads
+import tracemalloc # Imports tracemalloc for measuring the peak memory of each stage
+import warnings # Imports warnings so showing a graph off screen does not warn
+
+SUITE_HORIZONS = { # How far each horizon projects (in days) and the target population it grows to
+    "small": {"projection_days": 30, "target_population": 1e5},
+    "medium": {"projection_days": 1000, "target_population": 1e12},
+    "extreme": {"projection_days": 100000, "target_population": 1e300},
+}
+SUITE_STAGES = ["compile_data", "calculate_time_to_reach_target", "calculate_models", "print_results", "show_graph"] # The stages of the pipeline in the order run_module runs them
+SUITE_REGRESSION_RATIO = 1.2 # Stages this many times slower than the results they are compared to are reported as regressions
+SUITE_NOISE_SECONDS = 0.01 # Stages that got slower by less than this are not regressions, as timer noise is bigger than very quick stages
+DEFAULT_MODEL = {"initial_population": 1000, "growth_rate": [5, "day"], "fission_frequency": "hour"} # What every model is given where run_inputs would ask the user
+
+def module_models(settings: dict) -> list[Model]: # Function that makes the models of a module like run_inputs, with DEFAULT_MODEL instead of asking for anything that is not forced
+    forced = settings["forced"]
+    initial_population = forced.get("initial_population", DEFAULT_MODEL["initial_population"])
+    if initial_population == "same": initial_population = DEFAULT_MODEL["initial_population"] # module 5 asks for one initial population for every model
+    growth_rate = forced.get("growth_rate", DEFAULT_MODEL["growth_rate"])
+    models = [Model("naive", initial_population, TimeAmount(*growth_rate), None) for _ in range(settings["naive_models"])]
+    for i in range(settings["sophisticated_models"]):
+        fission_frequency = forced.get("fission_frequency", DEFAULT_MODEL["fission_frequency"])
+        models.append(Model("sophisticated", initial_population, TimeAmount(*growth_rate), fission_frequency[i] if isinstance(fission_frequency, list) else fission_frequency))
+    return models
+
+def overflows(models: list[Model], projection_days: float) -> bool: # Function that checks if any model grows too big for a float by the end of the projection, like a user would turn on log-space for it
+    for model in models:
+        fission_frequency = UNIT_RATIO[model.growth_rate.get_unit(), model.fission_frequency] if isinstance(model.fission_frequency, str) else model.fission_frequency
+        if calculate_log_population_array(model.model_type, model.initial_population, model.growth_rate.get_quantity(), fission_frequency, projection_days, model.growth_rate.get_unit(), "day") > LOG_FLOAT_LIMIT: return True
+    return False
+
+def suite_cases(horizons: list[str]) -> list[dict]: # Function that makes a case for every module, condition and horizon (varied modules are run with both conditions)
+    cases = []
+    for module_number, settings in enumerate(SIMULATION_SETTINGS, start=1):
+        for condition in (["projected", "population"] if settings["condition"] == "varied" else [settings["condition"]]):
+            for horizon in horizons:
+                log_space = condition == "projected" and overflows(module_models(settings), SUITE_HORIZONS[horizon]["projection_days"]) # target populations always fit in a float
+                cases.append({"module": module_number, "name": settings["name"], "output": settings["output"], "condition": condition, "horizon": horizon, **SUITE_HORIZONS[horizon], "log_space": log_space})
+    return cases
+
+def run_case(case: dict, stage_finished) -> int: # Function that runs every stage of the pipeline for a case once without any prompts, calling stage_finished(stage) after each one, and gives the rows calculated
+    settings = SIMULATION_SETTINGS[case["module"] - 1]
+    projection_time = TimeAmount(case["projection_days"], "day") if case["condition"] == "projected" else None
+    target_population = case["target_population"] if case["condition"] == "population" else None
+    models = module_models(settings)
+    calculation_data = compile_data(models, projection_time, target_population, case["condition"], settings["output"])
+    stage_finished("compile_data")
+    if case["condition"] == "population": # the time to reach the target is also timed on its own, compile_data only uses it to make the time axes
+        for model in models: calculate_time_to_reach_target(*model[:4], target_population)
+        stage_finished("calculate_time_to_reach_target")
+    calculations = calculate_models(calculation_data, "day")
+    stage_finished("calculate_models")
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        print_results(*calculations, case["condition"], settings["output"])
+        stage_finished("print_results")
+        stdin, sys.stdin = sys.stdin, io.StringIO("y\n") # answers the "Print Graph?" prompt
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore") # showing a graph off screen warns that it can not be shown
+                show_graph(*calculations, case["condition"], settings["output"])
+        finally:
+            sys.stdin = stdin
+        plt = get_pyplot()
+        for figure in map(plt.figure, plt.get_fignums()): figure.canvas.draw() # the graph is drawn, as showing it off screen does not draw it
+        plt.close("all")
+        stage_finished("show_graph")
+    return sum(len(calculation[-1]) for calculation in calculation_data)
+
+def benchmark_case(case: dict, repeats: int = 3) -> dict: # Function that times every stage of a case (best of a few runs) and measures its peak memory (in another run, as tracemalloc slows everything down)
+    seconds = {}
+    for _ in range(repeats):
+        last = perf_counter()
+        def timed(stage): # records how long the stage took since the last one finished
+            nonlocal last
+            seconds[stage] = min(seconds.get(stage, float("inf")), perf_counter() - last)
+            last = perf_counter()
+        rows = run_case(case, timed)
+    peak_bytes = {}
+    tracemalloc.start()
+    start_bytes = tracemalloc.get_traced_memory()[0]
+    def traced(stage): # records the most memory the stage used above what was used before it
+        nonlocal start_bytes
+        current, peak = tracemalloc.get_traced_memory()
+        peak_bytes[stage] = peak - start_bytes
+        tracemalloc.reset_peak()
+        start_bytes = current
+    try:
+        run_case(case, traced)
+    finally:
+        tracemalloc.stop()
+    return {**case, "rows": rows, "seconds": sum(seconds.values()), "stages": {stage: {"seconds": seconds[stage], "peak_bytes": peak_bytes[stage]} for stage in SUITE_STAGES if stage in seconds}}
+
+def case_key(case: dict) -> tuple: # Function that gets what a case is matched by when comparing results
+    return case["module"], case["condition"], case["horizon"]
+
+def run_suite(horizons: list[str] = list(SUITE_HORIZONS), repeats: int = 3) -> dict: # Function that benchmarks every case and records what the results came from
+    log_space, enabled = main.log_space, result_cache.enabled
+    result_cache.enabled = False # every run is calculated, not read from the cache
+    cases = []
+    try:
+        for case in suite_cases(horizons):
+            main.log_space = case["log_space"]
+            cases.append(benchmark_case(case, repeats))
+            cprint(f"Module {case['module']} {case['output']} {case['condition']} {case['horizon']}: {cases[-1]['seconds']:.4f}s, {cases[-1]['rows']:,} rows", "grey", attrs=["dark"])
+    finally:
+        main.log_space, result_cache.enabled = log_space, enabled
+    commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    return {"commit": commit or None, "python": platform.python_version(), "numpy": np.__version__, "machine": platform.platform(), "repeats": repeats, "cases": cases}
+
+def compare_results(new: dict, old: dict, ratio: float = SUITE_REGRESSION_RATIO) -> list[str]: # Function that compares every stage to older results, giving the stages that got slower by more than the ratio
+    old_cases = {case_key(case): case for case in old["cases"]}
+    regressions = []
+    for case in new["cases"]:
+        if case_key(case) not in old_cases: continue # cases that were not benchmarked before can not be compared
+        for stage, result in case["stages"].items():
+            old_result = old_cases[case_key(case)]["stages"].get(stage)
+            if old_result is None or old_result["seconds"] == 0: continue
+            change = result["seconds"] / old_result["seconds"]
+            line = f"Module {case['module']} {case['condition']} {case['horizon']} {stage}: {old_result['seconds']:.4f}s -> {result['seconds']:.4f}s ({change:.2f}x), peak {old_result['peak_bytes']:,} -> {result['peak_bytes']:,} bytes"
+            if change > ratio and result["seconds"] - old_result["seconds"] > SUITE_NOISE_SECONDS:
+                regressions.append(line)
+                cprint(line, "red")
+            else: print(line)
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark every stage of every module at small, medium and extreme horizons.")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="file to write the results to")
+    parser.add_argument("--horizons", nargs="+", choices=list(SUITE_HORIZONS), default=list(SUITE_HORIZONS), help="horizons to benchmark")
+    parser.add_argument("-r", "--repeats", type=int, default=3, help="runs of each case, the fastest is kept")
+    parser.add_argument("-c", "--compare", help=f"older results to compare against, stages more than {SUITE_REGRESSION_RATIO}x slower are regressions")
+    arguments = parser.parse_args()
+    results = run_suite(arguments.horizons, arguments.repeats)
+    with open(arguments.output, "w") as file: json.dump(results, file, indent=4)
+    cprint(f"Results written to {arguments.output}", "green")
+    if arguments.compare:
+        with open(arguments.compare) as file: regressions = compare_results(results, json.load(file))
+        if regressions: sys.exit(f"{len(regressions)} stage(s) got slower")
@@ -0,0 +1,80 @@
+from math import log, ceil # Imports the math functions the calculations need, log and ceil
+from typing import NamedTuple # Imports NamedTuple for the model record
+
+SECONDS_IN_UNIT = {"year": 31536000, "half-year": 31536000 / 2, "quarter-year": 31536000 / 4, "month": 2592000, "week": 604800, "day": 86400, "half-day": 86400 / 2, "quarter-day": 86400 / 4, "2-hour": 3600 * 2, "hour": 3600, "minute": 60, "second": 1} # Defines the number of seconds in each unit
+UNITS_ABBREVIATION = {"year": "y", "half-year": "hy", "quarter-year": "qy", "month": "m", "week": "w", "day": "d", "half-day": "hd", "quarter-day": "qd", "2-hour": "2h", "hour": "h", "minute": "min", "second": "s"} # Defines some abbreviations for units
+
+UNIT_RATIO = {(from_unit, to_unit): SECONDS_IN_UNIT[from_unit] / SECONDS_IN_UNIT[to_unit] for from_unit in SECONDS_IN_UNIT for to_unit in SECONDS_IN_UNIT} # How many of one unit are in another, UNIT_RATIO[("day", "hour")] is 24, worked out once instead of on every conversion
+
+class TimeAmount: # Class for time amounts, which are a float and a str (unit). They can not be changed, converting or rounding gives a new TimeAmount
+    __slots__ = ("quantity", "unit") # only a quantity and a unit are stored, so each one is small
+
+    def __init__(self, quantity:float, unit:str): # Constructor
+        object.__setattr__(self, "quantity", quantity) # sets quantity
+        object.__setattr__(self, "unit", unit) # sets unit
+
+    def __setattr__(self, name, value): # this runs if an attribute is set, which is not allowed
+        raise AttributeError("TimeAmount can not be changed, make a new one instead")
+
+    def __reduce__(self): # this runs if the class is pickled, it is remade from its quantity and unit
+        return TimeAmount, (self.quantity, self.unit)
+
+    def __str__(self): # this runs if the class is converted to a string
+        if self.quantity == 1:
+            return f"{self.quantity} {self.unit}"
+        else:
+            return f"{self.quantity} {self.unit}s"
+    
+    def __round__(self, n): # this runs if the class is rounded
+        return TimeAmount(round(self.quantity, n), self.unit)
+    
+    def convert(self, to_unit: str): # gives the timeamount in the new unit
+        return TimeAmount(UNIT_RATIO[self.unit, to_unit] * self.quantity, to_unit) # formula of conversion
+    
+    def scale(self, to_unit: str): # gives the timeamount scaled to the new unit (for rates, per growth rate unit becomes per new unit)
+        return TimeAmount(UNIT_RATIO[to_unit, self.unit] * self.quantity, to_unit) # formula of scaling
+
+    def get_quantity(self): # gets the quantity
+        return self.quantity
+    
+    def get_unit(self): # gets the unit
+        return self.unit
+
+class Model(NamedTuple): # Record for a model's settings, immutable and no bigger than a tuple. It can still be indexed and unpacked like the lists it replaced
+    model_type: str # "naive" or "sophisticated"
+    initial_population: float # the population at the start
+    growth_rate: TimeAmount # the growth rate % per unit
+    fission_frequency: float|str|None # fission-events per growth rate unit (a unit name until compile_data changes it), None for naive models
+    carrying_capacity: float|None = None # the population logistic and gompertz models slow down towards, None for no limit
+    growth_schedule: tuple|None = None # how the growth rate changes over time, (start time in growth rate units, growth rate %) pairs or a function of time that gives the growth rate %
+
+def time_unit(unit: str) -> str: # Function that gets the full unit name from a unit, abbreviation or plural (like time_amount_input does)
+    unit = unit.lower()
+    if unit not in SECONDS_IN_UNIT and unit.endswith("s") and unit[:-1] in list(SECONDS_IN_UNIT) + list(UNITS_ABBREVIATION.values()): unit = unit[:-1] # removes the plural
+    if unit in UNITS_ABBREVIATION.values(): unit = list(UNITS_ABBREVIATION.keys())[list(UNITS_ABBREVIATION.values()).index(unit)] # changes the abbreviation to the unit
+    if unit not in SECONDS_IN_UNIT: raise ValueError(f"Unknown time unit: {unit}")
+    return unit
+
+def calculate_population_size(model_type: str, initial_population: float, growth_rate: TimeAmount, fission_frequency: int, projection_time: TimeAmount) -> float: # Function that calculates the final population based on inputted variables
+    initial_population = float(initial_population) # changes the initial population to a float to avoid errors
+    unit_ratio = UNIT_RATIO[projection_time.unit, growth_rate.unit] # how many growth rate units are in one projection time unit
+    rate = unit_ratio * growth_rate.quantity / 100 # scales the growth rate to the same unit as the projection time and makes it from a percentage to decimal
+    if model_type == "naive": # if the model type is naive
+        return initial_population + (rate * initial_population * projection_time.quantity) # returns the final population A = P + (PRT)
+    if model_type == "sophisticated": # if the model type is sophisticated
+        fission_frequency = unit_ratio * fission_frequency # scales the fission frequency to the same unit as the growth rate
+        rate_over_fission = rate / float(fission_frequency) # gets the growth rate over the fission frequency
+        total_fission_events = projection_time.quantity * fission_frequency # gets the total number of fission events
+        return initial_population * ((1 + rate_over_fission) ** total_fission_events) # returns the final population (1+r/n)^(nt)
+
+def calculate_time_to_reach_target(model_type:str, initial_population: float, growth_rate: TimeAmount, fission_frequency: int, target_population: float) -> TimeAmount|int: # Function that calculates the time needed to reach the target population based on inputted variables
+    target_population_ratio = target_population / initial_population # gets the target population ratio
+    rate = growth_rate.quantity / 100 # divides the growth rate by 100 to make it from a percentage to decimal
+    try: increment = 1 / fission_frequency # gets the frequency increment
+    except: increment = 1 # if the fission frequency is None, set the increment to 1 (for naive models)
+    if model_type == "naive": # if the model type is naive
+        time_needed = ceil((target_population - initial_population) / (initial_population * rate)) # this is to ceiling the time needed by the increment
+    elif model_type == "sophisticated": # if the model type is sophisticated
+        time_needed = log(target_population_ratio) / (fission_frequency * log(1 + rate / float(fission_frequency))) # gets the time needed using the formula and logarithms
+        time_needed = ceil(time_needed / increment) * increment # this is to ceiling the time needed by the frequency increment
+    return TimeAmount(time_needed, growth_rate.unit), increment # returns the time needed
@@ -0,0 +1,41 @@
+import numpy as np
+import csv
+import os
+import re
+
+EXPORT_COLUMNS = ["time", "opening", "added", "final"]
+EXPORT_FORMATS = ["csv", "npy", "npz"]
+
+def export_name(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+def export_columns(chunks, count: int, csv_path: str = None, npy_folder: str = None, titles: list[str] = EXPORT_COLUMNS) -> dict[str, str]:
+    csv_file = open(csv_path, "w", newline="") if csv_path else None
+    if csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(titles)
+    npy_paths = {}
+    if npy_folder:
+        os.makedirs(npy_folder, exist_ok=True)
+        npy_paths = {title: os.path.join(npy_folder, f"{title}.npy") for title in titles}
+        columns = {title: np.lib.format.open_memmap(path, mode="w+", dtype=float, shape=(count,)) for title, path in npy_paths.items()}
+    row = 0
+    for chunk in chunks:
+        if csv_file:
+            writer.writerows(zip(*[np.asarray(values).tolist() for values in chunk]))
+        if npy_folder:
+            for title, values in zip(titles, chunk):
+                columns[title][row:row + len(values)] = values
+        row += len(chunk[0])
+    if csv_file:
+        csv_file.close()
+    if npy_folder:
+        for column in columns.values():
+            column.flush()
+    return npy_paths
+
+def export_npz(path: str, npy_paths: dict[str, str]):
+    np.savez(path, **{title: np.load(npy_path, mmap_mode="r") for title, npy_path in npy_paths.items()})
+
+def load_columns(folder: str) -> dict[str, np.ndarray]:
+    return {file[:-4]: np.load(os.path.join(folder, file), mmap_mode="r") for file in sorted(os.listdir(folder)) if file.endswith(".npy")}
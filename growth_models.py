@@ -0,0 +1,168 @@
+from calculation_functions import Model, TimeAmount # Imports the model record and time amounts
+from math import exp, log, ceil, isnan # Imports exp and log for the growth laws, and ceil for rounding times up
+import numpy as np # Imports numpy for reading the solution at many times at once
+
+GROWTH_MODEL_TYPES = ["logistic", "gompertz"] # Model types that slow down towards a carrying capacity, solved with the adaptive-step integrator
+SOLVER_TOLERANCE = 1e-10 # The most error allowed in the log population on each step (about the same relative error in the population)
+SOLVER_MAX_TIME = 1e10 # The longest time (in growth rate units) the integrator looks for a target population before giving up
+SOLVER_CACHE_SIZE = 100 # How many model solutions are kept so chunks and extensions continue the same solution
+solution_cache: dict[tuple, "GrowthSolution"] = {} # Caches the solution of each model, it is extended when later times are needed
+
+# Dormand-Prince 5(4) coefficients, the fifth order result is kept and the fourth order one is only used to estimate the error
+DORMAND_PRINCE_NODES = [0, 1/5, 3/10, 4/5, 8/9, 1, 1]
+DORMAND_PRINCE_STAGES = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
+]
+DORMAND_PRINCE_ERROR = [71/57600, 0, -71/16695, 71/1920, -17253/339200, 22/525, -1/40] # fifth order weights minus fourth order weights
+DORMAND_PRINCE_DENSE = [-12715105075/11282082432, 0, 87487479700/32700410799, -10690763975/1880347072, 701980252875/199316789632, -1453857185/822651844, 69997945/29380423] # weights of the fourth order correction used to read between steps
+
+def growth_rate_at(model: Model, time: float) -> float: # Function that gets the growth rate (as a decimal per growth rate unit) at a time (in growth rate units)
+    schedule = model.growth_schedule
+    if schedule is None: return model.growth_rate.quantity / 100 # no schedule, the growth rate never changes
+    if callable(schedule): return float(schedule(time)) / 100 # a function of time that gives the growth rate %
+    rate = model.growth_rate.quantity # before the first change the model's own growth rate is used
+    for start, scheduled_rate in schedule: # the schedule is (start time, growth rate %) pairs in time order
+        if time < start: break
+        rate = scheduled_rate
+    return rate / 100
+
+def sorted_schedule(model: Model) -> Model: # Function that makes a piecewise schedule (a list or tuple of start time and growth rate % pairs) a tuple in time order, so it can be a cache key and is read in order
+    if model.growth_schedule is None or callable(model.growth_schedule): return model
+    return model._replace(growth_schedule=tuple(sorted((float(start), float(rate)) for start, rate in model.growth_schedule)))
+
+def schedule_changes(model: Model) -> list[float]: # Function that gets the times a piecewise schedule changes the growth rate, the integrator stops at each one so it never steps over a jump
+    if model.growth_schedule is None or callable(model.growth_schedule): return []
+    return sorted(start for start, _ in model.growth_schedule)
+
+def log_growth(model: Model, time: float, log_population: float) -> float: # Function that gets how fast the log population grows (d ln(P)/dt), logs keep long horizons from overflowing
+    rate = growth_rate_at(model, time)
+    if model.model_type == "logistic": # dP/dt = rP(1 - P/K), no carrying capacity is plain continuous growth
+        return rate if model.carrying_capacity is None else rate * (1 - exp(log_population) / model.carrying_capacity)
+    if model.model_type == "gompertz": # dP/dt = rP ln(K/P)
+        return rate * (log(model.carrying_capacity) - log_population)
+    raise ValueError(f"Unknown growth model type: {model.model_type}")
+
+class GrowthSolution: # Class for a solved growth model, the log population and its slope at every step the integrator took, and a correction for reading between steps
+    def __init__(self, model: Model): # Constructor
+        if model.model_type not in GROWTH_MODEL_TYPES: raise ValueError(f"Unknown growth model type: {model.model_type}")
+        if model.model_type == "gompertz" and model.carrying_capacity is None: raise ValueError("Gompertz models need a carrying capacity")
+        self.model = model = sorted_schedule(model) # sets the model that is solved
+        self.times = [0.0] # sets the times of each step (in growth rate units)
+        self.log_populations = [log(model.initial_population)] # sets the log population at each step
+        self.slopes = [log_growth(model, 0.0, self.log_populations[0])] # sets d ln(P)/dt at each step, used to read between steps
+        self.corrections = [] # sets the fourth order correction of each step, which makes reading between steps as accurate as the steps
+        self.step = None # the size of the next step, kept so extending carries on where it stopped
+        self.arrays = None # the steps as numpy arrays, only made again when there are new steps
+
+    def __len__(self): # this runs if len() is used on the class, the number of steps
+        return len(self.times)
+
+    def end(self) -> float: # gets the last time that has been solved
+        return self.times[-1]
+
+    def take_step(self, limit: float): # takes one accepted step, no further than the limit
+        model, time, log_population, slope = self.model, self.times[-1], self.log_populations[-1], self.slopes[-1]
+        if model.carrying_capacity is not None and abs(log_population - log(model.carrying_capacity)) < SOLVER_TOLERANCE: # settled at the carrying capacity, it stays there whatever the growth rate, so one step reaches the limit (explicit steps near it would have to stay small to be stable)
+            self.slopes[-1] = 0.0 # the slope left is under SOLVER_TOLERANCE per step, but over one long step it would bend the curve read between the steps
+            self.times.append(limit)
+            self.log_populations.append(log_population)
+            self.slopes.append(0.0)
+            self.corrections.append(0.0)
+            self.arrays = None
+            return
+        step = self.step if self.step is not None else 0.1 / max(abs(slope), 1e-9) # the first step is about a tenth of the time the log population takes to change by 1
+        while True:
+            step = min(step, limit - time)
+            stages = [slope] # the slopes at each stage of the step, the first is the slope at the end of the last step
+            for node, weights in zip(DORMAND_PRINCE_NODES[1:], DORMAND_PRINCE_STAGES[1:]):
+                stages.append(log_growth(model, time + node * step, log_population + step * sum(weight * stage for weight, stage in zip(weights, stages))))
+            new_log_population = log_population + step * sum(weight * stage for weight, stage in zip(DORMAND_PRINCE_STAGES[-1], stages))
+            error = abs(step * sum(weight * stage for weight, stage in zip(DORMAND_PRINCE_ERROR, stages))) / SOLVER_TOLERANCE # how far over the allowed error the step was
+            next_step = step * min(5, max(0.2, 0.9 * error ** -0.2)) if error > 0 else step * 5 # big steps where the curve is smooth, small ones where it bends
+            if error <= 1 or step < 1e-12: break # the step is accurate enough
+            step = next_step
+        self.times.append(time + step)
+        self.log_populations.append(new_log_population)
+        self.slopes.append(stages[-1]) # the last stage is the slope at the end of the step
+        self.corrections.append(step * sum(weight * stage for weight, stage in zip(DORMAND_PRINCE_DENSE, stages)))
+        self.step = next_step
+        self.arrays = None
+
+    def extend_to(self, end: float): # solves the model until the given time (in growth rate units)
+        for change in schedule_changes(self.model) + [end]: # each stretch between growth rate changes is solved separately
+            change = min(change, end)
+            while self.end() < change * (1 - 1e-15) and self.end() < change - 1e-12:
+                self.take_step(change)
+        return self
+
+    def can_reach(self, log_population: float) -> bool: # checks if the log population can ever be reached, the population never crosses its carrying capacity
+        return self.model.carrying_capacity is None or log_population < max(self.log_populations[0], log(self.model.carrying_capacity))
+
+    def extend_until(self, log_population: float): # solves the model until the log population reaches the given value (or SOLVER_MAX_TIME)
+        if not self.can_reach(log_population): return self
+        changes = schedule_changes(self.model)
+        while max(self.log_populations) < log_population and self.end() < SOLVER_MAX_TIME:
+            next_changes = [change for change in changes if change > self.end() + 1e-12] # steps do not cross a growth rate change
+            self.take_step(min(next_changes + [SOLVER_MAX_TIME]))
+        return self
+
+    def get_arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: # gets the times, log populations, slopes and corrections of every step as arrays
+        if self.arrays is None: self.arrays = (np.array(self.times), np.array(self.log_populations), np.array(self.slopes), np.array(self.corrections))
+        return self.arrays
+
+    def log_population_at(self, times) -> np.ndarray: # gets the log population at any times inside the solution, reading between the steps with the integrator's own dense output
+        solution = self.get_arrays()
+        step_times, log_populations = solution[:2]
+        times = np.asarray(times, dtype=float)
+        if len(step_times) == 1: return np.full(times.shape, log_populations[0])
+        index = np.clip(np.searchsorted(step_times, times, side="right") - 1, 0, len(step_times) - 2) # the step each time is in
+        return dense_output(times, *solution, index)
+
+    def population_at(self, times) -> np.ndarray: # gets the population at any times inside the solution
+        return np.exp(self.log_population_at(times))
+
+    def time_to_reach(self, target_populations) -> np.ndarray: # gets the first time each target population is reached (nan if it is not reached in the solution), all targets are solved together
+        solution = self.get_arrays()
+        step_times, log_populations = solution[:2]
+        log_targets = np.log(np.asarray(target_populations, dtype=float))
+        highest = np.maximum.accumulate(log_populations) # the highest log population so far, so the first crossing is found even if the population falls at times
+        index = np.searchsorted(highest, log_targets, side="left") # the first step at or above each target
+        times = np.full(log_targets.shape, np.nan)
+        times[index == 0] = step_times[0] # targets at or below the initial population are reached straight away
+        inside = (index > 0) & (index < len(step_times))
+        index = index[inside] - 1 # the step each crossing is in
+        low, high = step_times[index], step_times[index + 1] # each crossing is found by bisection of every target at once
+        for _ in range(60):
+            middle = (low + high) / 2
+            below = dense_output(middle, *solution, index) < log_targets[inside]
+            low, high = np.where(below, middle, low), np.where(below, high, middle)
+        times[inside] = high
+        return times
+
+def dense_output(times: np.ndarray, step_times: np.ndarray, log_populations: np.ndarray, slopes: np.ndarray, corrections: np.ndarray, index: np.ndarray) -> np.ndarray: # Function that reads the log population between two steps from their values, slopes and correction (Dormand-Prince dense output)
+    step = step_times[index + 1] - step_times[index]
+    s = (times - step_times[index]) / step # how far through the step each time is (0 to 1)
+    change = log_populations[index + 1] - log_populations[index]
+    start_difference = step * slopes[index] - change
+    return log_populations[index] + s * (change + (1 - s) * (start_difference + s * (change - step * slopes[index + 1] - start_difference + (1 - s) * corrections[index])))
+
+def solve_growth_model(model: Model, end: float = 0) -> GrowthSolution: # Function that gets the solution of a model until the given time (in growth rate units), continuing a cached solution if there is one
+    model = sorted_schedule(model) # lists can not be cache keys
+    key = (model.model_type, float(model.initial_population), model.growth_rate.quantity, model.growth_rate.unit, model.carrying_capacity, model.growth_schedule) # time amounts are compared by value, not by object
+    if key not in solution_cache:
+        if len(solution_cache) >= SOLVER_CACHE_SIZE: solution_cache.pop(next(iter(solution_cache))) # removes the oldest solution
+        solution_cache[key] = GrowthSolution(model)
+    return solution_cache[key].extend_to(end)
+
+def calculate_growth_time_to_reach_target(model: Model, target_population: float) -> tuple[TimeAmount, int]: # Function that calculates the time a growth model needs to reach the target population, rounded up to a whole growth rate unit (like calculate_time_to_reach_target)
+    solution = solve_growth_model(model).extend_until(log(target_population)) # only solves as far as the target
+    time_needed = float(solution.time_to_reach([target_population])[0])
+    if isnan(time_needed): raise ValueError(f"{model.model_type.title()} model never reaches {target_population}" + (f", its carrying capacity is {model.carrying_capacity}" if model.carrying_capacity is not None else ""))
+    time_needed = max(ceil(time_needed - SOLVER_TOLERANCE * max(time_needed, 1)), 0) # the solver's error at an exact whole unit does not add a unit
+    return TimeAmount(time_needed, model.growth_rate.unit), 1 # one row per growth rate unit
@@ -0,0 +1,62 @@
+from contextlib import contextmanager # Imports contextmanager for wrapping each stage in a with block
+from print_functions import print_table # Imports print_table for the breakdown
+from time import perf_counter # Imports a high resolution timer for timing
+import cProfile # Imports cProfile for counting the calls made in each stage
+import pstats # Imports pstats for adding up the calls and saving the profile
+import sys # Imports sys for counting the memory blocks each stage keeps
+import tracemalloc # Imports tracemalloc for the peak memory of each stage
+
+class StageRecorder: # Class that records the wall time, calls, memory blocks kept and peak memory of each stage of a run
+    def __init__(self): # Constructor
+        self.stages = [] # sets the measurements of each finished stage, in the order they ran
+        self.profiles = [] # sets the profile of each stage, added together when they are saved
+        self.started_tracing = False # whether tracemalloc was started here, so it is only stopped here if it was
+
+    def __len__(self): # this runs if len() is used on the class, the number of stages recorded
+        return len(self.stages)
+
+    @contextmanager
+    def stage(self, name: str): # measures everything run inside the with block as one stage
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+        tracemalloc.reset_peak()
+        start_memory = tracemalloc.get_traced_memory()[0]
+        start_blocks = sys.getallocatedblocks()
+        profile = cProfile.Profile()
+        start = perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            seconds = perf_counter() - start
+            self.profiles.append(profile)
+            self.stages.append({
+                "stage": name,
+                "seconds": seconds,
+                "calls": pstats.Stats(profile).total_calls,
+                "blocks": sys.getallocatedblocks() - start_blocks, # memory blocks (mostly objects) made in the stage that are still kept after it
+                "peak_bytes": tracemalloc.get_traced_memory()[1] - start_memory, # the most memory used above what was used before the stage
+            })
+
+    def print_breakdown(self): # prints one row per stage
+        columns = [[stage[key] for stage in self.stages] for key in ["stage", "seconds", "calls", "blocks", "peak_bytes"]]
+        columns[1] = [f"{seconds:.4f}" for seconds in columns[1]]
+        columns[4] = [f"{peak / 1024 ** 2:.2f}" for peak in columns[4]]
+        print_table(data=columns, table_length=len(self.stages), table_title="Stage Breakdown", titles=["Stage", "Seconds", "Calls", "Blocks Kept", "Peak (MiB)"])
+
+    def dump(self, path: str) -> list[str]: # saves the profile of every stage (for pstats or snakeviz) and a tracemalloc snapshot of what is still allocated, giving the files written
+        written = []
+        if self.profiles:
+            stats = pstats.Stats(*self.profiles)
+            stats.dump_stats(f"{path}.prof")
+            written.append(f"{path}.prof")
+        if tracemalloc.is_tracing():
+            tracemalloc.take_snapshot().dump(f"{path}.tracemalloc")
+            written.append(f"{path}.tracemalloc")
+        return written
+
+    def close(self): # stops tracing memory if it was started here
+        if self.started_tracing: tracemalloc.stop()
+        self.started_tracing = False
@@ -0,0 +1,94 @@
+from server import SERVER_HOST, SERVER_PORT # Imports where the server listens by default
+from time import perf_counter # Imports a high resolution timer for latencies
+import argparse # Imports argparse for reading the command line
+import asyncio # Imports asyncio for sending many requests at once
+import json # Imports json for writing requests and reading responses
+import numpy as np # Imports numpy for latency percentiles
+import os # Imports os for finding the server next to this file
+import random # Imports random for picking which request each client sends
+import subprocess # Imports subprocess for starting a server to test
+import sys # Imports sys for the path of the running Python
+
+def example_requests(distinct: int) -> list[tuple[str, dict]]: # Function that makes a mix of different requests, a smaller number of distinct requests gives more cache hits
+    requests = []
+    for i in range(distinct):
+        model = {"type": "sophisticated", "initial_population": 1000 + i, "growth_rate": [5, "day"], "fission_frequency": "hour"}
+        requests.append([
+            ("/population", {"model": model, "projection_time": [365, "day"]}),
+            ("/target", {"model": model, "target_population": [1e6, 1e7, 1e8], "output_unit": "day"}),
+            ("/trajectory", {"model": model, "projection_time": [1000, "day"]}),
+            ("/sweep", {"model_type": "sophisticated", "initial_population": 1000 + i, "growth_rate": list(range(1, 101)), "fission_frequency": [1, 24, 1440], "projection_time": [30, 365]}),
+        ][i % 4])
+    return requests
+
+async def send(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, path: str, payload: dict|None = None) -> tuple[int, dict]: # Function that sends one request on an open connection and reads the response
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{'POST' if payload is not None else 'GET'} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""): # reads the headers until the blank line
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return status, json.loads(await reader.readexactly(int(headers["content-length"])))
+
+async def client(host: str, port: int, requests: list[tuple[str, dict]], count: int, latencies: list[float], errors: list[str], seed: int): # Function that sends requests one after another on one kept-open connection
+    generator = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    for _ in range(count):
+        path, payload = generator.choice(requests)
+        start = perf_counter()
+        status, response = await send(reader, writer, path, payload)
+        latencies.append(perf_counter() - start)
+        if status != 200: errors.append(f"{status}: {response.get('error')}")
+    writer.close()
+
+async def load_test(host: str, port: int, connections: int, total_requests: int, distinct: int) -> dict: # Function that sends requests from many connections at once and measures the latency and throughput
+    requests = example_requests(distinct)
+    latencies, errors = [], []
+    start = perf_counter()
+    await asyncio.gather(*[client(host, port, requests, total_requests // connections + (i < total_requests % connections), latencies, errors, i) for i in range(connections)])
+    seconds = perf_counter() - start
+    reader, writer = await asyncio.open_connection(host, port)
+    _, server_stats = await send(reader, writer, "/stats")
+    writer.close()
+    latencies = np.array(latencies) * 1000 # in milliseconds
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": seconds,
+        "throughput_per_second": len(latencies) / seconds,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "server": server_stats,
+        "first_errors": errors[:5],
+    }
+
+async def wait_for_server(host: str, port: int, timeout: float = 30): # Function that waits until a server accepts connections
+    deadline = perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if perf_counter() > deadline: raise
+            await asyncio.sleep(0.1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the simulation server on this computer.")
+    parser.add_argument("--host", default=SERVER_HOST, help="address of the server")
+    parser.add_argument("-p", "--port", type=int, default=SERVER_PORT, help="port of the server")
+    parser.add_argument("-c", "--connections", type=int, default=50, help="number of connections sending requests at once")
+    parser.add_argument("-n", "--requests", type=int, default=5000, help="total number of requests")
+    parser.add_argument("-d", "--distinct", type=int, default=200, help="number of different requests, fewer gives more cache hits and coalescing")
+    parser.add_argument("--spawn", action="store_true", help="start a server for the test and stop it afterwards")
+    arguments = parser.parse_args()
+    server = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py"), "--host", arguments.host, "--port", str(arguments.port)], stdout=subprocess.DEVNULL) if arguments.spawn else None
+    try:
+        asyncio.run(wait_for_server(arguments.host, arguments.port))
+        print(json.dumps(asyncio.run(load_test(arguments.host, arguments.port, arguments.connections, arguments.requests, arguments.distinct)), indent=4))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
@@ -1,9 +1,20 @@
 from print_functions import * # Imports my functions for user error and inputting/printing things
-from math import log, ceil, e # Imports neccessary math functions, log and ceil, and the constant e
-import matplotlib.pyplot as plt # Imports matplotlib for graphing
+from export_functions import * # Imports my functions for exporting results as CSV and NumPy columns
+from calculation_functions import * # Imports the calculation core (TimeAmount, calculate_population_size and calculate_time_to_reach_target), which loads quickly on its own
+from growth_models import * # Imports the logistic and Gompertz models and their adaptive-step solver
+from math import log, log10, ceil, floor, e # Imports neccessary math functions, log, log10, ceil and floor, and the constant e
+import numpy as np # Imports numpy for calculating whole trajectories at once
+import sys # Imports sys for writing streamed results to the terminal
+from itertools import zip_longest # Imports zip_longest for streaming models of different lengths side by side
+from decimal import Decimal, localcontext, MAX_EMAX, MIN_EMIN # Imports decimal for the high-precision mode
+from fractions import Fraction # Imports fractions for exact unit and fission frequency ratios in the high-precision mode
+from typing import NamedTuple # Imports NamedTuple for the calculation record
+from collections import OrderedDict # Imports OrderedDict for the least recently used order of the result cache
+from contextlib import nullcontext # Imports nullcontext so stages are not measured when instrumentation is off
+import os # Imports os for checking if the result cache file exists
+import json # Imports json for the keys of the result cache file and the settings of checkpoints
+import zipfile # Imports zipfile for the error a broken result cache or checkpoint file gives
 
-SECONDS_IN_UNIT = {"year": 31536000, "half-year": 31536000 / 2, "quarter-year": 31536000 / 4, "month": 2592000, "week": 604800, "day": 86400, "half-day": 86400 / 2, "quarter-day": 86400 / 4, "2-hour": 3600 * 2, "hour": 3600, "minute": 60, "second": 1} # Defines the number of seconds in each unit
-UNITS_ABBREVIATION = {"year": "y", "half-year": "hy", "quarter-year": "qy", "month": "m", "week": "w", "day": "d", "half-day": "hd", "quarter-day": "qd", "2-hour": "2h", "hour": "h", "minute": "min", "second": "s"} # Defines some abbreviations for units
 SIMULATION_SETTINGS = [ # Settings for all the modules that can be run
     {
         "name": "Compare a naive and sophisticated model", # this is the name of the module
@@ -49,108 +60,660 @@ SIMULATION_SETTINGS = [ # Settings for all the modules that can be run
 
 # Settings
 rounding_amount = 2 # How many decimal places to round to (this can be changed in settings)
+precision_digits = 0 # How many significant digits sophisticated models are calculated to with decimals, 0 uses normal floats (this can be changed in settings)
+log_space = False # Whether populations are calculated as logarithms so very long projections do not overflow (this can be changed in settings)
+streaming_output = False # Whether results are written while they are calculated instead of all at the end (this can be changed in settings)
+table_head_rows = 0 # How many rows from the start of each table are printed, 0 with no tail rows prints every row (this can be changed in settings)
+table_tail_rows = 0 # How many rows from the end of each table are printed (this can be changed in settings)
+table_every_rows = 1 # Only every k-th row of each table is printed (this can be changed in settings)
+stochastic_replicates = 0 # How many random replicates of each sophisticated model are simulated to shade the range of its results on graphs, 0 turns it off (this can be changed in settings)
+agent_mode = False # Whether sophisticated models are also simulated cell by cell, with their live cell counts added to the results and graphs as more models (this can be changed in settings)
+uncertainty_samples = 0 # How many samples each model's input distributions are propagated with after the results, 0 turns uncertainty mode off (this can be changed in settings)
+sensitivity_output = False # Whether the elasticity of each model's populations to every input is printed after the results (this can be changed in settings)
+instrument_stages = "--instrument" in sys.argv or os.environ.get("POPULATION_INSTRUMENT", "").strip().lower() in ("1", "true", "yes", "on") # Whether the time, calls and memory of each stage of a run are measured and printed after the results, which slows runs down (this can be changed in settings)
+instrument_dump = os.environ.get("POPULATION_INSTRUMENT_DUMP") or None # The file name (without an extension) each run's profile and memory snapshot are saved to, None saves nothing (this can be changed in settings)
+STREAM_CHUNK_SIZE = 10000 # How many rows are calculated and written at a time when streaming
+STREAM_COLUMN_WIDTH = 20 # The width of each column when streaming, as the whole table is never known at once
+PRECISION_GUARD_DIGITS = 10 # Extra digits used while calculating in the high-precision mode so the result is correct to precision_digits
+POWER_CACHE_SIZE = 1000 # How many bases have their squares cached in the high-precision mode
+power_cache: dict[tuple[Decimal, int], list[Decimal]] = {} # Caches base^(2^k) for each base and precision so every point of a trajectory reuses them
+CACHE_MAX_POINTS = 5000000 # How many populations the result cache keeps before the least recently used trajectories are removed
+CHECKPOINT_VERSION = 1 # The version of the checkpoint file format, files from other versions are not read
+CHECKPOINT_KINDS = [float, int, Decimal, str] # The types a population in a checkpoint can be, saved as their index
+GRAPH_POINTS = 2000 # About how many points of each series are graphed, roughly the width of the screen in pixels
+TARGET_TOLERANCE = 1e-12 # Step counts this close (relative) above a whole number are not rounded up to the next step, so float error at an exact fission-event boundary does not add an event
+SENSITIVITY_PARAMETERS = ["initial_population", "growth_rate", "fission_frequency", "projection_time"] # The inputs the sensitivity of the populations is worked out for
+SENSITIVITY_SERIES_LIMIT = 1e-3 # Below this r/n, ln(1+r/n) - (r/n)/(1+r/n) is worked out from its series, as the two terms almost cancel
+SENSITIVITY_DIGITS = 6 # How many significant digits elasticities are printed to
+LOG_FLOAT_LIMIT = log(1e300) # Log-space populations bigger than this are shown in scientific notation (a bit under the largest float so rounding can not overflow)
 inital_population_limits = [1, 1000000000] # The limits for the initial population
 growth_rate_limits = [1, 100] # The limits for the growth rate
 fission_frequency_limits = [1, 1000000000] # The limits for the fission frequency
 projection_time_limits = [0, 10000000000] # The limits for the projection time
 target_population_limits = [0, 1000000000] # The limits for the target population
 
-class TimeAmount: # Class for time amounts, which are a float and a str (unit)
-    def __init__(self, quantity:float, unit:str): # Constructor
-        self.quantity = quantity # sets quantity
+class TimeAxis: # Class for the times a model is calculated at, stored as a start, step, count and unit instead of a list of TimeAmounts
+    def __init__(self, start:float, step:float, count:int, unit:str): # Constructor
+        self.start = start # sets the first time
+        self.step = step # sets the time between each point
+        self.count = count # sets the number of points
         self.unit = unit # sets unit
-    
+
     def __str__(self): # this runs if the class is converted to a string
-        if self.quantity == 1:
-            return f"{self.quantity} {self.unit}"
-        else:
-            return f"{self.quantity} {self.unit}s"
-    
-    def __round__(self, n): # this runs if the class is rounded
-        self.quantity = round(self.quantity, n)
-        return self
-    
-    def convert(self, to_unit: str): # converts the timeamount to the new unit
-        converted = (SECONDS_IN_UNIT[self.unit.lower()] / SECONDS_IN_UNIT[to_unit.lower()]) * self.quantity # formula of conversion
-        self.quantity = converted # sets quantity
-        self.unit = to_unit # sets unit
-        return converted
-    
-    def scale(self, to_unit: str): # scales the timeamount to the new unit
-        converted = (SECONDS_IN_UNIT[to_unit.lower()] / SECONDS_IN_UNIT[self.unit.lower()]) * self.quantity # formula of scaling
-        self.quantity = converted # sets quantity
+        return f"{self.count} point(s) from {self[0]} to {self[-1]}"
+
+    def __len__(self): # this runs if len() is used on the class
+        return self.count
+
+    def __getitem__(self, index:int) -> TimeAmount: # this runs if the class is indexed, the time is only made when it is needed
+        if index < 0: index += self.count # allows negative indexes like lists
+        if not 0 <= index < self.count: raise IndexError("TimeAxis index out of range")
+        return TimeAmount(self.start + index * self.step, self.unit)
+
+    def __iter__(self): # this runs if the class is looped through, one time at a time
+        for index in range(self.count):
+            yield self[index]
+
+    def convert(self, to_unit: str): # converts the time axis to the new unit
+        ratio = UNIT_RATIO[self.unit, to_unit] # formula of conversion
+        self.start *= ratio # converts the first time
+        self.step *= ratio # converts the step
         self.unit = to_unit # sets unit
-        return converted
+        return self
+
+    def get_quantities(self, start:int = 0, stop:int|None = None, stride:int = 1) -> np.ndarray: # gets the time quantities between two indexes as an array
+        if stop is None or stop > self.count: stop = self.count # defaults to the end of the axis
+        return self.start + np.arange(start, stop, stride, dtype=float) * self.step
 
-    def get_quantity(self): # gets the quantity
-        return self.quantity
-    
     def get_unit(self): # gets the unit
         return self.unit
 
+class Calculation(NamedTuple): # Record for a model that is ready to be calculated, its settings and the times it is calculated at
+    model_type: str # "naive", "sophisticated", "logistic" or "gompertz"
+    initial_population: float # the population at the start
+    growth_rate: TimeAmount # the growth rate % per unit
+    fission_frequency: float|None # fission-events per growth rate unit, None for naive and growth models
+    carrying_capacity: float|None # the population logistic and Gompertz models level off at, None for other models
+    growth_schedule: tuple|None # (start time, growth rate %) pairs or a function of time for growth models, None keeps the growth rate the same
+    time_axis: TimeAxis # the times the model is calculated at
+
+class ResultCache: # Class that remembers calculated trajectories so replays and overlapping models are not calculated again
+    def __init__(self, max_points:int = CACHE_MAX_POINTS, path:str|None = None): # Constructor
+        self.max_points = max_points # sets the most populations kept at once
+        self.path = path # sets the file the cache is saved to (None keeps it in memory only)
+        self.enabled = True # sets whether the cache is used
+        self.entries:OrderedDict[tuple, np.ndarray] = OrderedDict() # trajectories from least to most recently used
+        self.points = 0 # how many populations are stored
+        self.hits = 0 # how many populations came from the cache
+        self.misses = 0 # how many populations had to be calculated
+
+    def __len__(self): # this runs if len() is used on the class
+        return len(self.entries)
+
+    def model_key(self, calculation:Calculation, mode:str) -> tuple: # gets the key of a model, growth rates and fission frequencies are changed to per second so equal models in different units match
+        model_type, initial_population, growth_rate, fission_frequency = calculation[:4]
+        rate = float(f"{growth_rate.get_quantity() / SECONDS_IN_UNIT[growth_rate.get_unit()]:.12g}") # growth rate per second
+        fission = None if model_type == "naive" else float(f"{fission_frequency / SECONDS_IN_UNIT[growth_rate.get_unit()]:.12g}") # fission events per second
+        return (mode, model_type, float(initial_population), rate, fission)
+
+    def trajectory(self, calculation:Calculation, start:int, stop:int|None, stride:int, mode:str, calculate) -> np.ndarray: # gets the populations between two indexes of the time axis, only calculating what is not cached
+        time_axis = calculation[-1]
+        stop = len(time_axis) if stop is None else min(stop, len(time_axis))
+        if not self.enabled or stride != 1: # skipped rows can not be stored as a prefix of a trajectory
+            self.misses += len(range(start, stop, stride))
+            return calculate(time_axis.get_quantities(start, stop, stride))
+        seconds = SECONDS_IN_UNIT[time_axis.get_unit()]
+        model = self.model_key(calculation, mode)
+        key = model + (float(f"{time_axis.start * seconds:.12g}"), float(f"{time_axis.step * seconds:.12g}")) # the model and its time axis in seconds
+        values = self.entries.get(key, np.empty(0))
+        if len(values) == 0 and stop - start == 1: # a single time can also be inside another trajectory of the same model
+            time = (time_axis.start + start * time_axis.step) * seconds
+            for other_key, other_values in self.entries.items():
+                if other_key[:len(model)] != model or other_key[-1] == 0: continue
+                index = (time - other_key[-2]) / other_key[-1]
+                if abs(index - round(index)) < 1e-9 and 0 <= round(index) < len(other_values):
+                    self.entries.move_to_end(other_key)
+                    self.hits += 1
+                    return other_values[round(index):round(index) + 1]
+        if key in self.entries: self.entries.move_to_end(key) # most recently used
+        if len(values) >= stop: # the whole request is cached
+            self.hits += stop - start
+            return values[start:stop]
+        if start > len(values): # the request does not continue the cached prefix, so it is not stored
+            self.misses += stop - start
+            return calculate(time_axis.get_quantities(start, stop))
+        self.hits += len(values) - start
+        self.misses += stop - len(values)
+        values = np.concatenate((values, calculate(time_axis.get_quantities(len(values), stop)))) # only the new part of the trajectory is calculated
+        if len(values) <= self.max_points: self.store(key, values)
+        return values[start:stop]
+
+    def store(self, key:tuple, values:np.ndarray): # stores a trajectory, removing the least recently used ones if there are too many populations
+        self.points += len(values) - len(self.entries.get(key, ()))
+        self.entries[key] = values
+        self.entries.move_to_end(key)
+        while self.points > self.max_points: # least recently used trajectories are removed first
+            _, removed = self.entries.popitem(last=False)
+            self.points -= len(removed)
+
+    def stats(self) -> dict[str, int|float]: # gets the hit and miss statistics
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0, "trajectories": len(self.entries), "points": self.points}
+
+    def clear(self): # removes every trajectory and resets the statistics
+        self.entries.clear()
+        self.points = self.hits = self.misses = 0
+
+    def save(self, path:str|None = None): # saves the trajectories to a .npz file, the keys as JSON and every trajectory in one array
+        with open(path or self.path, "wb") as file: # an open file so numpy does not add .npz to the name
+            np.savez(file, keys=np.array(json.dumps(list(self.entries.keys()))), lengths=np.array([len(values) for values in self.entries.values()], dtype=np.int64), values=np.concatenate([np.empty(0)] + list(self.entries.values())))
+
+    def load(self, path:str|None = None): # loads trajectories from a file, or makes the file if it does not exist yet (so a path that can not be written fails now, not after a run)
+        path = path or self.path
+        if not os.path.exists(path): return self.save(path)
+        try:
+            with np.load(path, allow_pickle=False) as file: # nothing in the file can run code
+                keys, lengths, values = json.loads(str(file["keys"])), file["lengths"], file["values"]
+            if len(keys) != len(lengths) or lengths.sum() != len(values): raise ValueError("its trajectories do not match its keys")
+        except (ValueError, KeyError, zipfile.BadZipFile) as error: # old pickled caches, broken files and files that are not caches
+            raise ValueError(f"{path} is not a result cache file") from error
+        for key, trajectory in zip(keys, np.split(values, np.cumsum(lengths)[:-1])): self.store(tuple(key), trajectory) # JSON keeps tuples as lists
+
+result_cache = ResultCache() # The result cache used by every calculation
+
+class Trajectory: # Class for a calculated model that remembers its last population so it can be extended without calculating it again
+    def __init__(self, name:str, calculation:Calculation, opening:list, added:list, final:list, mode:str|None = None, digits:int|None = None, population = None): # Constructor, the mode, digits and last population are only given when a checkpoint is loaded
+        self.name = name # sets the model name
+        self.calculation = calculation # sets the model settings and time axis
+        self.opening = opening # sets the opening populations
+        self.added = added # sets the added populations
+        self.final = final # sets the final populations
+        self.mode = mode or ("precise" if precision_digits > 0 and calculation[0] not in GROWTH_MODEL_TYPES else "log" if log_space else "float") # the mode is kept so extensions match the rest of the trajectory (growth models have no high-precision mode)
+        self.precision_digits = precision_digits if digits is None else digits
+        self.log_index = np.empty(0) # log10 of the final populations, only made when a target population is first searched for
+        self.population = population # the unrounded last population (ln of it in log-space), worked out below unless it was saved
+        if population is not None: return
+        model_type, initial_population, growth_rate, fission_frequency = calculation[:4]
+        last_time = calculation.time_axis[-1]
+        if model_type in GROWTH_MODEL_TYPES: # growth models are read from their solution
+            log_population = float(calculate_growth_log_trajectory(calculation, last_time.get_quantity()))
+            self.population = log_population if self.mode == "log" else exp(log_population)
+        elif self.mode == "precise": self.population = calculate_population_size_precise(model_type, initial_population, growth_rate, fission_frequency, last_time, precision_digits) # the unrounded last population
+        elif self.mode == "log": self.population = float(calculate_log_population_array(model_type, initial_population, growth_rate.get_quantity(), fission_frequency, last_time.get_quantity(), growth_rate.get_unit(), last_time.get_unit()))
+        else: self.population = float(calculate_population_trajectory(model_type, initial_population, growth_rate, fission_frequency, last_time.get_quantity(), last_time.get_unit()))
+
+    def __len__(self): # this runs if len() is used on the class
+        return len(self.final)
+
+    def time_to_reach(self, target_populations) -> np.ndarray: # gets the first time each target population is reached (nan if it is not reached yet) with a binary search, without calculating anything again
+        if len(self.log_index) < len(self.final): # only the populations added since the last search are added to the index
+            self.log_index = np.concatenate((self.log_index, population_log10(self.final[len(self.log_index):])))
+        log_index = self.log_index
+        positions = np.searchsorted(np.maximum.accumulate(log_index), np.log10(np.asarray(target_populations, dtype=float)), side="left") # populations never go down, so the first one at or above each target is found by binary search
+        time_axis = self.calculation[-1]
+        return np.where(positions < len(log_index), time_axis.start + positions * time_axis.step, np.nan)
+
+    def get_time(self) -> TimeAmount: # gets the last time of the trajectory
+        return self.calculation[-1][-1]
+
+    def extend(self, steps:int): # adds more steps to the end of the trajectory, continuing from the last population
+        if steps <= 0: return
+        model_type, initial_population, growth_rate, fission_frequency = self.calculation[:4]
+        time_axis = self.calculation.time_axis
+        step = time_axis.step if len(time_axis) > 1 else 1 # a trajectory of one time is extended by one time unit per step
+        multiples = np.arange(1, steps + 1) # how many steps each new population is from the last one
+        if model_type in GROWTH_MODEL_TYPES: # growth models continue their solution, which is cached so only the new times are solved
+            new_logs = calculate_growth_log_trajectory(self.calculation, time_axis[-1].get_quantity() + multiples * step)
+        if model_type == "naive": # naive growth adds the same amount every step
+            increase = calculate_population_array("naive", initial_population, growth_rate.get_quantity(), None, step, growth_rate.get_unit(), time_axis.get_unit()) - initial_population
+        if self.mode == "precise": # decimals are multiplied one step at a time
+            with localcontext() as context:
+                context.prec = self.precision_digits
+                context.Emax = MAX_EMAX
+                context.Emin = MIN_EMIN
+                if model_type == "naive": factor = calculate_population_size_precise(model_type, initial_population, growth_rate, None, TimeAmount(step, time_axis.get_unit()), self.precision_digits) - initial_population # growth over one step
+                else: factor = calculate_population_size_precise(model_type, 1, growth_rate, fission_frequency, TimeAmount(step, time_axis.get_unit()), self.precision_digits) # growth over one step
+                new_populations = []
+                for _ in range(steps):
+                    self.population = self.population + factor if model_type == "naive" else self.population * factor
+                    new_populations.append(self.population)
+                new_final = new_populations
+                new_added = [final - opening for final, opening in zip(new_final, [self.final[-1]] + new_final[:-1])]
+        elif self.mode == "log": # log populations add the log of the growth every step
+            if model_type == "naive": new_logs = np.log(np.exp(self.population) + increase * multiples)
+            elif model_type not in GROWTH_MODEL_TYPES: new_logs = self.population + multiples * float(calculate_log_population_array(model_type, 1, growth_rate.get_quantity(), fission_frequency, step, growth_rate.get_unit(), time_axis.get_unit())) # ln(P) + k*ln(growth over one step)
+            log_opening = np.concatenate(([self.population], new_logs[:-1]))
+            with np.errstate(divide="ignore"):
+                new_added = format_log_populations(new_logs + np.log1p(-np.exp(log_opening - new_logs)))
+            new_final = format_log_populations(new_logs)
+            self.population = float(new_logs[-1])
+        else: # floats multiply by the growth over one step
+            if model_type == "naive": new_populations = self.population + increase * multiples
+            elif model_type in GROWTH_MODEL_TYPES: new_populations = np.exp(new_logs)
+            else: new_populations = self.population * np.power(float(calculate_population_array(model_type, 1, growth_rate.get_quantity(), fission_frequency, step, growth_rate.get_unit(), time_axis.get_unit())), multiples) # P * (growth over one step)^k
+            new_final = new_populations
+            new_added = (new_final - np.concatenate(([self.final[-1]], new_final[:-1]))).tolist()
+            new_final = new_final.tolist()
+            self.population = float(new_populations[-1])
+        self.opening += [self.final[-1]] + new_final[:-1] # the opening population is the last final population
+        self.added += new_added
+        self.final += new_final
+        time_axis.step = step
+        time_axis.count += steps # the time axis covers the new steps too
+
+    def extend_to(self, end:float): # extends the trajectory until the given time (in the unit of its time axis)
+        time_axis = self.calculation[-1]
+        step = time_axis.step if len(time_axis) > 1 else 1
+        self.extend(int(round((end - time_axis.start) / step, 9)) + 1 - len(time_axis))
+
 # Functions
-def calculate_population_size(model_type: str, initial_population: float, growth_rate: TimeAmount, fission_frequency: int, projection_time: TimeAmount) -> float: # Function that calculates the final population based on inputted variables
-    initial_population = float(initial_population) # changes the initial population to a float to avoid errors
-    rate = TimeAmount(growth_rate.get_quantity(), growth_rate.get_unit()) # Make sure that the outside growth_rate is not modified by setting to new variable
-    rate.scale(projection_time.get_unit()) # scales the growth rate to the same unit as the projection time
-    rate.quantity /= 100 # divides the growth rate by 100 to make it from a percentage to decimal
+
+def decimal_power(base: Decimal, exponent: Fraction, precision: int) -> Decimal: # Function that raises a decimal to a power by squaring, reusing cached squares of the base
+    whole = int(exponent) # the whole part of the power is done by squaring
+    squares = power_cache.get((base, precision))
+    if squares is None: # a new base starts with just itself
+        if len(power_cache) >= POWER_CACHE_SIZE: power_cache.clear() # stops the cache growing forever
+        squares = power_cache[(base, precision)] = [base]
+    result = Decimal(1)
+    bit = 0
+    while whole: # multiplies in base^(2^bit) for every bit of the whole power
+        if bit == len(squares): squares.append(squares[-1] * squares[-1]) # only squares that have not been needed before are made
+        if whole & 1: result *= squares[bit]
+        whole >>= 1
+        bit += 1
+    fraction = exponent - int(exponent) # the rest of the power, which is less than 1
+    if fraction: result *= base ** (Decimal(fraction.numerator) / Decimal(fraction.denominator))
+    return result
+
+def round_decimal(value: Decimal) -> Decimal: # Function that rounds a high-precision population to rounding_amount decimals, unless that needs more digits than it has
+    if value.adjusted() + rounding_amount + 1 > precision_digits: return value # the number is too big to have that many decimals
+    with localcontext() as context:
+        context.prec = precision_digits # rounding keeps the same precision as the calculation
+        return round(value, rounding_amount)
+
+def calculate_population_size_precise(model_type: str, initial_population: float, growth_rate: TimeAmount, fission_frequency: int, projection_time: TimeAmount, digits: int = 50) -> Decimal: # Function that calculates the final population with decimals to the given number of significant digits (same formulas as calculate_population_size)
+    with localcontext() as context:
+        context.prec = digits + PRECISION_GUARD_DIGITS # extra digits so rounding errors do not reach the result
+        context.Emax = MAX_EMAX # allows populations far bigger than a float
+        context.Emin = MIN_EMIN
+        unit_ratio = Fraction(SECONDS_IN_UNIT[projection_time.get_unit()]) / Fraction(SECONDS_IN_UNIT[growth_rate.get_unit()]) # exact ratio of the projection unit to the growth rate unit
+        rate = Fraction(growth_rate.get_quantity()) * unit_ratio / 100 # scales the growth rate to the projection unit and makes it a decimal, exactly
+        time = Fraction(projection_time.get_quantity())
+        if model_type == "naive": # if the model type is naive
+            population = Decimal(initial_population) * (1 + Decimal(rate.numerator) * Decimal(time.numerator) / (Decimal(rate.denominator) * Decimal(time.denominator))) # A = P + (PRT)
+        elif model_type == "sophisticated": # if the model type is sophisticated
+            fission_frequency = unit_ratio * Fraction(fission_frequency).limit_denominator(10 ** 9) # scales the fission frequency to the projection unit, limit_denominator undoes float error from unit ratios like 1/24
+            rate_over_fission = rate / fission_frequency # gets the growth rate over the fission frequency
+            base = 1 + Decimal(rate_over_fission.numerator) / Decimal(rate_over_fission.denominator) # 1 + r/n
+            population = Decimal(initial_population) * decimal_power(base, time * fission_frequency, context.prec) # (1+r/n)^(nt)
+        context.prec = digits
+        return +population # rounds to the number of digits
+
+def calculate_population_array(model_type: str, initial_population: np.ndarray, growth_rate: np.ndarray, fission_frequency: np.ndarray, projection_time: np.ndarray, growth_unit: str, projection_unit: str) -> np.ndarray: # Function that calculates populations for arrays of every variable at once (the arrays are broadcast together)
+    initial_population = np.asarray(initial_population, dtype=float) # makes sure every variable is a float array
+    projection_time = np.asarray(projection_time, dtype=float)
+    unit_ratio = UNIT_RATIO[projection_unit, growth_unit] # how many growth rate units are in one projection unit
+    rate = np.asarray(growth_rate, dtype=float) * unit_ratio / 100 # scales the growth rate to the projection unit and makes it a decimal
     if model_type == "naive": # if the model type is naive
-        return initial_population + (rate.get_quantity() * initial_population * projection_time.get_quantity()) # returns the final population A = P + (PRT)
+        return initial_population + (rate * initial_population * projection_time) # A = P + (PRT)
     if model_type == "sophisticated": # if the model type is sophisticated
-        fission_frequency = SECONDS_IN_UNIT[projection_time.get_unit()] / SECONDS_IN_UNIT[growth_rate.get_unit()] * fission_frequency # scales the fission frequency to the same unit as the growth rate
-        rate_over_fission = rate.get_quantity() / float(fission_frequency) # gets the growth rate over the fission frequency
-        total_fission_events = projection_time.get_quantity() * fission_frequency # gets the total number of fission events
-        return initial_population * ((1 + rate_over_fission) ** total_fission_events) # returns the final population (1+r/n)^(nt)
-
-def calculate_time_to_reach_target(model_type:str, initial_population: float, growth_rate: TimeAmount, fission_frequency: int, target_population: float) -> TimeAmount|int: # Function that calculates the time needed to reach the target population based on inputted variables
-    target_population_ratio = target_population / initial_population # gets the target population ratio
-    rate = TimeAmount(growth_rate.get_quantity(), growth_rate.get_unit()) # Make sure that the outside growth_rate is not modified by setting to new variable
-    rate.quantity /= 100 # divides the growth rate by 100 to make it from a percentage to decimal
-    try: increment = 1 / fission_frequency # gets the frequency increment
-    except: increment = 1 # if the fission frequency is None, set the increment to 1 (for naive models)
+        fission_frequency = unit_ratio * np.asarray(fission_frequency, dtype=float) # scales the fission frequency to the same unit as the projection time
+        rate_over_fission = rate / fission_frequency # gets the growth rate over the fission frequency
+        return initial_population * np.power(1 + rate_over_fission, projection_time * fission_frequency) # (1+r/n)^(nt)
+    raise ValueError(f"Unknown model type: {model_type}")
+
+def calculate_log_population_array(model_type: str, initial_population: np.ndarray, growth_rate: np.ndarray, fission_frequency: np.ndarray, projection_time: np.ndarray, growth_unit: str, projection_unit: str) -> np.ndarray: # Function that calculates the natural log of the populations, which never overflows
+    log_initial_population = np.log(np.asarray(initial_population, dtype=float)) # ln(P)
+    projection_time = np.asarray(projection_time, dtype=float)
+    unit_ratio = UNIT_RATIO[projection_unit, growth_unit] # how many growth rate units are in one projection unit
+    rate = np.asarray(growth_rate, dtype=float) * unit_ratio / 100 # scales the growth rate to the projection unit and makes it a decimal
     if model_type == "naive": # if the model type is naive
-        time_needed = ceil((target_population - initial_population) / (initial_population * rate.get_quantity())) # this is to ceiling the time needed by the increment
+        return log_initial_population + np.log1p(rate * projection_time) # ln(P + PRT) = ln(P) + ln(1 + RT)
+    if model_type == "sophisticated": # if the model type is sophisticated
+        fission_frequency = unit_ratio * np.asarray(fission_frequency, dtype=float) # scales the fission frequency to the same unit as the projection time
+        return log_initial_population + projection_time * fission_frequency * np.log1p(rate / fission_frequency) # ln(P(1+r/n)^(nt)) = ln(P) + nt*ln(1+r/n), log1p keeps r/n accurate when it is tiny
+    raise ValueError(f"Unknown model type: {model_type}")
+
+def calculate_log_gradient_array(model_type: str, initial_population: np.ndarray, growth_rate: np.ndarray, fission_frequency: np.ndarray, projection_time: np.ndarray, unit_ratio: np.ndarray) -> dict[str, np.ndarray]: # Function that calculates the derivative of ln(P) with respect to every input (growth rate in %, fission frequency per growth rate unit and projection time in its own unit) for arrays of every variable at once (the arrays are broadcast together), unit_ratio is how many growth rate units are in one projection unit so models with different units can be in the same arrays
+    initial_population, growth_rate, projection_time, unit_ratio = (np.asarray(values, dtype=float) for values in (initial_population, growth_rate, projection_time, unit_ratio)) # makes sure every variable is a float array
+    shape = np.broadcast_shapes(initial_population.shape, growth_rate.shape, np.shape(fission_frequency), projection_time.shape, unit_ratio.shape)
+    spread = lambda values: np.broadcast_to(values, shape) # gives a derivative that does not change over time the full shape without copying it
+    if model_type == "naive": # ln(P) = ln(P0) + ln(1 + at), a = r/100 per projection unit
+        rate = growth_rate * unit_ratio / 100
+        growth = 1 + rate * projection_time
+        return {
+            "initial_population": spread(1 / initial_population),
+            "growth_rate": unit_ratio / 100 * projection_time / growth,
+            "fission_frequency": spread(0.0), # naive models have no fission events
+            "projection_time": spread(rate / growth),
+        }
+    if model_type == "sophisticated": # ln(P) = ln(P0) + t*u*n*ln(1 + q), q = r/100n is the growth at each fission event
+        fission_frequency = np.asarray(fission_frequency, dtype=float)
+        q = growth_rate / 100 / fission_frequency
+        log_growth = np.log1p(q) # log1p keeps q accurate when it is tiny
+        curvature = np.where(q < SENSITIVITY_SERIES_LIMIT, q * q * (1 / 2 - q * (2 / 3 - q * 3 / 4)), log_growth - q / (1 + q)) # ln(1+q) - q/(1+q), from its series when q is small
+        return {
+            "initial_population": spread(1 / initial_population),
+            "growth_rate": spread(unit_ratio / 100 / (1 + q) * projection_time), # the parts that do not change over time are worked out first, so only one multiply is done at every time
+            "fission_frequency": spread(unit_ratio * curvature * projection_time),
+            "projection_time": spread(unit_ratio * fission_frequency * log_growth),
+        }
+    raise ValueError(f"Sensitivities have no closed form for {model_type} models")
+
+def calculate_sensitivities(model_configuration: dict[str, Calculation]) -> dict[str, dict]: # Function that calculates the elasticity (d ln(P) / d ln(x)) and derivative (dP/dx) of every model's populations to every input at every time, with every model of the same type and length in one pass
+    groups: dict[tuple[str, int], list[str]] = {} # models of the same type with the same number of times are calculated as one table, one row per model
+    for name, calculation in model_configuration.items():
+        if calculation.model_type in ["naive", "sophisticated"]: groups.setdefault((calculation.model_type, len(calculation.time_axis)), []).append(name) # logistic and Gompertz models have no closed form, so they are left out
+    sensitivities = {}
+    for (model_type, _), names in groups.items():
+        calculations = [model_configuration[name] for name in names]
+        column = lambda values: np.array(values, dtype=float)[:, None] # one value per model, spread over its times
+        inputs = {
+            "initial_population": column([calculation.initial_population for calculation in calculations]),
+            "growth_rate": column([calculation.growth_rate.get_quantity() for calculation in calculations]),
+            "fission_frequency": column([calculation.fission_frequency if model_type == "sophisticated" else 1 for calculation in calculations]), # naive models do not use it
+            "projection_time": np.array([calculation.time_axis.get_quantities() for calculation in calculations]),
+        }
+        unit_ratio = column([UNIT_RATIO[calculation.time_axis.get_unit(), calculation.growth_rate.get_unit()] for calculation in calculations])
+        gradient = calculate_log_gradient_array(model_type, *inputs.values(), unit_ratio)
+        log_population = calculate_log_population_array(model_type, inputs["initial_population"], inputs["growth_rate"], inputs["fission_frequency"], inputs["projection_time"] * unit_ratio, "day", "day") # the times are changed to growth rate units first
+        with np.errstate(over="ignore", invalid="ignore"): # derivatives of populations too big for a float are inf, their elasticities are still finite
+            population = np.exp(log_population)
+            elasticities = {parameter: inputs[parameter] * gradient[parameter] for parameter in SENSITIVITY_PARAMETERS}
+            derivatives = {parameter: population * gradient[parameter] for parameter in SENSITIVITY_PARAMETERS}
+        for i, name in enumerate(names): # each model's row
+            sensitivities[name] = {
+                "time": inputs["projection_time"][i],
+                "log_population": log_population[i],
+                "elasticities": {parameter: values[i] for parameter, values in elasticities.items()},
+                "derivatives": {parameter: values[i] for parameter, values in derivatives.items()},
+            }
+    return {name: sensitivities[name] for name in model_configuration if name in sensitivities} # in the same order as the models
+
+def format_sensitivities(values) -> list[str]: # Function that changes a column of elasticities to strings, for print_table
+    return [f"{value:.{SENSITIVITY_DIGITS}g}" for value in np.asarray(values, dtype=float)]
+
+def print_sensitivities(model_configuration: dict[str, Calculation]): # Function that prints the elasticity of every model's populations to every input over time
+    print_title("Sensitivities")
+    sensitivities = calculate_sensitivities(model_configuration)
+    for name, sensitivity in sensitivities.items(): # loops through every model
+        unit = model_configuration[name].time_axis.get_unit()
+        print_table( # prints a table with the elasticity to each input at every time
+            data=[sensitivity["time"]] + list(sensitivity["elasticities"].values()),
+            table_length=len(sensitivity["time"]),
+            table_title=f"{name} (d ln P / d ln x)",
+            titles=[f"Time (in {unit}s)", "Initial Population", "Growth Rate", "Fission Frequency", "Projection Time"],
+            view=table_view(len(sensitivity["time"]), table_head_rows, table_tail_rows, table_every_rows), # only the rows picked in settings
+            format_column=format_sensitivities,
+        )
+    if len(sensitivities) < len(model_configuration): cprint("Sensitivities are only worked out for naive and sophisticated models.", "grey", attrs=["dark"])
+
+def print_stochastic(model_configuration: dict[str, Calculation]) -> dict[str, tuple[np.ndarray, np.ndarray]]: # Function that simulates random replicates of every sophisticated model, prints the range of their final populations and gives the bands for show_graph
+    from stochastic import DEFAULT_PERCENTILES, run_stochastic_model # only loaded when stochastic replicates are on
+    print_title("Stochastic Replicates")
+    bands = {}
+    for name, calculation in model_configuration.items():
+        if calculation.model_type != "sophisticated": continue # only sophisticated models have fission events to simulate
+        try: result = run_stochastic_model(Model(*calculation[:6]), TimeAxis(calculation.time_axis.start, calculation.time_axis.step, calculation.time_axis.count, calculation.time_axis.unit), stochastic_replicates, name=name)
+        except ValueError as error: # populations too big to count exactly
+            cprint(f"{name}: {error}", "red")
+            continue
+        bands[name] = result.band()
+        percentiles = {percentile: values[-1] for percentile, values in result.percentiles().items()}
+        print(f"{name} ({stochastic_replicates:,} replicates): final population {', '.join(f'{percentile}% {round(float(value), rounding_amount)}' for percentile, value in percentiles.items())}, mean {round(float(result.mean()[-1]), rounding_amount)}")
+    if len(bands) < len(model_configuration): cprint("Replicates are only simulated for sophisticated models.", "grey", attrs=["dark"])
+    print("")
+    return bands
+
+def add_agent_models(calculations: tuple) -> tuple: # Function that simulates every sophisticated model cell by cell and adds the live cell counts to the results of calculate_models as more models
+    from agents import agent_calculations, run_agent_model # only loaded when agent mode is on
+    print_title("Agent-Based Models")
+    model_configuration, agent_results = calculations[4], []
+    for name, calculation in model_configuration.items():
+        if calculation.model_type != "sophisticated": continue # only sophisticated models grow by cells dividing
+        try: result = run_agent_model(Model(*calculation[:6]), TimeAxis(calculation.time_axis.start, calculation.time_axis.step, calculation.time_axis.count, calculation.time_axis.unit), name=f"{name} (Agents)")
+        except ValueError as error: # populations too big to hold every cell
+            cprint(f"{name}: {error}", "red")
+            continue
+        agent_results.append(result)
+        print(f"{result.name}: {int(result.counts[-1]):,} live cells, mean age {round(float(result.mean_ages[-1]), rounding_amount)} {calculation.growth_rate.get_unit()}s, {result.peak_bytes / 1e6:,.1f} MB of cell buffers")
+    if len(agent_results) < len(model_configuration): cprint("Only sophisticated models are simulated cell by cell.", "grey", attrs=["dark"])
+    print("")
+    agents = agent_calculations(agent_results)
+    return {**calculations[0], **agents[0]}, calculations[1] + agents[1], calculations[2] + agents[2], calculations[3] + agents[3], {**model_configuration, **agents[4]}
+
+def distribution_input(name: str, value: float, distributions: dict[str, list[str]]): # Function that asks for the distribution of a model input, blank keeps the value that was entered
+    while True:
+        words = input(f"Enter the distribution of the {name} (blank = {value}): ").split()
+        if not words: return value
+        kind, numbers = words[0].lower(), words[1:]
+        if kind not in distributions or len(numbers) != len(distributions[kind]):
+            cprint("Invalid. Enter a distribution name followed by its numbers, separated by spaces.", "red", attrs=["bold"])
+            continue
+        try: return {"distribution": kind} | {key: float(number) for key, number in zip(distributions[kind], numbers)}
+        except ValueError: cprint("Invalid. Enter a distribution name followed by its numbers, separated by spaces.", "red", attrs=["bold"])
+
+def print_uncertainty(model_configuration: dict[str, Calculation], projection_time: TimeAmount|None, target_population, condition: str, output_unit: str): # Function that asks for the distribution of each model's inputs and prints the percentile bands of the results
+    from uncertainty import UNCERTAINTY_DISTRIBUTIONS, UNCERTAINTY_PERCENTILES, run_uncertainty # only loaded when uncertainty mode is on
+    print_title("Uncertainty")
+    cprint(f"Distributions: {', '.join(kind + ' ' + ' '.join(needed) for kind, needed in UNCERTAINTY_DISTRIBUTIONS.items())} (e.g. normal 5 0.5)", "grey", attrs=["dark"])
+    models = {name: calculation for name, calculation in model_configuration.items() if calculation.model_type in ["naive", "sophisticated"]}
+    for name, calculation in models.items(): # loops through every model
+        cprint(f"{name} ({uncertainty_samples:,} samples)", attrs=["bold"])
+        growth_unit = calculation.growth_rate.get_unit()
+        inputs = {
+            "initial_population": distribution_input("initial population", calculation.initial_population, UNCERTAINTY_DISTRIBUTIONS),
+            "growth_rate": distribution_input(f"growth rate % (per {growth_unit})", calculation.growth_rate.get_quantity(), UNCERTAINTY_DISTRIBUTIONS),
+            "fission_frequency": distribution_input(f"fission frequency (fission-events per {growth_unit})", calculation.fission_frequency, UNCERTAINTY_DISTRIBUTIONS) if calculation.model_type == "sophisticated" else None,
+            "projection_time": distribution_input(f"projection time (in {projection_time.get_unit()}s)", projection_time.get_quantity(), UNCERTAINTY_DISTRIBUTIONS) if condition == "projected" else 0, # only projections have a projection time
+        }
+        try:
+            result = run_uncertainty(calculation.model_type, **inputs, growth_unit=growth_unit, projection_unit=projection_time.get_unit() if condition == "projected" else output_unit, target_population=[target_population] if condition == "population" else [], samples=uncertainty_samples, name=name)
+        except ValueError as error: # a distribution that can not be sampled, like a normal cut outside its values
+            cprint(f"Invalid. {error}", "red", attrs=["bold"])
+            continue
+        titles = ["Percentile"]
+        data = [[f"{percentile}%" for percentile in UNCERTAINTY_PERCENTILES]]
+        if condition == "projected": # the spread of the final population
+            titles.append("Final Population")
+            data.append([round(value, rounding_amount) for value in result.final_percentiles().values()])
+        else: # the spread of the time to reach the target, the final population is always the target
+            titles.append(f"Time Needed (in {output_unit}s)")
+            data.append([round(value, rounding_amount) for value in result.time_percentiles()[float(target_population)].values()])
+        print_table(data=data, table_length=len(UNCERTAINTY_PERCENTILES), table_title=f"{name} Uncertainty", titles=titles)
+        if condition == "projected": print(f"Mean final population: {round(result.mean(), rounding_amount)}")
+    if len(models) < len(model_configuration): cprint("Uncertainty is only worked out for naive and sophisticated models.", "grey", attrs=["dark"])
+
+def format_log_population(log_population: float, decimals: int|None = None) -> str: # Function that formats a log-space population that is too big for a float in scientific notation, with every digit unless it is rounded to some decimals
+    exponent = floor(log_population / log(10)) # the power of 10
+    mantissa = 10 ** (log_population / log(10) - exponent) # the number in front of the power of 10
+    if decimals is not None: mantissa = round(mantissa, decimals)
+    if mantissa >= 10: # rounding can make the mantissa 10
+        mantissa /= 10
+        exponent += 1
+    return f"{mantissa}e+{exponent}"
+
+def format_log_populations(log_populations: np.ndarray) -> list[float|str]: # Function that changes log-space populations back to populations, ones too big for a float become scientific notation
+    log_populations = np.asarray(log_populations, dtype=float)
+    populations = np.exp(np.minimum(log_populations, LOG_FLOAT_LIMIT)).tolist() # only exponentiated here, when they are shown
+    for index in np.flatnonzero(log_populations > LOG_FLOAT_LIMIT): # only the populations too big for a float
+        populations[index] = format_log_population(log_populations[index])
+    return populations
+
+def population_log10(populations: list[float|str]) -> np.ndarray: # Function that gets log10 of populations that may be in scientific notation (for graphing)
+    values = np.asarray(populations, dtype=float) # the whole series is done as one array, populations in scientific notation that are too big for a float become inf
+    with np.errstate(divide="ignore"): logs = np.log10(values)
+    for i in np.flatnonzero(np.isinf(values)): # only the populations too big for a float are worked out from their scientific notation
+        if isinstance(populations[i], str): logs[i] = log10(float(populations[i].split("e+")[0])) + int(populations[i].split("e+")[1])
+    return logs
+
+def round_population(population): # Function that rounds a population to rounding_amount decimals when it is shown, everything before that keeps populations unrounded
+    if isinstance(population, Decimal): return round_decimal(population)
+    if isinstance(population, str): return format_log_population(population_log10([population])[0] * log(10), rounding_amount) # scientific notation from log-space keeps every digit until it is shown
+    if isinstance(population, float): return float(np.round(population, rounding_amount)) # rounded like round_populations rounds whole columns
+    return population # whole numbers are shown as they are
+
+def round_populations(populations) -> list: # Function that rounds a column of populations when it is shown, columns of floats are rounded all at once
+    values = np.asarray(populations)
+    if values.dtype.kind == "f": return [population if type(population) is int else value for population, value in zip(populations, np.round(values, rounding_amount).tolist())] # whole numbers (like the initial population) stay whole
+    if values.dtype.kind in "iu": return values.tolist()
+    return [round_population(population) for population in populations] # decimals and scientific notation
+
+def format_populations(populations) -> list[str]: # Function that rounds a column of populations and changes them to strings, for print_table
+    return [str(population) for population in round_populations(populations)]
+
+def calculate_rows(calculation:Calculation, start:int = 0, stop:int|None = None, stride:int = 1, last_population = None): # Function that calculates the opening, added and final populations of a model between two indexes of its time axis
+    model_type, initial_population, growth_rate, fission_frequency = calculation[:4] # the model settings
+    time_axis = calculation.time_axis # the times it is calculated at
+    times = time_axis.get_quantities(start, stop, stride) # the times of the rows
+    growth_model = model_type in GROWTH_MODEL_TYPES # growth models are solved numerically, so they have no high-precision mode and skip the result cache (their solution is cached instead)
+    if precision_digits > 0 and not growth_model: # high-precision populations are decimals, the squares of the base are shared by every time
+        with localcontext() as context:
+            context.prec = precision_digits # subtracting keeps the same precision as the calculation
+            context.Emax = MAX_EMAX
+            context.Emin = MIN_EMIN
+            final = [calculate_population_size_precise(model_type, initial_population, growth_rate, fission_frequency, TimeAmount(time, time_axis.get_unit()), precision_digits) for time in times.tolist()]
+            last_population = initial_population if last_population is None else last_population # the opening population of the first row
+            opening = [last_population] + final[:-1] # opening population is the last final population
+            return opening, [final_value - opening_value for final_value, opening_value in zip(final, opening)], final, final[-1]
+    if log_space: # log-space populations are only changed back to numbers when they are shown
+        if growth_model: log_final = calculate_growth_log_trajectory(calculation, times)
+        else: log_final = result_cache.trajectory(calculation, start, stop, stride, "log", lambda times: calculate_log_population_array(model_type, initial_population, growth_rate.get_quantity(), fission_frequency, times, growth_rate.get_unit(), time_axis.get_unit()))
+        log_opening = np.concatenate(([log(initial_population) if last_population is None else last_population], log_final[:-1])) # opening population is the last final population
+        with np.errstate(divide="ignore"): # no growth gives log(0), which is shown as 0
+            log_added = log_final + np.log1p(-np.exp(log_opening - log_final)) # final - opening = final * (1 - e^(ln opening - ln final)), which can not overflow
+        final = format_log_populations(log_final)
+        opening = [initial_population if last_population is None else format_log_populations(log_opening[:1])[0]] + final[:-1]
+        return opening, format_log_populations(log_added), final, log_final[-1] # the last log population is carried into the next chunk
+    if growth_model: final = np.exp(calculate_growth_log_trajectory(calculation, times))
+    else: final = result_cache.trajectory(calculation, start, stop, stride, "float", lambda times: calculate_population_trajectory(model_type, initial_population, growth_rate, fission_frequency, times, time_axis.get_unit()))
+    last_population = initial_population if last_population is None else last_population # the opening population of the first row
+    added = final - np.concatenate(([last_population], final[:-1])) # added population is the difference between the final and opening population (populations are only rounded when they are shown)
+    final = final.tolist() # change back to normal floats for printing
+    return [last_population] + final[:-1], added.tolist(), final, final[-1] # opening population is the last final population (or the initial population at the start)
+
+def calculate_population_trajectory(model_type: str, initial_population: float, growth_rate: TimeAmount, fission_frequency: int, projection_times: np.ndarray, projection_unit: str) -> np.ndarray: # Function that calculates the population at every projection time at once (same formulas as calculate_population_size)
+    return calculate_population_array(model_type, initial_population, growth_rate.get_quantity(), fission_frequency, projection_times, growth_rate.get_unit(), projection_unit)
+
+def calculate_growth_log_trajectory(calculation:Calculation, projection_times) -> np.ndarray: # Function that reads the log populations of a logistic or Gompertz model at projection times (in the unit of its time axis) from its solution
+    unit_ratio = UNIT_RATIO[calculation.time_axis.get_unit(), calculation.growth_rate.get_unit()] # the solver works in growth rate units
+    times = np.asarray(projection_times, dtype=float) * unit_ratio
+    return solve_growth_model(Model(*calculation[:-1]), float(np.max(times, initial=0))).log_population_at(times) # the solution is only extended past times already solved
+
+def calculate_time_to_reach_target_array(model_type: str, initial_population: np.ndarray, growth_rate: np.ndarray, fission_frequency: np.ndarray, target_population: np.ndarray) -> np.ndarray: # Function that calculates the time needed to reach every target population at once in log space (the arrays are broadcast together), in growth rate units
+    initial_population = np.asarray(initial_population, dtype=float) # makes sure every variable is a float array
+    target_population = np.asarray(target_population, dtype=float)
+    rate = np.asarray(growth_rate, dtype=float) / 100 # makes the growth rate a decimal
+    if model_type == "naive": # if the model type is naive, the population grows by the same amount every growth rate unit
+        steps = (target_population - initial_population) / (initial_population * rate) # growth rate units needed
+        increment = 1.0
     elif model_type == "sophisticated": # if the model type is sophisticated
-        time_needed = log(target_population_ratio) / (fission_frequency * log(1 + rate.get_quantity() / float(fission_frequency))) # gets the time needed using the formula and logarithms
-        time_needed = ceil(time_needed / increment) * increment # this is to ceiling the time needed by the frequency increment
-    return TimeAmount(time_needed, rate.get_unit()), increment # returns the time needed
+        fission_frequency = np.asarray(fission_frequency, dtype=float)
+        steps = (np.log(target_population) - np.log(initial_population)) / np.log1p(rate / fission_frequency) # fission events needed, ln(T/P) / ln(1+r/n), log1p keeps r/n accurate when it is tiny
+        increment = 1 / fission_frequency # a fission event is this many growth rate units
+    else:
+        raise ValueError(f"Unknown model type: {model_type}")
+    return ceil_steps(steps) * increment
+
+def ceil_steps(steps: np.ndarray) -> np.ndarray: # Function that rounds steps up to a whole step, a target that is already reached needs no steps
+    return np.maximum(np.ceil(steps - TARGET_TOLERANCE * np.maximum(np.abs(steps), 1)), 0)
+
+def calculate_times_to_reach_targets(models: list[Model], target_populations, output_unit: str) -> np.ndarray: # Function that calculates when every model reaches every target population, one row per model, in the output unit
+    target_populations = np.asarray(target_populations, dtype=float)
+    times = np.empty((len(models),) + target_populations.shape)
+    def column(values: list) -> np.ndarray: # one value per model, shaped to broadcast against the targets
+        return np.array(values, dtype=float).reshape((-1,) + (1,) * target_populations.ndim)
+    for i, model in enumerate(models): # growth models are solved numerically, every target of a model is found in one pass of its solution
+        if model.model_type not in GROWTH_MODEL_TYPES: continue
+        solution = solve_growth_model(model)
+        reachable = [log_target for log_target in np.log(target_populations.ravel()) if solution.can_reach(log_target)]
+        solution.extend_until(max(reachable, default=0)) # solves as far as the highest target it can reach
+        times[i] = ceil_steps(solution.time_to_reach(target_populations)) * UNIT_RATIO[model.growth_rate.unit, output_unit] # unreached targets are nan
+    for model_type in ["naive", "sophisticated"]: # every model of a type is solved in one pass
+        rows = [i for i, model in enumerate(models) if model.model_type == model_type]
+        if len(rows) == 0: continue
+        typed_models = [models[i] for i in rows]
+        fission_frequencies = [None if model_type == "naive" else UNIT_RATIO[model.growth_rate.unit, model.fission_frequency] if isinstance(model.fission_frequency, str) else model.fission_frequency for model in typed_models] # fission frequency units are changed to numbers like compile_data
+        times[rows] = calculate_time_to_reach_target_array(
+            model_type,
+            column([model.initial_population for model in typed_models]),
+            column([model.growth_rate.quantity for model in typed_models]),
+            column(fission_frequencies),
+            target_populations,
+        ) * column([UNIT_RATIO[model.growth_rate.unit, output_unit] for model in typed_models]) # changes each model's growth rate unit to the output unit
+    return times
 
-def show_graph(results: dict[str, list], opening_population: list[list], added_population: list[list], final_population: list[list], model_configuration: dict[str, list[int|TimeAmount]], condition: str, output_as: str): # Function that shows the graph based on output type
+def get_pyplot(): # Function that imports matplotlib the first time a graph is shown, as it is slow to import and most runs never graph
+    import matplotlib.pyplot as plt # only imported here, importing it again just gives the already loaded module
+    return plt
+
+def decimate_series(populations: list|np.ndarray, points: int = GRAPH_POINTS) -> tuple[np.ndarray, np.ndarray]: # Function that keeps the lowest and highest population of each bucket so a long series keeps its shape with about the given number of points
+    populations = np.asarray(populations, dtype=float)
+    if len(populations) <= points: return np.arange(len(populations)), populations # short series are graphed as they are
+    bucket_size = ceil(len(populations) / (points // 2)) # two points (lowest and highest) are kept from each bucket
+    buckets = np.pad(populations, (0, -len(populations) % bucket_size), mode="edge").reshape(-1, bucket_size) # one row per bucket, the last bucket is filled with the last population
+    bucket_starts = np.arange(len(buckets)) * bucket_size
+    indexes = np.sort(np.stack((bucket_starts + buckets.argmin(axis=1), bucket_starts + buckets.argmax(axis=1)), axis=1), axis=1).ravel() # lowest and highest of each bucket, kept in time order
+    indexes = np.unique(np.concatenate(([0], np.minimum(indexes, len(populations) - 1), [len(populations) - 1]))) # always keeps the first and last population
+    return indexes, populations[indexes]
+
+def plot_series(time_axis: TimeAxis, populations: list|np.ndarray, label: str): # Function that graphs a decimated series, only making the times that are graphed
+    indexes, values = decimate_series(populations)
+    get_pyplot().plot(time_axis.start + indexes * time_axis.step, values, label=label)
+
+def plot_band(time_axis: TimeAxis, low: list|np.ndarray, high: list|np.ndarray, label: str): # Function that shades between two series (like a percentile band), at the times kept when decimating the high series
+    indexes, high_values = decimate_series(high)
+    get_pyplot().fill_between(time_axis.start + indexes * time_axis.step, np.asarray(low, dtype=float)[indexes], high_values, alpha=0.3, label=label)
+
+def show_graph(results: dict[str, list], opening_population: list[list], added_population: list[list], final_population: list[list], model_configuration: dict[str, Calculation], condition: str, output_as: str, bands: dict[str, tuple[np.ndarray, np.ndarray]] = {}, recorder = None): # Function that shows the graph based on output type, bands are shaded ranges (low, high) of each model's final populations, recorder measures only the drawing if instrumentation is on
     if limited_input(prompt="Print Graph?") == "n": return # stop anything from happening if the user doesnt want to print a graph
-    if output_as == "columns": # if the output type is columns
-        columns = ceil(len(results)**0.5) # gets the number of columns
-        rows = ceil(len(results)/columns) # gets the number of rows
-        for i in range(len(results)): # for each result
-            time_amount_of_condition = model_configuration[list(results.keys())[i]][-1] # time_amount_of_condition is the projection time
-            increment = model_configuration[list(results.keys())[i]][-2] # increment is the fission frequency
-            plt.subplot(rows, columns, i+1) # creates a subplot
-            plt.plot([i*increment for i in range(len(opening_population[i]))], opening_population[i], label="Opening") # plots the opening population
-            plt.plot([i*increment for i in range(len(added_population[i]))], added_population[i], label="Added") # plots the added population
-            plt.plot([i*increment for i in range(len(final_population[i]))], final_population[i], label="Final") # plots the final population
-            plt.title(list(results.keys())[i]) # sets the title
-            plt.xlabel(f"Time ({time_amount_of_condition.get_unit()})") # sets the x label
-            plt.ylabel("Population Size") # sets the y label
-
-    elif output_as == "list" or output_as == "compare": # line graph
-        for model, result in results.items(): # for each result
-            increment = model_configuration[model][-2] # increment is the fission frequency
-            if condition == "population": # if the condition is population
-                plt.plot([i*increment for i in range(len(result))], result, label=model) # plots the population
-            elif condition == "projected": # if the condition is projected
-                plt.plot([i for i in range(len(result))], result, label=model) # plots the projected population
-        plt.title("Population Size Over Time") # sets the title
-        plt.xlabel(f"Time ({model_configuration[list(results.keys())[0]][-1].get_unit()})") # sets the x label
-        plt.ylabel("Population Size") # sets the y label
+    with measure(recorder, "show_graph"): # only drawing is measured, not waiting for the prompt or for the graph to be closed
+        plt = get_pyplot() # matplotlib is only loaded once a graph is wanted
+        if log_space and precision_digits == 0: # log-space populations can be too big for a float, so log10 of them is graphed instead
+            results = {model: population_log10(result) for model, result in results.items()}
+            opening_population = [population_log10(populations) for populations in opening_population]
+            added_population = [population_log10(populations) for populations in added_population]
+            final_population = [population_log10(populations) for populations in final_population]
+            bands = {model: (population_log10(low), population_log10(high)) for model, (low, high) in bands.items()}
+        elif precision_digits > 0: # high-precision decimals are changed to floats for graphing
+            results = {model: np.asarray(result, dtype=float) for model, result in results.items()}
+            opening_population = [np.asarray(populations, dtype=float) for populations in opening_population]
+            added_population = [np.asarray(populations, dtype=float) for populations in added_population]
+            final_population = [np.asarray(populations, dtype=float) for populations in final_population]
+        population_label = "Population Size (log10)" if log_space and precision_digits == 0 else "Population Size" # the y label of every graph
+        if output_as == "columns": # if the output type is columns
+            columns = ceil(len(results)**0.5) # gets the number of columns
+            rows = ceil(len(results)/columns) # gets the number of rows
+            for i in range(len(results)): # for each result
+                time_axis = model_configuration[list(results.keys())[i]][-1] # time_axis is the times the model was calculated at
+                plt.subplot(rows, columns, i+1) # creates a subplot
+                plot_series(time_axis, opening_population[i], "Opening") # plots the opening population
+                plot_series(time_axis, added_population[i], "Added") # plots the added population
+                plot_series(time_axis, final_population[i], "Final") # plots the final population
+                if list(results.keys())[i] in bands: plot_band(time_axis, *bands[list(results.keys())[i]], "Final Range") # shades the range of the final population
+                plt.title(list(results.keys())[i]) # sets the title
+                plt.xlabel(f"Time ({time_axis.get_unit()})") # sets the x label
+                plt.ylabel(population_label) # sets the y label
 
-    elif output_as == "final": # bar graph
-        for model, result in results.items(): # for each result
-            plt.bar("".join([model[0][0], model.split()[2]]), result[-1]) # plots the final population
-        plt.title("Final Population Size by Model") # sets the title
-        plt.xlabel("Models") # sets the x label
-        plt.ylabel("Population Size") # sets the y label
+        elif output_as == "list" or output_as == "compare": # line graph
+            for model, result in results.items(): # for each result
+                plot_series(model_configuration[model][-1], result, model) # plots the population against the times the model was calculated at
+                if model in bands: plot_band(model_configuration[model][-1], *bands[model], f"{model} Range") # shades the range of the population
+            plt.title("Population Size Over Time") # sets the title
+            plt.xlabel(f"Time ({model_configuration[list(results.keys())[0]][-1].get_unit()})") # sets the x label
+            plt.ylabel(population_label) # sets the y label
+
+        elif output_as == "final": # bar graph
+            for model, result in results.items(): # for each result
+                error = [[max(result[-1] - bands[model][0][-1], 0)], [max(bands[model][1][-1] - result[-1], 0)]] if model in bands else None # the range of the final population is shown as error bars (the bar can be outside the range, as replicates only count whole fission events)
+                plt.bar("".join([model[0][0], model.split()[2]]), result[-1], yerr=error) # plots the final population
+            plt.title("Final Population Size by Model") # sets the title
+            plt.xlabel("Models") # sets the x label
+            plt.ylabel(population_label) # sets the y label
     
-    plt.legend() # shows the legend
-    plt.tight_layout() # tightens the layout
+        plt.legend() # shows the legend
+        plt.tight_layout() # tightens the layout
+        if recorder is not None: plt.gcf().canvas.draw() # draws the graph before it is shown so the time drawing takes is measured
     cprint("Opened Graph. Close the graph to continue...\n", color="grey", attrs=["dark"]) # prints a message to tell the user to close the graph to continue
     plt.show() # shows the graph
 
@@ -158,6 +721,7 @@ def input_custom_settings(): # Function that inputs custom settings
     print_title("Input Custom Settings") # prints a title
     naive_models = ranged_input(0, 10, "Enter the number of naive models: ") # gets the number of naive models
     sophisticated_models = ranged_input(0, 10, "Enter the number of sophisticated models: ") # gets the number of sophisticated models
+    growth_models = {f"{model_type}_models": ranged_input(0, 10, f"Enter the number of {model_type} models: ") for model_type in GROWTH_MODEL_TYPES} # gets the number of logistic and Gompertz models
     output:str = listed_input( # gets the output type
         choices = {"final": "Final Population Size", 
                    "list": "List of Populations over Time", 
@@ -204,7 +768,7 @@ def input_custom_settings(): # Function that inputs custom settings
 
     print_title("Selected Settings")
     print(f"Output: {output.capitalize()}, Condition: {condition.capitalize()}")
-    print(f"Naive Models: {naive_models}, Sophisticated Models: {sophisticated_models}")
+    print(f"Naive Models: {naive_models}, Sophisticated Models: {sophisticated_models}, " + ", ".join(f"{model_type.title()} Models: {growth_models[f'{model_type}_models']}" for model_type in GROWTH_MODEL_TYPES))
     print(f"Forced Settings: {forced}")
     return {
         "name": "Custom Settings",
@@ -212,163 +776,239 @@ def input_custom_settings(): # Function that inputs custom settings
         "condition": condition,
         "naive_models": naive_models,
         "sophisticated_models": sophisticated_models,
+        **growth_models,
         "forced": forced
     }
 
 def summary(models_data, projection_time:TimeAmount, target_population:TimeAmount, condition:str): # Function that prints a summary
     print_title("Summary") # prints a title
-    naive_model_count = 1 # sets the naive model count to 0 for counting up later
-    sophisticated_model_count = 1 # sets the sophisticated model count to 0 for counting up later
-    model:list[str|int|TimeAmount] 
+    model_counts:dict[str, int] = {} # how many models of each type have been printed
+    model:Model
     for model in models_data: # loops through each model
         model_type = model[0] # gets the model type
-        if model_type == "naive": # if the model type is naive
-            model_number = naive_model_count 
-            naive_model_count += 1 # update new naive model count
-        else: # if the model type is sophisticated
-            model_number = sophisticated_model_count
-            sophisticated_model_count += 1 # update new sophisticated model count
+        model_name = name_model(model_type, model_counts)
         model_population:int = model[1] # sets variables for printing
         model_growth_rate:int = model[2].get_quantity()
         model_growth_unit:str = model[2].get_unit()
         fission_frequency:TimeAmount = model[3]
 
-        print(f"{model_type.title()} Model {model_number}: I = {model_population}, g = {model_growth_rate}% per {model_growth_unit}", end="") # prints summary
+        print(f"{model_name}: I = {model_population}, g = {model_growth_rate}% per {model_growth_unit}", end="") # prints summary
 
-        print(f", Fission Event Frequency: {fission_frequency}") if model_type == "sophisticated" else print("") # prints summary (only sophisticated models have fission frequency)
+        if model_type == "sophisticated": print(f", Fission Event Frequency: {fission_frequency}") # prints summary (only sophisticated models have fission frequency)
+        elif model_type in GROWTH_MODEL_TYPES: print(f", K = {model.carrying_capacity if model.carrying_capacity is not None else 'none'}" + (f", Growth Schedule: {model.growth_schedule}" if model.growth_schedule is not None else "")) # growth models have a carrying capacity and maybe a schedule
+        else: print("")
 
         if condition == "projected": # prints the timeframe if the condition is projected
             print(f"Projected Timeframe: {projection_time}")
         if condition == "population": # prints the target population if the condition is population
             print(f"Target Population: {target_population}")
 
-def calculate_models(calculate_data:list[list[list]], output_unit:str): # Function that calculates the models
+def calculate_models(calculate_data:list[Calculation], output_unit:str): # Function that calculates the models
     results:dict[str, list] = {} # creates a dictionary of results
-    model_configuration:dict[str, list[int|TimeAmount]] = {} # creates a dictionary of model configurations
-    model_result = 0 
-    sophisticated_model_count = 1 
-    naive_model_count = 1
+    model_configuration:dict[str, Calculation] = {} # creates a dictionary of model configurations
+    model_counts:dict[str, int] = {} # how many models of each type have been named
     opening_population:list[list] = []
     added_population:list[list] = []
     final_population:list[list] = []
     for i in range(len(calculate_data)): # loops through every model
-        if calculate_data[i][0][0] == "naive": # getting first model type
-            model_name = f"Naive Model {naive_model_count}"
-            naive_model_count += 1
-        elif calculate_data[i][0][0] == "sophisticated":
-            model_name = f"Sophisticated Model {sophisticated_model_count}"
-            sophisticated_model_count += 1
-        results[model_name] = [] # add a new model to the dictionary of results
-        calculate_data[i][-1][-1].convert(output_unit) # changes the time amount of the condition to the output unit
-        model_configuration[model_name] = calculate_data[i][-1] # add a new model to the model configurations
-        
-        opening_population.append([]) # add a new model to the opening pop list
-        added_population.append([]) # add a new model to the added pop list
-        final_population.append([]) # add a new model to the final pop list
-
-        last_population = 0 
-        for calculation in calculate_data[i]: # loops through each calculation
-            if last_population == 0:
-                last_population = calculation[1]
-            model_result = round(calculate_population_size(*calculation[:5]), rounding_amount) # calculate the model result
-            results[model_name].append(model_result) # add the result to the dictionary of results
-
-            opening_population[i].append(last_population) # add to opening pop list
-            added_population[i].append(round(model_result - last_population, rounding_amount)) # add to added pop list
-            final_population[i].append(model_result) # add to final pop list
-
-            last_population = model_result
+        model_name = name_model(calculate_data[i][0], model_counts) # getting the model type
+        time_axis = calculate_data[i][-1] # the times the model is calculated at
+        opening, added, model_results, _ = calculate_rows(calculate_data[i]) # calculate the whole model at once
+        time_axis.convert(output_unit) # changes the time axis of the condition to the output unit
+        model_configuration[model_name] = calculate_data[i] # add a new model to the model configurations
+        results[model_name] = model_results # add the results to the dictionary of results
+
+        opening_population.append(opening) # add to opening pop list
+        added_population.append(added) # add to added pop list
+        final_population.append(list(model_results)) # add to final pop list
     
     return (results, opening_population, added_population, final_population, model_configuration) # return everything
 
-def compile_data(models_data: list[list[str|int|TimeAmount]], projection_time:TimeAmount|None, target_population:int|None, condition:str, output_as:str): # Function that compiles the data for calculation
-    calculation_data:list[list[list[str|int|TimeAmount]]] = [] # creates a list of calculations
+def calculate_module_5(calculate_data:list[Calculation], output_unit:str): # Function that calculates module 5 as one sweep over its fission frequencies instead of a model at a time, giving the same results as calculate_models
+    if precision_digits > 0 or log_space: return calculate_models(calculate_data, output_unit) # the sweep only calculates floats, decimals and log-space go through the models
+    from sweep import module_5_sweep # imported when it is needed, as sweep imports from here
+    populations = module_5_sweep(calculate_data[0][1]).populations.reshape(-1).tolist() # the final population for each fission frequency, in the order of the models
+    results:dict[str, list] = {}
+    model_configuration:dict[str, Calculation] = {}
+    model_counts:dict[str, int] = {}
+    for calculation, population in zip(calculate_data, populations): # names and converts every model like calculate_models
+        model_name = name_model(calculation[0], model_counts)
+        calculation.time_axis.convert(output_unit)
+        model_configuration[model_name] = calculation
+        results[model_name] = [population]
+    return (results, [[calculation[1]] for calculation in calculate_data], [[population - calculation[1]] for calculation, population in zip(calculate_data, populations)], [list(result) for result in results.values()], model_configuration)
+
+def compile_data(models_data: list[Model], projection_time:TimeAmount|None, target_population:int|None, condition:str, output_as:str): # Function that compiles the data for calculation
+    return list(iterate_compiled_data(models_data, projection_time, target_population, condition, output_as)) # return all the data, ready to be calculated
 
+def iterate_compiled_data(models_data: list[Model], projection_time:TimeAmount|None, target_population:int|None, condition:str, output_as:str): # Generator that compiles the data for calculation one model at a time
     for i in range(len(models_data)): # loops through every model
-        calculation_data.append([]) # add a new model to the list
-        projection_time_count = 0
         if models_data[i][0] == "sophisticated": # models_data[i][3] is the fission frequency convert before calculations
             if type(models_data[i][3]) == str: # if the fission frequency is a string
-                models_data[i][3] = SECONDS_IN_UNIT[models_data[i][2].get_unit()] / SECONDS_IN_UNIT[models_data[i][3]] # models_data[i][2] is the growth rate, converts fission frequency unit to a number
+                models_data[i] = models_data[i]._replace(fission_frequency=UNIT_RATIO[models_data[i][2].get_unit(), models_data[i][3]]) # models_data[i][2] is the growth rate, converts fission frequency unit to a number (models can not be changed, so it is replaced)
         if condition == "projected": # if the condition is projected
             if output_as == "final": # if the output is final
-                calculation_data[i].append(models_data[i] + [projection_time]) # add a calculation for that model to the list
+                time_axis = TimeAxis(projection_time.get_quantity(), 1, 1, projection_time.get_unit()) # only the projection time is calculated
             elif output_as in ["list", "columns", "compare"]: # if the output is a list
-                for _ in range(projection_time.get_quantity() + 1): # loops through every time for each projected time unit
-                    calculation_data[i].append(models_data[i] + [TimeAmount(projection_time_count, projection_time.get_unit())]) # add a calculation to the new model
-                    projection_time_count += 1 # increment
+                time_axis = TimeAxis(0, 1, int(projection_time.get_quantity()) + 1, projection_time.get_unit()) # every projected time unit
         elif condition == "population": # if the condition is population
             time_needed:TimeAmount; increment:int
-            time_needed, increment = calculate_time_to_reach_target(*models_data[i], target_population) # models_data[i][2] is the growth rate. Calculates the amount of time needed to reach the target population
+            if models_data[i][0] in GROWTH_MODEL_TYPES: time_needed, increment = calculate_growth_time_to_reach_target(models_data[i], target_population) # growth models are solved until they reach the target population
+            else: time_needed, increment = calculate_time_to_reach_target(*models_data[i][:4], target_population) # models_data[i][2] is the growth rate. Calculates the amount of time needed to reach the target population
             if output_as == "final": # if the output is final
-                calculation_data[i].append(models_data[i] + [time_needed]) # add a calculation to the list
+                time_axis = TimeAxis(time_needed.get_quantity(), increment, 1, time_needed.get_unit()) # only the time needed is calculated
             elif output_as in ["list", "columns", "compare"]: # if the output is a list
-                for _ in range(int(time_needed.get_quantity()/increment) + 1): # loops through every time for each fission event
-                    calculation_data[i].append(models_data[i] + [TimeAmount(projection_time_count, time_needed.get_unit())]) # add a calculation to the new model
-                    projection_time_count += increment # increment
-    return calculation_data # return all the data, ready to be calculated
+                time_axis = TimeAxis(0, increment, int(time_needed.get_quantity()/increment) + 1, time_needed.get_unit()) # every fission event
+        yield Calculation(*models_data[i], time_axis) # give the calculation for that model
+
+def format_time_needed(time_needed:TimeAmount, increment:float) -> str: # Function that formats the time needed to reach the target population
+    if time_needed.get_quantity() - int(time_needed.get_quantity()) == 0:
+        return f"{time_needed}"
+    extra_fission_events = round((time_needed.get_quantity() - int(time_needed.get_quantity())) * increment)
+    return f"{TimeAmount(int(time_needed.get_quantity()), time_needed.get_unit())} and {extra_fission_events} fission event(s) ({round(time_needed, rounding_amount)})"
 
-def print_results(results:dict[str, list], opening_population:list[list], added_population:list[list], final_population:list[list], model_configuration:dict[str, list[int|TimeAmount]], condition:str, output_as:str): # Function that prints the results
+def print_results(results:dict[str, list], opening_population:list[list], added_population:list[list], final_population:list[list], model_configuration:dict[str, Calculation], condition:str, output_as:str): # Function that prints the results
     print_title("Results")
     if output_as == "columns": # if the output is columns
         for i in range(len(results)): # loops through every model
-            time_amount_of_condition = model_configuration[list(results.keys())[i]][-1] # time_amount_of_condition is the projection time
-            increment = model_configuration[list(results.keys())[i]][-2] # increment is the fission frequency
+            time_amount_of_condition = round(model_configuration[list(results.keys())[i]][-1][-1], 9) # time_amount_of_condition is the last time of the time axis (rounded to remove float error from the step)
+            increment = model_configuration[list(results.keys())[i]][3] # increment is the fission frequency
             print_table( # prints a table with the opening, added and final populations
-                data=[[n for n in range(len(opening_population[i]))], opening_population[i], added_population[i], final_population[i]],
-                table_length=len(opening_population[i]) + 1,
+                data=[range(len(opening_population[i])), opening_population[i], added_population[i], final_population[i]],
+                table_length=len(opening_population[i]),
                 table_title=list(results.keys())[i],
                 titles=[f"Time (in {time_amount_of_condition.get_unit()}s)", "Opening", "Added", "Final"],
+                view=table_view(len(opening_population[i]), table_head_rows, table_tail_rows, table_every_rows), # only the rows picked in settings
+                format_column=format_populations, # populations are rounded as they are printed
             )
             if condition == "population": # if the condition is population
-                # format the time needed
-                if time_amount_of_condition.get_quantity() - int(time_amount_of_condition.get_quantity()) == 0:
-                    time_needed_format = f"{time_amount_of_condition}"
-                else:
-                    extra_fission_events = round((time_amount_of_condition.get_quantity() - int(time_amount_of_condition.get_quantity())) * increment)
-                    time_needed_format = f"{TimeAmount(int(time_amount_of_condition.get_quantity()), time_amount_of_condition.get_unit())} and {extra_fission_events} fission event(s) ({round(time_amount_of_condition, rounding_amount)})"
-                print(f"Time taken to reach population: {time_needed_format}\n") # prints the time needed
+                print(f"Time taken to reach population: {format_time_needed(time_amount_of_condition, increment)}\n") # prints the time needed
             elif condition == "projected": # if the condition is projected
-                print(f"Final Population after {time_amount_of_condition}: {final_population[i][-1]}\n") # prints the final population
+                print(f"Final Population after {time_amount_of_condition}: {round_population(final_population[i][-1])}\n") # prints the final population
     elif output_as == "list": # if the output is a list
         for i in range(len(results)): # loops through every model
-            time_amount_of_condition = model_configuration[list(results.keys())[i]][-1] # time_amount_of_condition is the projection time
-            increment = model_configuration[list(results.keys())[i]][-2] # increment is the fission frequency
+            time_amount_of_condition = round(model_configuration[list(results.keys())[i]][-1][-1], 9) # time_amount_of_condition is the last time of the time axis (rounded to remove float error from the step)
+            increment = model_configuration[list(results.keys())[i]][3] # increment is the fission frequency
             model = list(results.keys())[i] # model is the name of the model
             result = results[model] # result is the list of populations
-            printing_results_list = ", ".join([str(i) for i in result]) # printing_results_list is the list of populations as a string
+            printing_results_list = ", ".join(format_populations(result)) # printing_results_list is the list of rounded populations as a string
             if condition == "population": # if the condition was population
-                # format the time needed
-                if time_amount_of_condition.get_quantity() - int(time_amount_of_condition.get_quantity()) == 0:
-                    time_needed_format = f"{time_amount_of_condition}"
-                else:
-                    extra_fission_events = round((time_amount_of_condition.get_quantity() - int(time_amount_of_condition.get_quantity())) * increment)
-                    time_needed_format = f"{TimeAmount(int(time_amount_of_condition.get_quantity()), time_amount_of_condition.get_unit())} and {extra_fission_events} fission event(s) ({round(time_amount_of_condition, rounding_amount)})"
                 print(f"Forward Projection for {model}: {printing_results_list}") # print list of populations
-                print(f"Time taken to reach population: {time_needed_format}\n") # print time needed
+                print(f"Time taken to reach population: {format_time_needed(time_amount_of_condition, increment)}\n") # print time needed
             elif condition == "projected": # if the conditon was projected
                 print(f"Over Time for {model}: {printing_results_list}") # print list of populations
-                print(f"Final Population after {time_amount_of_condition}: {result[-1]}\n") # print final population
+                print(f"Final Population after {time_amount_of_condition}: {round_population(result[-1])}\n") # print final population
     elif output_as == "compare": # if the output is compare
-        time_amount_of_condition = model_configuration[list(results.keys())[0]][-1] # time_amount_of_condition is the projection time
+        time_amount_of_condition = model_configuration[list(results.keys())[0]][-1][-1] # time_amount_of_condition is the last time of the time axis
         table_data = [] # table_data is the data for the table
-        table_data.append([i for i in range(int(time_amount_of_condition.get_quantity()) + 1)]) # table_data[0] is the time
+        table_data.append(range(int(time_amount_of_condition.get_quantity()) + 1)) # table_data[0] is the time
         for i in range(len(results)): # loops through every model
-            increment = model_configuration[list(results.keys())[i]][-2] # increment is the fission frequency
+            increment = model_configuration[list(results.keys())[i]][3] # increment is the fission frequency
             if condition == "population": # if the condition was population
                 skip = round(increment)
                 table_data.append(results[list(results.keys())[i]][::skip]) # adds results to table data but skips ones to shorten list
             elif condition == "projected": # if the condition was projected
                 table_data.append(results[list(results.keys())[i]]) # adds results to table data
+        table_length = max(len(column) for column in table_data) # the real number of rows, the longest column
         print_table( # prints table
             data=table_data,
-            table_length=len(table_data[0]) + 1,
+            table_length=table_length,
             table_title="Comparison",
             titles=[f"Time (in {time_amount_of_condition.get_unit()}s)"] + [model for model in results.keys()],
+            view=table_view(table_length, table_head_rows, table_tail_rows, table_every_rows), # only the rows picked in settings
+            format_column=format_populations, # populations are rounded as they are printed
         )
     elif output_as == "final": # if the output is final
         for model, result in results.items(): # for each result
-            print(f"{model}: {result[-1]}\n") # print final population
+            print(f"{model}: {round_population(result[-1])}\n") # print final population
+
+def stream_model(calculation:Calculation, chunk_size:int = STREAM_CHUNK_SIZE, stride:int = 1): # Generator that calculates one model a chunk at a time
+    time_axis = calculation[-1] # the times the model is calculated at
+    last_population = None # the first chunk starts at the initial population
+    for start in range(0, len(time_axis), chunk_size * stride): # loops through every chunk of the time axis
+        opening, added, final, last_population = calculate_rows(calculation, start, start + chunk_size * stride, stride, last_population) # calculate the chunk, carrying the last population into the next chunk
+        yield range(start // stride, start // stride + len(final)), opening, added, final # give the rows of this chunk
+
+def name_model(model_type:str, model_counts:dict[str, int]) -> str: # Function that names a model by its type and how many models of that type came before it
+    model_counts[model_type] = model_counts.get(model_type, 0) + 1
+    return f"{model_type.title()} Model {model_counts[model_type]}"
+
+def stream_models(calculate_data): # Generator that names every model as it is compiled
+    model_counts:dict[str, int] = {} # how many models of each type have been named
+    for calculation in calculate_data: # loops through every model, calculate_data can also be a generator
+        yield name_model(calculation[0], model_counts), calculation
+
+def stream_results(models, output_unit:str, condition:str, output_as:str, output_file = sys.stdout, chunk_size:int = STREAM_CHUNK_SIZE): # Function that writes the results a chunk at a time as they are calculated
+    def write_row(values, widths): # formats a row into fixed width columns
+        return "".join(str(value).ljust(width) for value, width in zip(values, widths)).rstrip() + "\n"
+
+    output_file.write("\nResults\n")
+    if output_as == "compare": # if the output is compare, every model is written next to each other
+        models = list(models) # only the model settings are kept, not the results
+        last_time = models[0][1][-1][-1].convert(output_unit) # the last time of the first model, in the output unit
+        titles = [f"Time (in {output_unit}s)"] + [model_name for model_name, _ in models]
+        widths = [max(STREAM_COLUMN_WIDTH, len(title) + 2) for title in titles] # columns are at least as wide as their title
+        output_file.write(f"Comparison\n\n{write_row(titles, widths)}")
+        strides = [round(calculation[3]) if condition == "population" and calculation[3] else 1 for _, calculation in models] # skips fission events so each row is one time unit
+        model_streams = [stream_model(calculation, chunk_size, stride) for (_, calculation), stride in zip(models, strides)]
+        row = 0
+        for chunks in zip_longest(*model_streams, fillvalue=(None, [], [], [])): # loops through each chunk of all the models at the same time, models that have finished are left blank
+            finals = [round_populations(chunk[3]) for chunk in chunks] # populations are rounded as they are written
+            rows = max(len(final) for final in finals)
+            output_file.write("".join(write_row([row + n] + [final[n] if n < len(final) else "" for final in finals], widths) for n in range(rows))) # writes the whole chunk at once
+            output_file.flush()
+            row += rows
+        return
+
+    for model_name, calculation in models: # loops through every model as it is compiled
+        increment = calculation[3] # increment is the fission frequency
+        last_time = calculation[-1][-1].convert(output_unit) # the last time of the time axis, in the output unit
+        last_time = round(last_time, 9) # rounded to remove float error from the step
+        if output_as == "columns": # if the output is columns
+            output_file.write(f"\n{model_name}\n")
+            titles = [f"Time (in {output_unit}s)", "Opening", "Added", "Final"]
+            widths = [max(STREAM_COLUMN_WIDTH, len(title) + 2) for title in titles] # columns are at least as wide as their title
+            output_file.write(write_row(titles, widths))
+        elif output_as == "list": # if the output is a list
+            output_file.write(f"{'Forward Projection' if condition == 'population' else 'Over Time'} for {model_name}: ")
+        final_population = None
+        for times, opening, added, final in stream_model(calculation, chunk_size): # loops through every chunk of the model
+            if output_as == "columns":
+                output_file.write("".join(write_row(row, widths) for row in zip(times, round_populations(opening), round_populations(added), round_populations(final)))) # writes the whole chunk at once, rounded as it is written
+            elif output_as == "list":
+                output_file.write((", " if times[0] != 0 else "") + ", ".join(format_populations(final))) # continues the list on the same line
+            final_population = round_population(final[-1])
+            output_file.flush()
+        if output_as == "list": output_file.write("\n")
+        if output_as == "final": # if the output is final
+            output_file.write(f"{model_name}: {final_population}\n\n")
+        elif condition == "population": # if the condition is population
+            output_file.write(f"Time taken to reach population: {format_time_needed(last_time, increment)}\n\n")
+        elif condition == "projected": # if the condition is projected
+            output_file.write(f"Final Population after {last_time}: {final_population}\n\n")
+        output_file.flush()
+
+def export_values(populations: list) -> np.ndarray: # Function that changes a chunk of populations to floats for exporting, rounded to rounding_amount decimals (log10 in log-space, as they may be too big for a float)
+    if log_space and precision_digits == 0: return population_log10(populations)
+    return np.round(np.asarray(populations, dtype=float), rounding_amount)
+
+def export_results(models, output_unit:str, folder:str, formats:list[str] = EXPORT_FORMATS, chunk_size:int = STREAM_CHUNK_SIZE) -> list[str]: # Function that exports every model's time, opening, added and final columns a chunk at a time
+    os.makedirs(folder, exist_ok=True)
+    titles = [f"time_in_{export_name(output_unit)}s"] + [f"{title}_log10" if log_space and precision_digits == 0 else title for title in EXPORT_COLUMNS[1:]] # log-space columns are log10 of the populations
+    written = []
+    for model_name, calculation in models: # loops through every model as it is compiled
+        time_axis = calculation[-1]
+        unit_ratio = UNIT_RATIO[time_axis.get_unit(), output_unit] # changes the times to the output unit
+        chunks = ((time_axis.get_quantities(times.start, times.stop) * unit_ratio, export_values(opening), export_values(added), export_values(final)) for times, opening, added, final in stream_model(calculation, chunk_size)) # the columns of each chunk
+        name = os.path.join(folder, export_name(model_name))
+        csv_path = f"{name}.csv" if "csv" in formats else None
+        npy_folder = name if "npy" in formats or "npz" in formats else None # .npz files are made from the .npy columns
+        npy_paths = export_columns(chunks, len(time_axis), csv_path, npy_folder, titles)
+        written += [path for path in [csv_path, npy_folder] if path]
+        if "npz" in formats:
+            export_npz(f"{name}.npz", npy_paths)
+            written.append(f"{name}.npz")
+    return written
 
 def run_inputs(settings:dict[str, str|int|list|dict]):
     models_data = [] # models_data is the data for the models
@@ -380,7 +1020,7 @@ def run_inputs(settings:dict[str, str|int|list|dict]):
         else: initial_population = ranged_input(*inital_population_limits, "Enter the initial population: ")
         if "growth_rate" in settings["forced"].keys(): growth_rate = TimeAmount(*settings["forced"]["growth_rate"])
         else: growth_rate = TimeAmount(*time_amount_input(*growth_rate_limits, "Enter the growth rate % (7% = 7): ",))
-        models_data.append(["naive"] + [initial_population, growth_rate, None])
+        models_data.append(Model("naive", initial_population, growth_rate, None))
     
     for i in range(settings["sophisticated_models"]): # loops through sophisticated models and run inputs
         print_title(f"Sophisticated Model {i + 1}")
@@ -402,14 +1042,28 @@ def run_inputs(settings:dict[str, str|int|list|dict]):
             )
             if "custom" in fission_frequency: fission_frequency = ranged_input(*fission_frequency_limits, "Enter the number of fission-events per growth rate unit: ")
             else: fission_frequency = fission_frequency[1] # returns as total fission events unit
-        models_data.append(["sophisticated"] + [initial_population, growth_rate, fission_frequency])
+        models_data.append(Model("sophisticated", initial_population, growth_rate, fission_frequency))
+
+    for model_type in GROWTH_MODEL_TYPES: # loops through logistic then Gompertz models and run inputs (modules without them have none)
+        for i in range(settings.get(f"{model_type}_models", 0)):
+            print_title(f"{model_type.title()} Model {i + 1}")
+            if "initial_population" in settings["forced"].keys(): initial_population = settings["forced"]["initial_population"]
+            else: initial_population = ranged_input(*inital_population_limits, "Enter the initial population: ")
+            if "growth_rate" in settings["forced"].keys(): growth_rate = TimeAmount(*settings["forced"]["growth_rate"])
+            else: growth_rate = TimeAmount(*time_amount_input(*growth_rate_limits, "Enter the growth rate % (7% = 7): ",))
+            carrying_capacity = ranged_input(0 if model_type == "logistic" else 1, 0, "Enter the carrying capacity" + (" (0 = none): " if model_type == "logistic" else ": "), infinite_end=True)
+            growth_schedule = []
+            for j in range(ranged_input(0, 10, "Enter the number of growth rate changes: ")): # the growth rate can change at set times
+                start = ranged_input(1, 0, f"Enter the time of change {j + 1} (in {growth_rate.get_unit()}s): ", infinite_end=True)
+                growth_schedule.append((start, ranged_input(*growth_rate_limits, f"Enter the growth rate % from then on: ")))
+            models_data.append(Model(model_type, initial_population, growth_rate, None, carrying_capacity or None, tuple(sorted(growth_schedule)) or None))
 
     if "initial_population" in settings["forced"].keys(): # MODULE 5 ONLY: get inital population for all modules
         if settings["forced"]["initial_population"] == "same":
             print_title("Initial Population")
             initial_population = ranged_input(*inital_population_limits, "Enter the initial population for all modules: ")
             for i in range(len(models_data)):
-                models_data[i][1] = initial_population # set initial population for all modules
+                models_data[i] = models_data[i]._replace(initial_population=initial_population) # set initial population for all modules
 
     # Get projection time or target population
     target_population = None
@@ -443,23 +1097,126 @@ def run_inputs(settings:dict[str, str|int|list|dict]):
     
     return models_data, projection_time, target_population, output_unit, condition # returns everything user entered
 
-def module_5_info(results: dict[str, list[int]], initial_population: int): # Function to print info for module 5
-    # Printing Information
-    print_title("Population Limit")
-    print(f"Theoretical population limit as fission frequency approaches infinity: {round(e*initial_population, rounding_amount)}")
-    print(f"This limit is {round(e, rounding_amount)} times the initial population.")
-    print_title("Research Summary")
-    print("The limit observed here is related to the mathematical constant 'e'. When growth happens continuously (which is approximated by very high fission frequencies), the formula for population growth becomes P(t) = P0 * e^(rt), where r is the continuous growth rate. In this case, r = 1.0 (100% per day), so the limit is the initial population multiplied by e.")
+def module_5_info(results: dict[str, list[int]], initial_population: int, recorder = None): # Function to print info for module 5, recorder measures the printing and drawing if instrumentation is on
+    with measure(recorder, "module_5_info"): # only printing is measured, not waiting for enter
+        # Printing Information
+        print_title("Population Limit")
+        if precision_digits > 0: # in the high-precision mode, e is calculated to the same precision as the models
+            with localcontext() as context:
+                context.prec = precision_digits
+                limit = Decimal(1).exp() * Decimal(initial_population)
+            print(f"Theoretical population limit as fission frequency approaches infinity: {round(limit, rounding_amount)}")
+            for model, result in results.items(): # how far each model is from the limit
+                print(f"{model} is {limit - Decimal(result[-1]):.{rounding_amount}e} below the limit")
+        else:
+            print(f"Theoretical population limit as fission frequency approaches infinity: {round(e*initial_population, rounding_amount)}")
+        print(f"This limit is {round(e, rounding_amount)} times the initial population.")
+        print_title("Research Summary")
+        print("The limit observed here is related to the mathematical constant 'e'. When growth happens continuously (which is approximated by very high fission frequencies), the formula for population growth becomes P(t) = P0 * e^(rt), where r is the continuous growth rate. In this case, r = 1.0 (100% per day), so the limit is the initial population multiplied by e.")
     input(colored("Press enter to continue...", "grey", attrs=["dark"]))
-    # Graphing Module 5
-    for model, result in results.items():
-        plt.bar(["quarter-day", "2-hour", "hour", "minute", "second"][list(results.keys()).index(model)], result[-1])
-    plt.title("How Fission Frequency Affects Final Population Size")
-    plt.xlabel("Fission Frequencies")
-    plt.ylabel("Population Size")
+    with measure(recorder, "show_graph"): # only drawing is measured, not waiting for the graph to be closed
+        # Graphing Module 5
+        plt = get_pyplot()
+        for model, result in results.items():
+            plt.bar(["quarter-day", "2-hour", "hour", "minute", "second"][list(results.keys()).index(model)], result[-1])
+        plt.title("How Fission Frequency Affects Final Population Size")
+        plt.xlabel("Fission Frequencies")
+        plt.ylabel("Population Size")
+        if recorder is not None: plt.gcf().canvas.draw() # draws the graph before it is shown so the time drawing takes is measured
     cprint("Opened Graph. Close the graph to continue...\n", color="grey", attrs=["dark"])
     plt.show()
 
+def trajectories_from_calculations(calculations: tuple) -> list[Trajectory]: # Function that makes trajectories from the results of calculate_models
+    results, opening_population, added_population, final_population, model_configuration = calculations
+    return [Trajectory(model, model_configuration[model], opening_population[i], added_population[i], final_population[i]) for i, model in enumerate(results.keys())]
+
+def calculations_from_trajectories(trajectories: list[Trajectory]) -> tuple: # Function that makes the results of calculate_models from trajectories (for printing and graphing)
+    return ({trajectory.name: trajectory.final for trajectory in trajectories}, [trajectory.opening for trajectory in trajectories], [trajectory.added for trajectory in trajectories], [trajectory.final for trajectory in trajectories], {trajectory.name: trajectory.calculation for trajectory in trajectories})
+
+def checkpoint_column(values: list) -> tuple[np.ndarray, np.ndarray]: # Function that changes a column of populations to arrays for a checkpoint, numbers as floats (or everything as text if any are decimals or scientific notation) and the type of each one
+    kinds = np.array([CHECKPOINT_KINDS.index(type(value)) if type(value) in CHECKPOINT_KINDS else 0 for value in values], dtype=np.uint8) # numpy floats are saved as floats
+    if np.all(kinds <= 1): return np.asarray(values, dtype=float), kinds
+    return np.array([str(value) for value in values]), kinds
+
+def column_from_checkpoint(values: np.ndarray, kinds: np.ndarray) -> list: # Function that changes the arrays of a checkpoint column back to populations of their saved types
+    column = values.tolist()
+    for index in (np.flatnonzero(kinds) if values.dtype.kind == "f" else range(len(column))): column[index] = CHECKPOINT_KINDS[kinds[index]](column[index]) # floats are already floats
+    return column
+
+def save_checkpoint(path: str, trajectories: list[Trajectory], condition: str, output_as: str): # Function that saves trajectories to a .npz file so they can be extended in another session, the settings as JSON and the populations as arrays
+    settings, columns = {"version": CHECKPOINT_VERSION, "condition": condition, "output_as": output_as, "trajectories": []}, {}
+    for i, trajectory in enumerate(trajectories):
+        calculation, time_axis = trajectory.calculation, trajectory.calculation.time_axis
+        if callable(calculation.growth_schedule): raise ValueError("Models with a growth schedule function can not be saved")
+        settings["trajectories"].append({
+            "name": trajectory.name, "mode": trajectory.mode, "digits": trajectory.precision_digits,
+            "model": [calculation.model_type, calculation.initial_population, [calculation.growth_rate.get_quantity(), calculation.growth_rate.get_unit()], calculation.fission_frequency, calculation.carrying_capacity, calculation.growth_schedule],
+            "time_axis": [time_axis.start, time_axis.step, time_axis.count, time_axis.unit],
+        })
+        for column in ["opening", "added", "final", "population"]:
+            columns[f"{i}_{column}"], columns[f"{i}_{column}_kinds"] = checkpoint_column([trajectory.population] if column == "population" else getattr(trajectory, column))
+    with open(path, "wb") as file: # an open file so numpy does not add .npz to the name
+        np.savez(file, settings=np.array(json.dumps(settings)), **columns)
+
+def load_checkpoint(path: str) -> tuple[list[Trajectory], str, str]: # Function that loads trajectories saved with save_checkpoint, nothing in the file can run code
+    errors = (KeyError, IndexError, TypeError, ValueError, zipfile.BadZipFile) # what broken files, old pickled checkpoints and files that are not checkpoints give
+    try:
+        file = np.load(path, allow_pickle=False)
+        settings = json.loads(str(file["settings"]))
+    except errors as error: raise ValueError(f"{path} is not a checkpoint file") from error
+    with file:
+        if settings.get("version") != CHECKPOINT_VERSION: raise ValueError(f"{path} was saved by another version of the simulator")
+        try:
+            trajectories = []
+            for i, saved in enumerate(settings["trajectories"]):
+                model_type, initial_population, growth_rate, fission_frequency, carrying_capacity, growth_schedule = saved["model"]
+                calculation = Calculation(model_type, initial_population, TimeAmount(*growth_rate), fission_frequency, carrying_capacity, tuple(map(tuple, growth_schedule)) if growth_schedule else None, TimeAxis(*saved["time_axis"]))
+                opening, added, final, population = [column_from_checkpoint(file[f"{i}_{column}"], file[f"{i}_{column}_kinds"]) for column in ["opening", "added", "final", "population"]]
+                trajectories.append(Trajectory(saved["name"], calculation, opening, added, final, saved["mode"], saved["digits"], population[0]))
+        except errors as error: raise ValueError(f"{path} is not a checkpoint file") from error
+    return trajectories, settings["condition"], settings["output_as"]
+
+def trajectory_menu(trajectories: list[Trajectory], condition: str, output_as: str): # Function that lets the user extend or save the projection until they continue
+    while True:
+        choice = listed_input(
+            choices = {"e": "Extend Projection", "t": "Find When Target Populations Are Reached", "s": "Save Checkpoint", "c": "Continue"},
+            prompt = "Extend or save the projection?",
+            return_key=True,
+        )
+        if choice == "c": return
+        if choice == "s": # saves the trajectories
+            path = file_input("Enter the checkpoint file name (blank to go back): ", lambda path: save_checkpoint(path, trajectories, condition, output_as) or path if path else None, (OSError, ValueError)) # asks again if the file can not be written
+            if path: cprint(f"Checkpoint saved to {path}", "green")
+        elif choice == "t": # finds when each target population is reached, searching the populations already calculated
+            try: target_populations = [float(value) for value in input("Enter the target populations (separated by spaces): ").split()]
+            except ValueError:
+                cprint("Invalid. Enter numbers separated by spaces.", "red", attrs=["bold"])
+                continue
+            if len(target_populations) == 0: continue
+            times = [trajectory.time_to_reach(target_populations) for trajectory in trajectories]
+            print_table(
+                data=[target_populations] + [["Not reached" if np.isnan(time) else round(float(time), rounding_amount) for time in model_times] for model_times in times],
+                table_length=len(target_populations),
+                table_title="Time to Reach Target Populations",
+                titles=["Target"] + [f"{trajectory.name} ({trajectory.get_time().get_unit()}s)" for trajectory in trajectories],
+            )
+        elif choice == "e": # extends every trajectory, only the new steps are calculated
+            last_time = trajectories[0].get_time()
+            new_end = ranged_input(int(last_time.get_quantity()) + 1, projection_time_limits[1], f"Enter the new projection time in {last_time.get_unit()}s: ", infinite_end=True)
+            for trajectory in trajectories: trajectory.extend_to(new_end)
+            calculations = calculations_from_trajectories(trajectories)
+            print_results(*calculations, condition, output_as)
+            show_graph(*calculations, condition, output_as)
+
+def measure(recorder, stage: str): # Function that measures a stage of a run if instrumentation is on, otherwise it does nothing
+    return recorder.stage(stage) if recorder is not None else nullcontext()
+
+def report_stages(recorder): # Function that prints what each stage of a run cost and saves the profile and memory snapshot, if instrumentation is on
+    if recorder is None: return
+    recorder.print_breakdown()
+    if instrument_dump: cprint(f"Saved {', '.join(recorder.dump(instrument_dump))}", "green")
+    recorder.close()
+
 def run_module(module_number: int): # run the module based on the module number and settings
     if module_number == 0: # for custom settings
         settings = input_custom_settings()
@@ -476,18 +1233,56 @@ def run_module(module_number: int): # run the module based on the module number
         # SUMMARY
         summary(models_data, projection_time, target_population, condition) # print summary
         
-        # COMPILE DATA FOR CACULATION
         output_as = settings["output"] # set output as to the settings
-        calculation_data = compile_data(models_data, projection_time, target_population, condition, output_as) # compile data for calculation
+        recorder = None
+        if instrument_stages: # instrumentation is only loaded and started when it is on
+            from instrumentation import StageRecorder
+            recorder = StageRecorder()
+        try: # the breakdown is printed and memory tracing stopped even if a stage fails
+            if streaming_output: # if streaming, results are calculated and written a chunk at a time
+                stream_to = listed_input(choices = {"t": "Terminal", "f": "File", "x": "Export Columns (CSV, .npy, .npz)"}, prompt = "Stream results to:", return_key=True)
+                models = stream_models(iterate_compiled_data(models_data, projection_time, target_population, condition, output_as)) # each model is compiled when it is needed
+                if stream_to == "x": # exports the columns instead of writing them as text
+                    folder = file_input("Enter the folder to export to: ", lambda folder: os.makedirs(folder, exist_ok=True) or folder) # asks again until the folder can be made
+                    with measure(recorder, "export_results"): written = export_results(models, output_unit, folder) # compiling and calculating happen a chunk at a time inside the export
+                    cprint(f"Exported {', '.join(written)}", "green")
+                else:
+                    if stream_to == "f": # asks again until the file can be opened, and closes it even if streaming fails
+                        with file_input("Enter the file name: ") as output_file:
+                            with measure(recorder, "stream_results"): stream_results(models, output_unit, condition, output_as, output_file) # compiles, calculates and writes each chunk
+                        cprint(f"Results written to {output_file.name}", "green")
+                    else:
+                        with measure(recorder, "stream_results"): stream_results(models, output_unit, condition, output_as, sys.stdout)
+                cprint("Graphs are not available when streaming.", "grey", attrs=["dark"])
+            else:
+                # COMPILE DATA FOR CACULATION
+                with measure(recorder, "compile_data"): calculation_data = compile_data(models_data, projection_time, target_population, condition, output_as) # compile data for calculation
 
-        # CALCULATE & PRINT RESULTS
-        calculations = calculate_models(calculation_data, output_unit) # calculate all the data
-        print_results(*calculations, condition, output_as) # print results based on output type
+                # CALCULATE & PRINT RESULTS
+                with measure(recorder, "calculate_models"): calculations = calculate_module_5(calculation_data, output_unit) if module_number == 5 else calculate_models(calculation_data, output_unit) # calculate all the data, module 5 as one sweep
+                if result_cache.path:
+                    try:
+                        with measure(recorder, "save_cache"): result_cache.save() # keeps the cached results for next time
+                    except OSError as error: cprint(f"The result cache could not be saved to {result_cache.path}: {error.strerror}", "red")
+                shown = calculations # the agent models are only printed and graphed, the other stages use the models that were entered
+                if agent_mode:
+                    with measure(recorder, "simulate_agents"): shown = add_agent_models(calculations) # the live cells of every sophisticated model, as more models
+                with measure(recorder, "print_results"): print_results(*shown, condition, output_as) # print results based on output type
+                if sensitivity_output:
+                    with measure(recorder, "print_sensitivities"): print_sensitivities(calculations[4]) # how much each input changes the results
+                bands = {}
+                if stochastic_replicates > 0:
+                    with measure(recorder, "simulate_replicates"): bands = print_stochastic(calculations[4]) # the range random fission events give, shaded on the graph
+                if uncertainty_samples > 0:
+                    with measure(recorder, "print_uncertainty"): print_uncertainty(calculations[4], projection_time, target_population, condition, output_unit) # the spread of the results when the inputs are uncertain, includes the time waiting for the distributions
 
-        if module_number == 5: # for module 5, print information
-            module_5_info(calculations[0], models_data[0][1])
-        else:
-            show_graph(*calculations, condition, output_as) # show graphs based on output type
+                if module_number == 5: # for module 5, print information
+                    module_5_info(calculations[0], models_data[0][1], recorder) # measures the printing and drawing itself
+                else:
+                    show_graph(*shown, condition, output_as, bands, recorder) # show graphs based on output type, measures the drawing itself
+        finally:
+            report_stages(recorder) # the breakdown is printed after the results, before the trajectory menu
+        if not streaming_output and module_number != 5 and condition == "projected" and output_as != "final": trajectory_menu(trajectories_from_calculations(calculations), condition, output_as) # projections over time can be extended or saved
 
         # REPLAY
         replay = listed_input( # ask for replay
@@ -512,6 +1307,7 @@ if __name__ == "__main__": # main code that runs everything
                 "4": "Generate detailed projections formatted as columns", 
                 "5": "Model increases in fission-event frequency",
                 "0": "Custom Simulation Settings (Sandbox)",
+                "r": "Resume Saved Checkpoint",
                 "s": "Settings"
             },
             prompt = "Main Menu",
@@ -519,10 +1315,26 @@ if __name__ == "__main__": # main code that runs everything
         )
         if command.isnumeric(): # if command is a number
             run_module(int(command)) # run the module
+        elif command == "r": # if a checkpoint is being resumed
+            checkpoint = file_input("Enter the checkpoint file name (blank to go back): ", lambda path: load_checkpoint(path) if path else None, (OSError, ValueError)) # asks again if the file can not be read
+            if checkpoint is None: continue
+            trajectories, condition, output_as = checkpoint
+            print_results(*calculations_from_trajectories(trajectories), condition, output_as)
+            trajectory_menu(trajectories, condition, output_as)
         elif command == "s": # if the settings were chosen
             change_setting = listed_input( # ask for the setting to change
                 choices = {
                     "r": "Number of decimals for rounding",
+                    "o": "Stream results while calculating (on/off)",
+                    "l": "Log-space populations for very long projections (on/off)",
+                    "p": "High-precision digits for sophisticated models (0 = off)",
+                    "c": "Result cache (statistics, clear, on/off, file)",
+                    "t": "Table rows to print (first, last, every k-th)",
+                    "e": "Print the sensitivity of results to each input (on/off)",
+                    "m": "Stochastic replicates shaded on graphs (0 = off)",
+                    "a": "Agent mode, sophisticated models also simulated cell by cell (on/off)",
+                    "u": "Uncertainty mode, samples for each model's input distributions (0 = off)",
+                    "i": "Instrument each stage of a run (on/off, profile file)",
                     "b": "Back"
                 },
                 prompt = "Select a setting to change:",
@@ -536,3 +1348,45 @@ if __name__ == "__main__": # main code that runs everything
                     end = 12,
                     prompt = f"Enter the number of decimals for rounding: (Current: {rounding_amount}) ",
                 )
+            elif change_setting == "o": # if the user wants to turn streaming on or off
+                streaming_output = not streaming_output # switches streaming on or off
+                cprint(f"Streaming results is now {'on' if streaming_output else 'off'}", "green")
+            elif change_setting == "l": # if the user wants to turn log-space populations on or off
+                log_space = not log_space # switches log-space populations on or off
+                cprint(f"Log-space populations are now {'on' if log_space else 'off'}", "green")
+            elif change_setting == "p": # if the user wants to change the high-precision digits
+                precision_digits = ranged_input( # sets the high-precision digits
+                    start = 0,
+                    end = 1000,
+                    prompt = f"Enter the number of significant digits for high-precision calculations (0 = off): (Current: {precision_digits}) ",
+                )
+            elif change_setting == "t": # if the user wants to change which table rows are printed
+                table_head_rows = ranged_input(start = 0, end = 0, prompt = f"Enter how many rows from the start to print (0 = none): (Current: {table_head_rows}) ", infinite_end = True)
+                table_tail_rows = ranged_input(start = 0, end = 0, prompt = f"Enter how many rows from the end to print (0 = none, 0 and 0 prints every row): (Current: {table_tail_rows}) ", infinite_end = True)
+                table_every_rows = ranged_input(start = 1, end = 0, prompt = f"Enter k to print every k-th row: (Current: {table_every_rows}) ", infinite_end = True)
+            elif change_setting == "e": # if the user wants to turn the sensitivities on or off
+                sensitivity_output = not sensitivity_output # switches the sensitivities on or off
+                cprint(f"Printing sensitivities is now {'on' if sensitivity_output else 'off'}", "green")
+            elif change_setting == "m": # if the user wants to change the stochastic replicates
+                stochastic_replicates = ranged_input(start = 0, end = 0, prompt = f"Enter how many random replicates of each sophisticated model to simulate, 1000 is quick (0 = off): (Current: {stochastic_replicates}) ", infinite_end = True)
+            elif change_setting == "a": # if the user wants to turn agent mode on or off
+                agent_mode = not agent_mode # switches agent mode on or off
+                cprint(f"Agent mode is now {'on' if agent_mode else 'off'}", "green")
+            elif change_setting == "u": # if the user wants to change uncertainty mode
+                uncertainty_samples = ranged_input(start = 0, end = 0, prompt = f"Enter how many samples to propagate each model's input distributions with, 65536 is quick (0 = off): (Current: {uncertainty_samples}) ", infinite_end = True)
+            elif change_setting == "i": # if the user wants to turn instrumentation on or off
+                instrument_stages = not instrument_stages # switches instrumentation on or off
+                if instrument_stages: instrument_dump = input("Enter the file name to save each run's profile and memory snapshot to (blank for none): ") or None
+                cprint(f"Instrumentation is now {'on' if instrument_stages else 'off'}", "green")
+            elif change_setting == "c": # if the user wants to see or change the result cache
+                print_title("Result Cache")
+                for name, value in result_cache.stats().items(): print(f"{name.replace('_', ' ').capitalize()}: {round(value, rounding_amount)}") # prints the statistics
+                cache_setting = listed_input(
+                    choices = {"c": "Clear the cache", "o": f"Turn the cache {'off' if result_cache.enabled else 'on'}", "f": "Set the cache file (blank for none)", "b": "Back"},
+                    prompt = "Select a cache setting:",
+                    return_key=True,
+                )
+                if cache_setting == "c": result_cache.clear()
+                elif cache_setting == "o": result_cache.enabled = not result_cache.enabled
+                elif cache_setting == "f":
+                    result_cache.path = file_input("Enter the cache file name (.npz): ", lambda path: (result_cache.load(path) if path else None) or path or None, (OSError, ValueError)) # loads any results saved before, asking again if the file can not be read
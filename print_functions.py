@@ -1,6 +1,13 @@
-from termcolor import colored, cprint
 import sys
 
+def colored(*args, **kwargs):
+    from termcolor import colored as termcolor_colored
+    return termcolor_colored(*args, **kwargs)
+
+def cprint(*args, **kwargs):
+    from termcolor import cprint as termcolor_cprint
+    termcolor_cprint(*args, **kwargs)
+
 def limited_input(choices: list = ["y", "n"], prompt: str = "Pick an option:", prompt_separator: str = ", ", prompt_colour: str = "yellow", prompt_attrs: list = ["bold"], error: str = "Invalid. Please try again.", error_colour: str = "red", error_attrs: list = []):
     choices = [str(choice) for choice in choices]
     cprint(prompt, prompt_colour, attrs=prompt_attrs)
@@ -60,19 +67,56 @@ def ranged_input(start: int, end: int, prompt: str = "Choose a number:", error:
             return answer
         cprint(error, "red", attrs=["bold"])
 
-def print_table(data: list[list], table_length: int, table_title: str = "RESULTS TABLE", titles: list = ["Round", "Choice", "Action", "Outcome"], table_buffer: int = 2):
-    longest_string = max(len(str(value)) for row in data + [titles] for value in row)
-    cprint(table_title, attrs=["bold"])
-    print("")
-    for title in titles:
-        print(colored(title, attrs=["underline"]), end=" " * (longest_string - len(str(title)) + table_buffer))
-    print("")
-    for i in range(table_length):
-        for row in data:
-            value = row[i] if i < len(row) else ""
-            print(str(value), end=" " * (longest_string - len(str(value)) + table_buffer))
-        print("")
-    print("")
+def file_input(prompt: str = "Enter the file name: ", action = None, errors: tuple = (OSError,)):
+    while True:
+        answer = input(prompt)
+        if answer.lower() in ["q", "quit"]:
+            cprint("Selected Quit Program", "green")
+            sys.exit()
+        try:
+            return action(answer) if action else open(answer, "w")
+        except errors as error:
+            cprint(f"Invalid. {error.strerror if isinstance(error, OSError) and error.strerror else error}. Please try again.", "red", attrs=["bold"])
+
+def table_view(table_length: int, head: int = 0, tail: int = 0, every: int = 1) -> list[range]:
+    if head <= 0 and tail <= 0 or head + tail >= table_length:
+        return [range(0, table_length, every)]
+    view = []
+    if head > 0:
+        view.append(range(0, head, every))
+    if tail > 0:
+        view.append(range(table_length - tail, table_length, every))
+    return view
+
+def format_table_page(data: list[list], rows: range, format_column=None) -> list[list[str]]:
+    cells = []
+    for column in data:
+        values = column[rows.start:rows.stop:rows.step]
+        values = format_column(values) if format_column else [str(value) for value in values]
+        cells.append(values + [""] * (len(rows) - len(values)))
+    return cells
+
+def print_table(data: list[list], table_length: int, table_title: str = "RESULTS TABLE", titles: list = ["Round", "Choice", "Action", "Outcome"], table_buffer: int = 2, view: list[range] = None, page_size: int = 10000, output_file = None, format_column = None):
+    if output_file is None:
+        output_file = sys.stdout
+    if view is None:
+        view = [range(table_length)]
+    cprint(table_title, attrs=["bold"], file=output_file)
+    output_file.write("\n")
+    title_width = max(len(str(title)) for title in titles)
+    sample = format_table_page(data, view[0][:page_size] if view else range(0), format_column)
+    last_rows = [format_table_page(data, rows[-1:], format_column) for rows in view if len(rows) > 0] # the last row of a growing trajectory has its widest values, so every page can share one width
+    column_width = max([title_width] + [max(map(len, column), default=0) for cells in [sample] + last_rows for column in cells]) + table_buffer
+    output_file.write("".join(colored(title, attrs=["underline"]) + " " * (column_width - len(str(title))) for title in titles) + "\n")
+    for i, rows in enumerate(view):
+        if i > 0:
+            output_file.write("...\n")
+        for start in range(0, len(rows), page_size):
+            page = rows[start:start + page_size]
+            cells = sample if i == 0 and start == 0 else format_table_page(data, page, format_column)
+            output_file.write("\n".join("".join(row) for row in zip(*[[value.ljust(column_width - 1) + " " for value in column] for column in cells])) + "\n") # wider values overflow their column instead of changing the width of the page
+    output_file.write("\n")
+    output_file.flush()
 
 def time_amount_input(min:int, max:int, prompt:str = "Enter a time amount: ", allow_float:bool = True, infinite_end:bool = False, avaliable_units:dict = {"year": "y", "half-year": "hy", "quarter-year": "qy", "month": "m", "week": "w", "day": "d", "half-day": "hd", "quarter-day": "qd", "2-hour": "2h", "hour": "h", "minute": "min", "second": "s"}, special:list = ["custom"]) -> list[int|float|str]:
     if infinite_end:
@@ -0,0 +1,65 @@
+import main # Imports the simulator as a module so its rounding setting can be changed
+from main import SIMULATION_SETTINGS, Calculation, TimeAmount, calculate_models, compile_data, format_populations, result_cache, cprint # Imports the calculation the shown numbers come from
+from benchmark_suite import module_models # Imports the models each module makes, with the same inputs the benchmark suite uses
+from time import perf_counter # Imports a high resolution timer for the speed check
+import numpy as np # Imports numpy for comparing populations
+import sys # Imports sys for exiting with an error when a check fails
+
+def rounded_calculate_models(calculate_data:list[Calculation], output_unit:str): # calculate_models as it was when every population was rounded as it was calculated, kept to compare against
+    results, opening_population, added_population, final_population, model_configuration = calculate_models(calculate_data, output_unit)
+    for i, name in enumerate(results):
+        final = np.round(final_population[i], main.rounding_amount)
+        opening = np.concatenate(([opening_population[i][0]], final[:-1])) # the next step carried on from the rounded population
+        results[name] = final_population[i] = final.tolist()
+        opening_population[i] = opening.tolist()
+        added_population[i] = np.round(final - opening, main.rounding_amount).tolist()
+    return (results, opening_population, added_population, final_population, model_configuration)
+
+def module_calculation(settings: dict, days: int): # Function that gives a function calculating a module's models with the given version of calculate_models
+    models = module_models(settings)
+    projection_time = TimeAmount(*settings["forced"].get("projection_time", [days, "day"]))
+    return lambda function: function(compile_data(models, projection_time, None, "projected", settings["output"]), "day")
+
+def check_rounding(days: int = 365, decimals_checked: list[int] = [0, 2, 6]) -> list[str]: # Checks that every module's models show the same numbers when rounded only as they are shown as when every step was rounded, giving what does not match
+    rounding_amount, failures = main.rounding_amount, []
+    try:
+        for module, settings in enumerate(SIMULATION_SETTINGS, start=1):
+            calculate = module_calculation(settings, days)
+            unrounded = calculate(calculate_models)
+            for decimals in decimals_checked:
+                main.rounding_amount = decimals
+                rounded = calculate(rounded_calculate_models)
+                for i, (old, new) in enumerate(zip(rounded[3], unrounded[3])): # the final populations are shown exactly as before
+                    if format_populations(new) != [str(population) for population in old]: failures.append(f"Module {module} model {i + 1} at {decimals} decimals: final populations are shown differently")
+                for i, (old, new, final) in enumerate(zip(rounded[2], unrounded[2], rounded[3])):
+                    # The only change that is shown: Added is now the rounded true difference, not the difference of two rounded
+                    # populations, so it can be one off in the last decimal. In module 1 at 2 decimals the sophisticated model's
+                    # day 3 was 1161.65 - 1105.06 = 56.59 and is now 56.597... shown as 56.6
+                    if not np.all(np.abs(np.round(new, decimals) - old) <= 10 ** -decimals * 1.0001 + 4 * np.spacing(np.array(final))): failures.append(f"Module {module} model {i + 1} at {decimals} decimals: added populations differ by more than the last decimal")
+                if not all(np.array_equal(new, other) for new, other in zip(unrounded[3], calculate(calculate_models)[3])): failures.append(f"Module {module} at {decimals} decimals: the calculation depends on the rounding") # unrounded results do not change with the setting
+    finally:
+        main.rounding_amount = rounding_amount
+    return failures
+
+def check_speed(days: int = 2000, repeats: int = 3) -> list[str]: # Checks that rounding only when shown is faster than rounding every step for every module's models, giving what failed
+    failures = []
+    for module, settings in enumerate(SIMULATION_SETTINGS, start=1):
+        if "projection_time" in settings["forced"]: continue # forced projections are too short to time
+        calculate = module_calculation(settings, days)
+        rounded_time, unrounded_time = float("inf"), float("inf")
+        for _ in range(repeats): # the best of a few runs, so one slow run does not fail the check
+            start = perf_counter()
+            calculate(rounded_calculate_models)
+            rounded_time = min(rounded_time, perf_counter() - start)
+            start = perf_counter()
+            calculate(calculate_models)
+            unrounded_time = min(unrounded_time, perf_counter() - start)
+        if unrounded_time >= rounded_time: failures.append(f"Module {module}: rounding when shown is not faster ({unrounded_time:.4f}s against {rounded_time:.4f}s)")
+    return failures
+
+if __name__ == "__main__":
+    result_cache.enabled = False # every run is calculated, not read from the cache
+    failures = check_rounding() + check_speed()
+    for failure in failures: cprint(failure, "red")
+    if failures: sys.exit(f"{len(failures)} rounding check(s) failed")
+    cprint(f"Shown populations match in all {len(SIMULATION_SETTINGS)} modules and rounding when shown is faster", "green")
@@ -0,0 +1,210 @@
+import main # Imports the simulator for the calculations
+from batch import check_limits # Imports the input limit check shared with batch scenarios
+from sweep import SWEEP_VARIABLES, sweep # Imports the sweep engine
+from concurrent.futures import ProcessPoolExecutor # Imports a process pool so calculations do not block the event loop
+from collections import OrderedDict, deque # Imports OrderedDict for the least recently used order of the cache, and deque for the recent latencies
+from time import perf_counter # Imports a high resolution timer for latencies
+import argparse # Imports argparse for reading the command line
+import asyncio # Imports asyncio for handling many connections at once
+import json # Imports json for reading requests and writing responses
+import numpy as np # Imports numpy for latency percentiles
+import signal # Imports signal so the server stops cleanly when it is terminated
+
+SERVER_HOST = "127.0.0.1" # The address the server listens on, only this computer by default
+SERVER_PORT = 8765 # The port the server listens on
+SERVER_CACHE_SIZE = 10000 # How many responses are kept in the cache before the least recently used ones are removed
+LATENCY_WINDOW = 100000 # How many of the most recent latencies the percentiles are worked out from
+MAX_BODY_BYTES = 1000000 # The biggest request body that is read
+MAX_RESPONSE_POINTS = 1000000 # The most populations one trajectory or sweep can return
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"} # The reason phrase of each status code that is sent
+
+def model_from_json(data: dict) -> main.Model: # Function that makes a model from a request, checked against the same limits as the inputs
+    model_type = data.get("type", "sophisticated")
+    if model_type not in ["naive", "sophisticated"] + main.GROWTH_MODEL_TYPES: raise ValueError(f"Unknown model type: {model_type}")
+    initial_population = check_limits(data["initial_population"], main.inital_population_limits, "Initial population")
+    growth_rate = main.TimeAmount(data["growth_rate"][0], main.time_unit(data["growth_rate"][1]))
+    check_limits(growth_rate.get_quantity(), main.growth_rate_limits, "Growth rate")
+    fission_frequency = None
+    if model_type == "sophisticated":
+        fission_frequency = data["fission_frequency"] # a unit name or a number of fission-events per growth rate unit
+        if isinstance(fission_frequency, str): fission_frequency = main.UNIT_RATIO[growth_rate.get_unit(), main.time_unit(fission_frequency)]
+        else: check_limits(fission_frequency, main.fission_frequency_limits, "Fission frequency")
+    carrying_capacity = data.get("carrying_capacity")
+    if carrying_capacity is not None: check_limits(carrying_capacity, [1], "Carrying capacity")
+    growth_schedule = data.get("growth_schedule") # a list of [start time, growth rate %] pairs in growth rate units
+    if growth_schedule is not None:
+        growth_schedule = tuple(sorted((float(start), float(rate)) for start, rate in growth_schedule)) # tuples so the model can be cached
+        for start, rate in growth_schedule: # same limits as the inputs, NaN would get past them so every value must be finite too
+            if not np.isfinite([start, rate]).all(): raise ValueError("Growth schedule times and rates must be finite")
+            check_limits(start, [1], "Growth schedule start")
+            check_limits(rate, main.growth_rate_limits, "Scheduled growth rate", False)
+    return main.Model(model_type, initial_population, growth_rate, fission_frequency, carrying_capacity, growth_schedule)
+
+def time_from_json(data: list) -> main.TimeAmount: # Function that makes a time amount from a [quantity, unit] pair
+    return main.TimeAmount(data[0], main.time_unit(data[1]))
+
+def json_values(values) -> list|float|None: # Function that makes numbers safe to send as JSON, as infinity and NaN are not JSON so they are sent as null
+    values = np.asarray(values, dtype=float)
+    return np.where(np.isfinite(values), values, None).tolist()
+
+def sweep_points(payload: dict) -> int: # Function that counts the populations a sweep request would make, before anything is calculated
+    lengths = [np.size(payload.get(name, 1)) for name in SWEEP_VARIABLES]
+    if payload.get("mode", "cartesian") == "zipped": return max(lengths)
+    return int(np.prod(lengths, dtype=float)) # as a float first so huge grids can not wrap around
+
+def calculate_request(endpoint: str, payload: dict) -> dict: # Function that answers one request (runs in a worker process)
+    if endpoint == "/population": # the population of a model after a projection time
+        model = model_from_json(payload["model"])
+        projection_time = time_from_json(payload["projection_time"])
+        if model.model_type in main.GROWTH_MODEL_TYPES: # growth models are read from their solution
+            time = projection_time.get_quantity() * main.UNIT_RATIO[projection_time.get_unit(), model.growth_rate.unit]
+            population = float(main.solve_growth_model(model, time).population_at(time))
+        else: population = main.calculate_population_size(*model[:4], projection_time)
+        return {"population": json_values(population)}
+    if endpoint == "/target": # the time a model needs to reach each target population
+        model = model_from_json(payload["model"])
+        targets = np.atleast_1d(np.asarray(payload["target_population"], dtype=float))
+        output_unit = main.time_unit(payload.get("output_unit", model.growth_rate.unit))
+        times = main.calculate_times_to_reach_targets([model], targets, output_unit)[0]
+        return {"time_needed": json_values(times), "unit": output_unit} # unreachable targets are null
+    if endpoint == "/trajectory": # the population at every time unit of a projection, or until a target population
+        model = model_from_json(payload["model"])
+        condition = "population" if "target_population" in payload else "projected"
+        projection_time = time_from_json(payload["projection_time"]) if condition == "projected" else None
+        calculation = main.compile_data([model], projection_time, payload.get("target_population"), condition, "list")[0]
+        if len(calculation.time_axis) > MAX_RESPONSE_POINTS: raise ValueError(f"Trajectories can have at most {MAX_RESPONSE_POINTS} points")
+        output_unit = main.time_unit(payload.get("output_unit", calculation.time_axis.get_unit()))
+        _, _, final, _ = main.calculate_rows(calculation)
+        times = calculation.time_axis.get_quantities() * main.UNIT_RATIO[calculation.time_axis.get_unit(), output_unit]
+        return {"times": times.tolist(), "populations": json_values(final), "unit": output_unit}
+    if endpoint == "/sweep": # the population for every combination of the swept variables
+        if sweep_points(payload) > MAX_RESPONSE_POINTS: raise ValueError(f"Sweeps can have at most {MAX_RESPONSE_POINTS} points") # checked before the sweep so a huge grid is never made
+        result = sweep(**{key: value for key, value in payload.items() if key in ["model_type", "initial_population", "growth_rate", "fission_frequency", "projection_time", "growth_unit", "projection_unit", "mode"]})
+        return {"populations": json_values(result.populations), "dimensions": result.dimensions, "coordinates": {name: np.asarray(values).tolist() for name, values in result.coordinates.items()}}
+    raise LookupError(f"Unknown endpoint: {endpoint}")
+
+class ResponseCache: # Class for the responses already worked out, shared by every connection and removing the least recently used ones
+    def __init__(self, max_size: int = SERVER_CACHE_SIZE): # Constructor
+        self.max_size = max_size # sets the most responses kept at once
+        self.entries: OrderedDict[str, bytes] = OrderedDict() # responses from least to most recently used
+        self.hits = 0 # how many requests were answered from the cache
+        self.misses = 0 # how many requests had to be calculated
+
+    def __len__(self): # this runs if len() is used on the class
+        return len(self.entries)
+
+    def get(self, key: str) -> bytes|None: # gets a response if it is cached
+        if key not in self.entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key) # most recently used
+        return self.entries[key]
+
+    def store(self, key: str, body: bytes): # stores a response, removing the least recently used one if the cache is full
+        self.entries[key] = body
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size: self.entries.popitem(last=False)
+
+class SimulationServer: # Class for the HTTP/JSON server, reading requests on the event loop and calculating them on a process pool
+    def __init__(self, workers: int|None = None, cache_size: int = SERVER_CACHE_SIZE): # Constructor
+        self.executor = ProcessPoolExecutor(max_workers=workers) # sets the process pool the calculations run on
+        self.cache = ResponseCache(cache_size) # sets the cache of responses
+        self.in_flight: dict[str, asyncio.Task] = {} # sets the requests being calculated, identical requests wait for the same one
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW) # sets the most recent latencies (in seconds)
+        self.requests = 0 # how many requests have been answered
+        self.coalesced = 0 # how many requests waited for an identical one instead of being calculated
+        self.started = perf_counter() # when the server started
+
+    def stats(self) -> dict: # gets the latency, throughput and cache statistics
+        latencies = np.array(self.latencies) * 1000 # in milliseconds
+        uptime = perf_counter() - self.started
+        return {
+            "requests": self.requests,
+            "uptime_seconds": uptime,
+            "throughput_per_second": self.requests / uptime if uptime else 0.0,
+            "p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else None,
+            "p99_ms": float(np.percentile(latencies, 99)) if len(latencies) else None,
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+            "cached_responses": len(self.cache),
+            "coalesced": self.coalesced,
+            "in_flight": len(self.in_flight),
+        }
+
+    async def calculate(self, key: str, endpoint: str, payload: dict) -> bytes: # calculates a response on the process pool and caches it
+        try:
+            body = json.dumps(await asyncio.get_running_loop().run_in_executor(self.executor, calculate_request, endpoint, payload), allow_nan=False).encode() # anything not valid JSON is an error, not sent
+            self.cache.store(key, body)
+            return body
+        finally:
+            del self.in_flight[key]
+
+    async def respond(self, endpoint: str, payload: dict) -> bytes: # gets the response body of a request, from the cache, from an identical request being calculated, or from the process pool
+        key = endpoint + json.dumps(payload, sort_keys=True) # the same request in any key order has the same key
+        body = self.cache.get(key)
+        if body is not None: return body
+        if key in self.in_flight: self.coalesced += 1 # an identical request is already being calculated, so this one waits for it
+        else: self.in_flight[key] = asyncio.create_task(self.calculate(key, endpoint, payload))
+        return await asyncio.shield(self.in_flight[key]) # one client going away does not cancel the calculation for the others
+
+    async def handle_request(self, method: str, path: str, body: bytes) -> tuple[int, bytes]: # gets the status code and body of the response to one request
+        if path == "/stats": return 200, json.dumps(self.stats()).encode()
+        if method != "POST": return 405, json.dumps({"error": "Use POST with a JSON body"}).encode()
+        try:
+            payload = json.loads(body or b"{}")
+            return 200, await self.respond(path, payload)
+        except LookupError as error: # unknown endpoints and missing keys
+            return (404 if str(error).startswith("Unknown endpoint") else 400), json.dumps({"error": f"{type(error).__name__}: {error}"}).encode()
+        except (ValueError, TypeError, ArithmeticError) as error: # bad values in the request
+            return 400, json.dumps({"error": f"{type(error).__name__}: {error}"}).encode()
+        except Exception as error: # one bad request should not stop the server
+            return 500, json.dumps({"error": f"{type(error).__name__}: {error}"}).encode()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter): # reads requests from one connection until it is closed (connections are kept open between requests)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line: break # the client closed the connection
+                start = perf_counter()
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""): # reads the headers until the blank line
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES: status, body = 413, json.dumps({"error": f"Request bodies can be at most {MAX_BODY_BYTES} bytes"}).encode()
+                else: status, body = await self.handle_request(method, path.split("?")[0], await reader.readexactly(length))
+                keep_alive = headers.get("connection", "keep-alive").lower() != "close" and length <= MAX_BODY_BYTES
+                writer.write(f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body)
+                await writer.drain()
+                self.requests += 1
+                self.latencies.append(perf_counter() - start)
+                if not keep_alive: break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError): # the client went away or sent something that is not HTTP
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = SERVER_HOST, port: int = SERVER_PORT, ready: asyncio.Event|None = None): # listens for connections until it is cancelled
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel) # terminating stops serving, then the finally below stops the workers
+        main.cprint(f"Serving on http://{host}:{port} (POST /population, /target, /trajectory, /sweep, GET /stats)", "green")
+        if ready: ready.set()
+        try:
+            async with server: await server.serve_forever()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve population projections over HTTP/JSON.")
+    parser.add_argument("--host", default=SERVER_HOST, help="address to listen on")
+    parser.add_argument("-p", "--port", type=int, default=SERVER_PORT, help="port to listen on")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of worker processes (default: number of CPUs)")
+    parser.add_argument("-c", "--cache-size", type=int, default=SERVER_CACHE_SIZE, help="number of responses to cache")
+    arguments = parser.parse_args()
+    try:
+        asyncio.run(SimulationServer(arguments.workers, arguments.cache_size).serve(arguments.host, arguments.port))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    main.cprint("Stopped server", "green")
@@ -0,0 +1,77 @@
+from main import UNIT_RATIO, Calculation, Model, TimeAxis # Imports the model records and unit ratios from the simulator
+from concurrent.futures import ProcessPoolExecutor # Imports a process pool for simulating replicates on every core
+import numpy as np # Imports numpy for simulating every replicate at once
+
+STOCHASTIC_DISTRIBUTIONS = ["binomial", "poisson"] # How the number of cells that split at each fission event is picked
+STOCHASTIC_SHARD_SIZE = 1000 # How many replicates each worker simulates at a time, the shards (not the workers) get the random streams so results do not change with the number of workers
+STOCHASTIC_MAX_POPULATION = 2 ** 53 # The biggest population that can be simulated, as counts above this can not be stored exactly in a float
+DEFAULT_PERCENTILES = (5, 50, 95) # The percentiles worked out for each model
+
+class ReplicateResult: # Class for the result of a stochastic model, one row of populations per replicate
+    def __init__(self, name: str, calculation: Calculation, populations: np.ndarray): # Constructor
+        self.name = name # sets the model name
+        self.calculation = calculation # sets the model settings and the times the populations were recorded at
+        self.populations = populations # sets the populations, one row per replicate and one column per time
+
+    def __str__(self): # this runs if the class is converted to a string
+        return f"ReplicateResult({self.name}: {len(self.populations)} replicates, {self.populations.shape[1]} times)"
+
+    def __len__(self): # this runs if len() is used on the class, the number of replicates
+        return len(self.populations)
+
+    def mean(self) -> np.ndarray: # gets the mean population at every time
+        return self.populations.mean(axis=0)
+
+    def percentiles(self, percentiles = DEFAULT_PERCENTILES) -> dict[float, np.ndarray]: # gets each percentile of the population at every time
+        return dict(zip(percentiles, np.percentile(self.populations, percentiles, axis=0)))
+
+    def band(self, low: float = DEFAULT_PERCENTILES[0], high: float = DEFAULT_PERCENTILES[-1]) -> tuple[np.ndarray, np.ndarray]: # gets the low and high percentiles at every time, for show_graph to shade
+        return tuple(np.percentile(self.populations, [low, high], axis=0))
+
+def split_probability(model: Model) -> tuple[float, float]: # Function that gets the splits each cell makes at a fission event on average (r/n, above 1 when fission events are further apart than the growth rate unit) and the fission events per growth rate unit
+    if model.model_type != "sophisticated": raise ValueError("Only sophisticated models have fission events to simulate")
+    fission_frequency = UNIT_RATIO[model.growth_rate.unit, model.fission_frequency] if isinstance(model.fission_frequency, str) else float(model.fission_frequency) # fission frequency units are changed to numbers like compile_data
+    return model.growth_rate.quantity / 100 / fission_frequency, fission_frequency
+
+def simulate_shard(initial_population: int, probability: float, event_counts: np.ndarray, replicates: int, distribution: str, seed: np.random.SeedSequence) -> np.ndarray: # Function that simulates some replicates, recording the populations after each number of fission events (runs in a worker process)
+    generator = np.random.default_rng(seed) # each shard has its own independent stream
+    population = np.full(replicates, initial_population, dtype=np.int64) # every replicate starts at the initial population
+    populations = np.empty((replicates, len(event_counts)))
+    whole_splits = int(probability) # r/n can be more than 1 split per cell, e.g. 50% a day with weekly fission events is 3.5
+    event = 0
+    for column, event_count in enumerate(event_counts): # loops through every recorded time
+        while event < event_count: # every fission event before the recorded time, one event for all the replicates at once
+            if distribution == "binomial": population += population * whole_splits + generator.binomial(population, probability - whole_splits) # each cell splits the whole part of r/n times, and once more with the chance left over
+            else: population += generator.poisson(population * probability) # the number of splits is Poisson with mean P*r/n
+            event += 1
+        if population.max() > STOCHASTIC_MAX_POPULATION: raise ValueError(f"Stochastic populations went over {STOCHASTIC_MAX_POPULATION}, use a shorter projection or a lower growth rate")
+        populations[:, column] = population
+    return populations
+
+def run_stochastic_model(model: Model, time_axis: TimeAxis, replicates: int = 1000, distribution: str = "binomial", seed: int = 0, workers: int|None = None, name: str = "Stochastic Model 1") -> ReplicateResult: # Function that simulates many replicates of a sophisticated model, sharded over a process pool
+    if distribution not in STOCHASTIC_DISTRIBUTIONS: raise ValueError(f"Unknown distribution: {distribution}")
+    probability, fission_frequency = split_probability(model)
+    events_per_unit = fission_frequency * UNIT_RATIO[time_axis.get_unit(), model.growth_rate.unit] # fission events in one unit of the time axis
+    event_counts = np.floor(time_axis.get_quantities() * events_per_unit + 1e-9).astype(np.int64) # the fission events that have happened by each time (the small amount stops float error losing an event)
+    shards = [min(STOCHASTIC_SHARD_SIZE, replicates - start) for start in range(0, replicates, STOCHASTIC_SHARD_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(shards)) # one independent, reproducible stream per shard
+    arguments = [(int(round(model.initial_population)), probability, event_counts, shard, distribution, shard_seed) for shard, shard_seed in zip(shards, seeds)]
+    if workers == 1 or len(shards) == 1: # small runs are quicker without starting processes
+        populations = [simulate_shard(*shard_arguments) for shard_arguments in arguments]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            populations = list(executor.map(simulate_shard, *zip(*arguments)))
+    return ReplicateResult(name, Calculation(*model._replace(fission_frequency=fission_frequency), time_axis), np.concatenate(populations))
+
+def stochastic_calculations(replicate_results: list[ReplicateResult], low: float = DEFAULT_PERCENTILES[0], high: float = DEFAULT_PERCENTILES[-1]) -> tuple[tuple, dict[str, tuple[np.ndarray, np.ndarray]]]: # Function that makes the results of calculate_models from the mean of each stochastic model, and the percentile bands for show_graph
+    results, opening_population, added_population, final_population, model_configuration, bands = {}, [], [], [], {}, {}
+    for result in replicate_results: # loops through every stochastic model
+        final = result.mean()
+        opening = np.concatenate((final[:1], final[:-1])) # the opening population is the last final population
+        results[result.name] = final.tolist()
+        opening_population.append(opening.tolist())
+        added_population.append((final - opening).tolist())
+        final_population.append(final.tolist())
+        model_configuration[result.name] = result.calculation
+        bands[result.name] = result.band(low, high)
+    return (results, opening_population, added_population, final_population, model_configuration), bands
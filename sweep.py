@@ -0,0 +1,205 @@
+from main import UNIT_RATIO, SIMULATION_SETTINGS, calculate_population_array, calculate_log_population_array, time_unit # Imports the model math from the simulator
+from concurrent.futures import ProcessPoolExecutor, as_completed # Imports a process pool for calculating chunks of huge sweeps on every core
+from multiprocessing import shared_memory # Imports shared memory so workers read the grids without them being pickled for every chunk
+import numpy as np # Imports numpy for calculating the whole grid at once
+import bisect # Imports bisect for finding where a finished chunk goes in the finished ranges
+import hashlib # Imports hashlib for checking a resumed sweep has the same grids
+import json # Imports json for the progress manifest
+import os # Imports os for the output folder and replacing the manifest in one step
+
+SWEEP_VARIABLES = ["initial_population", "growth_rate", "fission_frequency", "projection_time"] # The variables that can be swept, in the order of the result dimensions
+SWEEP_CHUNK_POINTS = 2 ** 22 # How many points of an out-of-core sweep are calculated at a time (32 MiB of populations)
+SWEEP_FILES = {"populations": "populations.npy", "axes": "axes.npz", "manifest": "manifest.json"} # The files an out-of-core sweep writes in its folder
+
+class SweepResult: # Class for the result of a sweep, an N-dimensional array of populations labelled by the swept variables
+    def __init__(self, populations: np.ndarray, dimensions: list[str], coordinates: dict[str, np.ndarray], growth_unit: str, projection_unit: str): # Constructor
+        self.populations = populations # sets the populations, one dimension per swept variable
+        self.dimensions = dimensions # sets the name of each dimension
+        self.coordinates = coordinates # sets the values of each variable along its dimension
+        self.growth_unit = growth_unit # sets the unit of the growth rates and fission frequencies
+        self.projection_unit = projection_unit # sets the unit of the projection times
+
+    def __str__(self): # this runs if the class is converted to a string
+        return f"SweepResult({', '.join(f'{name}: {len(self.coordinates[name])}' for name in self.dimensions)})"
+
+    def __getitem__(self, index): # this runs if the class is indexed, indexes the populations
+        return self.populations[index]
+
+    def select(self, **values) -> np.ndarray: # gets the populations at the given variable values, e.g. select(growth_rate=5)
+        if self.dimensions == ["point"]: # zipped sweeps keep every point where all the values match
+            mask = np.ones(len(self.populations), dtype=bool)
+            for name, value in values.items(): mask &= np.isclose(self.coordinates[name], value)
+            return self.populations[mask]
+        index = [slice(None)] * len(self.dimensions)
+        for name, value in values.items():
+            matches = np.flatnonzero(np.isclose(self.coordinates[name], value)) # finds where the variable has that value
+            if len(matches) == 0: raise KeyError(f"{name} = {value} is not in the sweep")
+            index[self.dimensions.index(name)] = matches[0]
+        return self.populations[tuple(index)]
+
+def fission_frequency_values(fission_frequency, growth_unit: str) -> np.ndarray: # Function that changes fission frequencies (numbers or units) to fission-events per growth rate unit
+    values = np.atleast_1d(np.asarray(fission_frequency))
+    if values.dtype.kind in "iuf": return np.asarray(values, dtype=float) # numbers need no conversion, so huge grids are not looped or copied through
+    values = values.astype(object)
+    return np.array([UNIT_RATIO[growth_unit, time_unit(value)] if isinstance(value, str) else value for value in values], dtype=float) # same conversion as compile_data
+
+def sweep(model_type: str = "sophisticated", initial_population = 1, growth_rate = 100, fission_frequency = 1, projection_time = 1, growth_unit: str = "day", projection_unit: str = "day", mode: str = "cartesian") -> SweepResult: # Function that calculates the population for every combination of the variables in one pass
+    growth_unit = time_unit(growth_unit)
+    projection_unit = time_unit(projection_unit)
+    grids = sweep_grids(model_type, initial_population, growth_rate, fission_frequency, projection_time, growth_unit)
+    if mode == "cartesian": # every combination, one dimension per variable
+        dimensions = list(SWEEP_VARIABLES)
+        arrays = np.ix_(*[grids[name] for name in dimensions]) # reshapes each grid so they broadcast to the full grid without copying
+    elif mode == "zipped": # the grids are paired up point by point, grids of length 1 are used for every point
+        dimensions = ["point"]
+        lengths = {len(grid) for grid in grids.values()} - {1}
+        if len(lengths) > 1: raise ValueError("Zipped sweeps need every grid to have the same length (or length 1)")
+        arrays = [grids[name] for name in SWEEP_VARIABLES]
+    else:
+        raise ValueError(f"Unknown sweep mode: {mode}")
+    populations = calculate_population_array(model_type, *arrays, growth_unit, projection_unit)
+    if mode == "zipped":
+        points = max(len(grid) for grid in grids.values())
+        populations = np.broadcast_to(populations, (points,)) # grids of length 1 make a length 1 result
+        coordinates = {"point": np.arange(points)} | {name: np.broadcast_to(grid, (points,)) for name, grid in grids.items()}
+    else:
+        populations = np.broadcast_to(populations, tuple(len(grids[name]) for name in dimensions))
+        coordinates = grids
+    return SweepResult(populations, dimensions, coordinates, growth_unit, projection_unit)
+
+def module_5_sweep(initial_population: int) -> SweepResult: # Function that runs module 5 (how fission frequency affects the final population) as a sweep
+    forced = SIMULATION_SETTINGS[4]["forced"]
+    return sweep(
+        initial_population=initial_population,
+        growth_rate=forced["growth_rate"][0],
+        fission_frequency=forced["fission_frequency"],
+        projection_time=forced["projection_time"][0],
+        growth_unit=forced["growth_rate"][1],
+        projection_unit=forced["projection_time"][1],
+    )
+
+def sweep_grids(model_type: str, initial_population, growth_rate, fission_frequency, projection_time, growth_unit: str) -> dict[str, np.ndarray]: # Function that makes the grid of each variable as floats, like sweep does
+    grids = {
+        "initial_population": np.atleast_1d(np.asarray(initial_population, dtype=float)),
+        "growth_rate": np.atleast_1d(np.asarray(growth_rate, dtype=float)),
+        "fission_frequency": fission_frequency_values(fission_frequency, growth_unit),
+        "projection_time": np.atleast_1d(np.asarray(projection_time, dtype=float)),
+    }
+    if model_type == "naive": grids["fission_frequency"] = np.ones(1) # naive models have no fission events
+    return grids
+
+def chunk_dimension(shape: list[int], chunk_points: int) -> int: # Function that gets the variable a sweep is split along, the first one where every variable after it fits in a chunk, so each chunk is a block of the grid and a flat range of the file
+    return next(dimension for dimension in range(len(shape)) if np.prod(shape[dimension + 1:], dtype=np.int64) <= chunk_points)
+
+def sweep_chunks(shape: list[int], chunk_points: int) -> list[tuple[int, int]]: # Function that splits a sweep into chunks of about chunk_points points, as flat start and stop indexes
+    dimension = chunk_dimension(shape, chunk_points)
+    inner = int(np.prod(shape[dimension + 1:], dtype=np.int64)) # points in one row of the split variable
+    rows = max(1, chunk_points // inner)
+    return [((outer * shape[dimension] + row) * inner, (outer * shape[dimension] + min(row + rows, shape[dimension])) * inner) for outer in range(int(np.prod(shape[:dimension], dtype=np.int64))) for row in range(0, shape[dimension], rows)]
+
+def sweep_chunk(grids: list[np.ndarray], model_type: str, growth_unit: str, projection_unit: str, log_space: bool, output_path: str, chunk_points: int, start: int, stop: int) -> int: # Function that calculates one chunk of a cartesian sweep (a block of the grid from flat index start to stop) and writes it into the output file
+    shape = [len(grid) for grid in grids]
+    dimension = chunk_dimension(shape, chunk_points)
+    position = np.unravel_index(start, shape) # where the block starts along every variable
+    rows = (stop - start) // int(np.prod(shape[dimension + 1:], dtype=np.int64))
+    arrays = [grid[position[i]] for i, grid in enumerate(grids[:dimension])] # variables before the split one are the same for the whole block
+    arrays += [grid[position[i]:position[i] + rows if i == dimension else None].reshape((-1,) + (1,) * (len(grids) - 1 - i)) for i, grid in enumerate(grids) if i >= dimension] # the rest are reshaped so they broadcast to the block without copying
+    calculate = calculate_log_population_array if log_space else calculate_population_array
+    populations = calculate(model_type, *arrays, growth_unit, projection_unit)
+    output = np.lib.format.open_memmap(output_path, mode="r+")
+    output.reshape(-1)[start:stop] = np.broadcast_to(populations, (rows, *shape[dimension + 1:])).reshape(-1) # each block is a contiguous range of the file
+    output.flush() # the chunk is on disk before it is reported as finished
+    del output
+    return start
+
+def sweep_shared_chunk(shared_name: str, lengths: list[int], *arguments) -> int: # Function that calculates a chunk with the grids read from shared memory (runs in a worker process)
+    shared = shared_memory.SharedMemory(name=shared_name)
+    values = np.ndarray((sum(lengths),), dtype=float, buffer=shared.buf)
+    grids = np.split(values, np.cumsum(lengths)[:-1]) # views of the shared grids, nothing is copied
+    try:
+        return sweep_chunk(grids, *arguments)
+    finally:
+        del values, grids # the views must be gone before the shared memory can be closed
+        shared.close()
+
+def add_finished(ranges: list[list[int]], number: int): # Function that adds a finished chunk number to the sorted [start, stop) ranges of finished chunks, joining ranges that meet so the manifest stays small
+    index = bisect.bisect_right(ranges, number, key=lambda finished: finished[0]) # the ranges before index start at or before the chunk
+    if index > 0 and ranges[index - 1][1] > number: return # already finished
+    if index > 0 and ranges[index - 1][1] == number: # carries on the range before it
+        ranges[index - 1][1] += 1
+        if index < len(ranges) and ranges[index][0] == number + 1: ranges[index - 1][1] = ranges.pop(index)[1] # fills the gap between two ranges
+    elif index < len(ranges) and ranges[index][0] == number + 1: ranges[index][0] = number # starts the range after it
+    else: ranges.insert(index, [number, number + 1])
+
+def unfinished_chunks(ranges: list[list[int]], chunks: int) -> list[int]: # Function that gets the chunk numbers not in the finished ranges
+    edges = [0] + [edge for finished in ranges for edge in finished] + [chunks] # the gaps are between the end of one range and the start of the next
+    return [number for start, stop in zip(edges[::2], edges[1::2]) for number in range(start, stop)]
+
+def grids_sha256(grids: list[np.ndarray]) -> str: # Function that hashes the grids one at a time, so they are never copied into one string
+    sha = hashlib.sha256()
+    for grid in grids:
+        sha.update(np.ascontiguousarray(grid)) # the grid's own memory is hashed, no bytes are copied
+    return sha.hexdigest()
+
+def save_manifest(path: str, manifest: dict): # Function that writes the progress manifest in one step, so an interruption never leaves half a manifest
+    with open(path + ".tmp", "w") as file: json.dump(manifest, file, indent=4)
+    os.replace(path + ".tmp", path)
+
+def chunked_sweep(folder: str, model_type: str = "sophisticated", initial_population = 1, growth_rate = 100, fission_frequency = 1, projection_time = 1, growth_unit: str = "day", projection_unit: str = "day", log_space: bool = False, chunk_points: int = SWEEP_CHUNK_POINTS, workers: int|None = None) -> SweepResult: # Function that calculates a cartesian sweep too big for memory a chunk at a time into a memory-mapped file, resuming from the manifest if the folder has an unfinished sweep of the same grids
+    growth_unit = time_unit(growth_unit)
+    projection_unit = time_unit(projection_unit)
+    grids = sweep_grids(model_type, initial_population, growth_rate, fission_frequency, projection_time, growth_unit)
+    shape = [len(grids[name]) for name in SWEEP_VARIABLES]
+    points = int(np.prod(shape, dtype=np.int64))
+    paths = {name: os.path.join(folder, file_name) for name, file_name in SWEEP_FILES.items()}
+    settings = { # everything that must match for a sweep to be resumed
+        "model_type": model_type,
+        "growth_unit": growth_unit,
+        "projection_unit": projection_unit,
+        "log_space": log_space,
+        "shape": shape,
+        "chunk_points": chunk_points,
+        "grids_sha256": grids_sha256([grids[name] for name in SWEEP_VARIABLES]),
+    }
+    chunks = sweep_chunks(shape, chunk_points)
+    numbers = {start: number for number, (start, _) in enumerate(chunks)} # the chunk number of each start, as chunks finish in any order
+    os.makedirs(folder, exist_ok=True)
+    if os.path.exists(paths["manifest"]): # resumes an interrupted sweep
+        with open(paths["manifest"]) as file: manifest = json.load(file)
+        if manifest["settings"] != settings: raise ValueError(f"{folder} has a sweep of different grids, delete it or use another folder")
+    else:
+        manifest = {"settings": settings, "chunks": len(chunks), "finished": []} # finished is [start, stop) ranges of chunk numbers
+        np.lib.format.open_memmap(paths["populations"], mode="w+", dtype=float, shape=tuple(shape)).flush() # the file is made at full size, the disk only fills as chunks are written
+        np.savez(paths["axes"], **grids)
+        save_manifest(paths["manifest"], manifest)
+    remaining = [chunks[number] for number in unfinished_chunks(manifest["finished"], len(chunks))]
+    def finish(start: int): # records a chunk as finished and saves the manifest, chunks mostly finish in order so there are only a few ranges to write
+        add_finished(manifest["finished"], numbers[start])
+        save_manifest(paths["manifest"], manifest)
+    arguments = (model_type, growth_unit, projection_unit, log_space, paths["populations"], chunk_points)
+    if workers == 1 or len(remaining) <= 1: # small sweeps are quicker without starting processes
+        for start, stop in remaining: finish(sweep_chunk([grids[name] for name in SWEEP_VARIABLES], *arguments, start, stop))
+    elif remaining:
+        shared = shared_memory.SharedMemory(create=True, size=sum(shape) * np.dtype(float).itemsize)
+        try:
+            values = np.ndarray((sum(shape),), dtype=float, buffer=shared.buf)
+            for grid, offset in zip((grids[name] for name in SWEEP_VARIABLES), np.cumsum([0] + shape[:-1])): values[offset:offset + len(grid)] = grid # each grid is written straight into shared memory once, for every worker
+            del values # the view must be gone before the shared memory can be closed
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(sweep_shared_chunk, shared.name, shape, *arguments, start, stop) for start, stop in remaining]
+                try:
+                    for future in as_completed(futures): finish(future.result()) # chunks are recorded as they finish, in any order
+                except BaseException: # an error or interruption stops the chunks that have not started, the finished ones stay in the manifest
+                    for future in futures: future.cancel()
+                    raise
+        finally:
+            shared.close()
+            shared.unlink()
+    return load_chunked_sweep(folder)
+
+def load_chunked_sweep(folder: str) -> SweepResult: # Function that opens a finished out-of-core sweep, its populations are read from the file as they are used
+    with open(os.path.join(folder, SWEEP_FILES["manifest"])) as file: manifest = json.load(file)
+    if manifest["finished"] != [[0, manifest["chunks"]]]: raise ValueError(f"The sweep in {folder} is not finished, run chunked_sweep again with the same grids to resume it")
+    with np.load(os.path.join(folder, SWEEP_FILES["axes"])) as axes: coordinates = {name: axes[name] for name in SWEEP_VARIABLES}
+    populations = np.load(os.path.join(folder, SWEEP_FILES["populations"]), mmap_mode="r")
+    return SweepResult(populations, list(SWEEP_VARIABLES), coordinates, manifest["settings"]["growth_unit"], manifest["settings"]["projection_unit"])
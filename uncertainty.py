@@ -0,0 +1,148 @@
+from main import UNIT_RATIO, calculate_log_population_array, calculate_time_to_reach_target_array, time_unit # Imports the model math from the simulator
+from sweep import fission_frequency_values # Imports the fission frequency conversion the sweeps use
+from concurrent.futures import ProcessPoolExecutor # Imports a process pool for evaluating chunks of samples on every core
+from statistics import NormalDist # Imports NormalDist for where a truncated normal distribution is cut
+from math import log # Imports log for log-uniform distributions
+import numpy as np # Imports numpy for evaluating every sample of a chunk at once
+
+UNCERTAINTY_INPUTS = ["initial_population", "growth_rate", "fission_frequency", "projection_time"] # The model inputs that can be given as distributions, in the order they take sample dimensions
+UNCERTAINTY_METHODS = ["sobol", "latin-hypercube", "random"] # How the samples are spread over the distributions, random is plain Monte Carlo to compare against
+UNCERTAINTY_CHUNK_SIZE = 65536 # How many samples are evaluated at a time, a power of two so every chunk of a Sobol sequence is balanced on its own
+UNCERTAINTY_PERCENTILES = (5, 50, 95) # The percentiles worked out for each result
+UNCERTAINTY_DISTRIBUTIONS = {"uniform": ["low", "high"], "loguniform": ["low", "high"], "triangular": ["low", "mode", "high"], "normal": ["mean", "sd"], "lognormal": ["median", "sigma"]} # The distributions an input can be given as and what each one needs
+
+# Sobol direction numbers from Joe and Kuo (new-joe-kuo-6.21201), (degree s, coefficients a, initial m values) of each dimension's primitive polynomial after the first
+SOBOL_POLYNOMIALS = [(1, 0, [1]), (2, 1, [1, 3]), (3, 1, [1, 3, 1])]
+SOBOL_BITS = 32 # Bits in each Sobol coordinate, enough for 2^32 samples
+
+def sobol_directions(dimensions: int) -> np.ndarray: # Function that makes the direction numbers of each dimension, one row per dimension and one column per bit
+    if dimensions > len(SOBOL_POLYNOMIALS) + 1: raise ValueError(f"Sobol samples are only set up for {len(SOBOL_POLYNOMIALS) + 1} dimensions")
+    directions = np.zeros((dimensions, SOBOL_BITS), dtype=np.uint64)
+    directions[0] = [1 << (SOBOL_BITS - 1 - bit) for bit in range(SOBOL_BITS)] # the first dimension is the van der Corput sequence
+    for dimension, (degree, coefficients, initial) in enumerate(SOBOL_POLYNOMIALS[:dimensions - 1], start=1):
+        values = [m << (SOBOL_BITS - 1 - bit) for bit, m in enumerate(initial)]
+        for bit in range(degree, SOBOL_BITS): # each later direction number comes from the earlier ones by the polynomial's recurrence
+            value = values[bit - degree] ^ (values[bit - degree] >> degree)
+            for k in range(1, degree):
+                if (coefficients >> (degree - 1 - k)) & 1: value ^= values[bit - k]
+            values.append(value)
+        directions[dimension] = values
+    return directions
+
+def sobol_points(start: int, stop: int, dimensions: int, seed: int = 0) -> np.ndarray: # Function that makes the Sobol points from index start to stop (in Gray code order), randomised by a digital shift so no point is on the edge, one row per point
+    directions = sobol_directions(dimensions)
+    gray = start ^ (start >> 1) # the first point is the XOR of the direction numbers of the bits of its Gray code
+    first = np.zeros(dimensions, dtype=np.uint64)
+    for bit in range(gray.bit_length()):
+        if (gray >> bit) & 1: first ^= directions[:, bit]
+    index = np.arange(start + 1, max(stop, start + 1), dtype=np.uint64)
+    changed_bit = np.log2((index & (~index + np.uint64(1))).astype(float)).astype(np.intp) # the Gray codes of i - 1 and i only differ in the lowest set bit of i
+    points = np.bitwise_xor.accumulate(np.vstack([first, directions[:, changed_bit].T]), axis=0)[:stop - start] # each point is the last one with one direction number changed
+    shift = np.random.default_rng(seed).integers(0, 2 ** SOBOL_BITS, dimensions, dtype=np.uint64) # the same shift for every chunk, so the chunks are one sequence
+    return ((points ^ shift) + 0.5) / 2 ** SOBOL_BITS
+
+def latin_hypercube_points(count: int, dimensions: int, generator: np.random.Generator) -> np.ndarray: # Function that makes points with exactly one in each of count equal slices of every dimension, one row per point
+    slices = np.argsort(generator.random((count, dimensions)), axis=0) # a random order of the slices in each dimension
+    return (slices + generator.random((count, dimensions))) / count
+
+def inverse_normal(probabilities: np.ndarray) -> np.ndarray: # Function that gets the standard normal value below which each probability falls (Acklam's approximation, relative error under 1.2e-9)
+    a = [-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02, 1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00]
+    b = [-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02, 6.680131188771972e+01, -1.328068155288572e+01, 1.0]
+    c = [-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00, -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00]
+    d = [7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00, 1.0]
+    probabilities = np.asarray(probabilities, dtype=float)
+    tail = np.minimum(probabilities, 1 - probabilities) # the tails are worked out the same way, with the sign flipped for the upper one
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q = np.sqrt(-2 * np.log(tail))
+        tails = np.polyval(c, q) / np.polyval(d, q) * np.where(probabilities < 0.5, 1, -1)
+        r = (probabilities - 0.5) ** 2
+        centre = (probabilities - 0.5) * np.polyval(a, r) / np.polyval(b, r)
+    return np.where(tail < 0.02425, tails, centre)
+
+def sample_input(distribution, probabilities: np.ndarray) -> np.ndarray: # Function that changes points between 0 and 1 to values of an input's distribution (by its inverse CDF)
+    if not isinstance(distribution, dict): return np.full(len(probabilities), float(distribution)) # a fixed value
+    kind = distribution.get("distribution")
+    if kind == "uniform": return distribution["low"] + probabilities * (distribution["high"] - distribution["low"])
+    if kind == "loguniform": return np.exp(log(distribution["low"]) + probabilities * (log(distribution["high"]) - log(distribution["low"])))
+    if kind == "triangular":
+        low, mode, high = distribution["low"], distribution["mode"], distribution["high"]
+        split = (mode - low) / (high - low) # the probability below the mode
+        return np.where(probabilities < split, low + np.sqrt(probabilities * (high - low) * (mode - low)), high - np.sqrt((1 - probabilities) * (high - low) * (high - mode)))
+    if kind in ["normal", "lognormal"]: # normal distributions can be cut at low and high (e.g. so growth rates stay above 0), the points are spread over what is left
+        if kind == "normal": centre, spread, transform, untransform = distribution["mean"], distribution["sd"], (lambda value: value), np.asarray
+        else: centre, spread, transform, untransform = log(distribution["median"]), distribution["sigma"], log, np.exp
+        bound = lambda name, default: NormalDist(centre, spread).cdf(transform(distribution[name])) if name in distribution else default
+        low, high = bound("low", 0.0), bound("high", 1.0)
+        if not low < high: raise ValueError(f"The {kind} distribution has no values between its low and high")
+        return untransform(centre + spread * inverse_normal(low + probabilities * (high - low)))
+    raise ValueError(f"Unknown distribution: {kind}")
+
+def check_distribution(name: str, distribution): # Function that checks an input's distribution has everything it needs, before any samples are made
+    if not isinstance(distribution, dict): return
+    needed = UNCERTAINTY_DISTRIBUTIONS.get(distribution.get("distribution"))
+    if needed is None: raise ValueError(f"Unknown distribution for {name}: {distribution.get('distribution')}")
+    missing = [key for key in needed if key not in distribution]
+    if missing: raise ValueError(f"The {distribution['distribution']} distribution for {name} needs {', '.join(missing)}")
+
+class UncertaintyResult: # Class for the result of an uncertainty run, the final population and times to reach each target of every sample
+    def __init__(self, name: str, model_type: str, inputs: dict, log_final_populations: np.ndarray, target_populations: np.ndarray, times_to_target: np.ndarray, projection_unit: str): # Constructor
+        self.name = name # sets the model name
+        self.model_type = model_type # sets the model type
+        self.inputs = inputs # sets the value or distribution of each input
+        self.log_final_populations = log_final_populations # sets ln of the final population of each sample, logs never overflow
+        self.target_populations = target_populations # sets the target populations
+        self.times_to_target = times_to_target # sets the time each sample takes to reach each target (in the projection unit), one row per target
+        self.projection_unit = projection_unit # sets the unit of the projection time and the times to reach the targets
+
+    def __str__(self): # this runs if the class is converted to a string
+        return f"UncertaintyResult({self.name}: {len(self)} samples, {len(self.target_populations)} targets)"
+
+    def __len__(self): # this runs if len() is used on the class, the number of samples
+        return len(self.log_final_populations)
+
+    def mean(self) -> float: # gets the mean final population
+        with np.errstate(over="ignore"): return float(np.exp(self.log_final_populations).mean())
+
+    def final_percentiles(self, percentiles = UNCERTAINTY_PERCENTILES) -> dict[float, float]: # gets each percentile of the final population (worked out on the logs so huge populations do not overflow first)
+        with np.errstate(over="ignore"): return dict(zip(percentiles, np.exp(np.percentile(self.log_final_populations, percentiles)).tolist()))
+
+    def time_percentiles(self, percentiles = UNCERTAINTY_PERCENTILES) -> dict[float, dict[float, float]]: # gets each percentile of the time to reach each target
+        if len(self.target_populations) == 0: return {}
+        return {float(target): dict(zip(percentiles, values)) for target, values in zip(self.target_populations, np.percentile(self.times_to_target, percentiles, axis=1).T.tolist())}
+
+    def band(self, low: float = UNCERTAINTY_PERCENTILES[0], high: float = UNCERTAINTY_PERCENTILES[-1]) -> tuple[float, float]: # gets the low and high percentiles of the final population
+        percentiles = self.final_percentiles((low, high))
+        return percentiles[low], percentiles[high]
+
+def evaluate_chunk(model_type: str, inputs: dict, growth_unit: str, projection_unit: str, target_populations: np.ndarray, method: str, seed, start: int, stop: int) -> tuple[np.ndarray, np.ndarray]: # Function that samples and evaluates the samples from index start to stop, giving ln of their final populations and their times to reach each target (runs in a worker process)
+    uncertain = [name for name in UNCERTAINTY_INPUTS if isinstance(inputs[name], dict)] # only inputs with distributions use a dimension of the points
+    dimensions = max(len(uncertain), 1)
+    if method == "sobol": points = sobol_points(start, stop, dimensions, seed)
+    elif method == "latin-hypercube": points = latin_hypercube_points(stop - start, dimensions, np.random.default_rng(seed)) # each chunk is a Latin hypercube of its own
+    else: points = np.random.default_rng(seed).random((stop - start, dimensions))
+    values = {name: sample_input(inputs[name], points[:, uncertain.index(name)]) if name in uncertain else inputs[name] for name in UNCERTAINTY_INPUTS}
+    log_final = calculate_log_population_array(model_type, values["initial_population"], values["growth_rate"], values["fission_frequency"], values["projection_time"], growth_unit, projection_unit)
+    log_final = np.broadcast_to(log_final, (stop - start,))
+    times = calculate_time_to_reach_target_array(model_type, values["initial_population"], values["growth_rate"], values["fission_frequency"], target_populations[:, None]) * UNIT_RATIO[growth_unit, projection_unit] # one row per target, changed from growth rate units to the projection unit
+    return log_final, np.broadcast_to(times, (len(target_populations), stop - start))
+
+def run_uncertainty(model_type: str, initial_population, growth_rate, fission_frequency = None, projection_time = 1, growth_unit: str = "day", projection_unit: str = "day", target_population = (), samples: int = 2 ** 20, method: str = "sobol", seed: int = 0, workers: int|None = None, name: str = "Uncertainty Model 1") -> UncertaintyResult: # Function that propagates the uncertainty of a model's inputs (values, or dicts like {"distribution": "normal", "mean": 5, "sd": 0.5}) to its final population and times to reach the targets, chunked over a process pool
+    if method not in UNCERTAINTY_METHODS: raise ValueError(f"Unknown sampling method: {method}")
+    if samples < 1: raise ValueError("There must be at least 1 sample")
+    growth_unit, projection_unit = time_unit(growth_unit), time_unit(projection_unit)
+    if model_type == "naive": fission_frequency = 1.0 # naive models have no fission events
+    elif not isinstance(fission_frequency, dict): fission_frequency = float(fission_frequency_values(fission_frequency, growth_unit)[0]) # units are changed to fission-events per growth rate unit like compile_data
+    inputs = {"initial_population": initial_population, "growth_rate": growth_rate, "fission_frequency": fission_frequency, "projection_time": projection_time}
+    for input_name, distribution in inputs.items(): check_distribution(input_name, distribution)
+    target_populations = np.atleast_1d(np.asarray(target_population, dtype=float))
+    chunks = [(start, min(start + UNCERTAINTY_CHUNK_SIZE, samples)) for start in range(0, samples, UNCERTAINTY_CHUNK_SIZE)]
+    seeds = [seed] * len(chunks) if method == "sobol" else np.random.SeedSequence(seed).spawn(len(chunks)) # Sobol chunks share one shift, the others get one independent, reproducible stream per chunk
+    arguments = [(model_type, inputs, growth_unit, projection_unit, target_populations, method, chunk_seed, start, stop) for (start, stop), chunk_seed in zip(chunks, seeds)]
+    if workers == 1 or len(chunks) == 1: # small runs are quicker without starting processes
+        results = [evaluate_chunk(*chunk_arguments) for chunk_arguments in arguments]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(evaluate_chunk, *zip(*arguments)))
+    log_final = np.concatenate([log_final for log_final, _ in results])
+    times = np.concatenate([times for _, times in results], axis=1)
+    return UncertaintyResult(name, model_type, inputs, log_final, target_populations, times, projection_unit)